@@ -0,0 +1,326 @@
+"""
+Business Analysis Agent - Vectorized Batch Scoring
+
+`BusinessAnalyzer.analyze()` walks one business at a time through if/elif
+thresholds, lowercasing and dict lookups. `analyze_batch()` scores a whole
+columnar batch with numpy instead: the point buckets become `np.digitize`
+lookups, category and location weights are computed once per distinct
+value, and the decision is a couple of masks over the totals.
+
+Every score, necessity and decision equals the scalar path for the same
+input (the buckets are the shared tables in scorer.py, and totals are
+rounded with Python's round() per distinct value).
+
+The resulting `ScoreBatch` keeps the totals, so threshold what-ifs
+(`decide()`, `sweep()`) only redo the final comparison.
+
+Batch columns (a dict of arrays/lists or a pandas DataFrame), named like
+the BusinessInput fields:
+    category, neighborhood, rating, review_count, photo_count,
+    phone / has_phone, email / has_email, hours / has_hours,
+    has_website, existing_website, review_velocity (NaN = unknown), id
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import numpy as np
+
+from agents.analysis.scorer import (
+    HIGH_NECESSITY_CATEGORIES,
+    PHOTO_POINTS,
+    PREMIUM_NEIGHBORHOODS,
+    RATING_POINTS,
+    REVIEW_POINTS,
+    BusinessAnalyzer,
+    BusinessInput,
+    Decision,
+    ScoreBreakdown,
+    _activity_points,
+    _velocity_band,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================
+# CONSTANTS
+# ===========================================
+
+DECISIONS = (Decision.GO, Decision.REVIEW, Decision.NO_GO)
+GO, REVIEW, NO_GO = 0, 1, 2
+
+COMPONENTS = (
+    "review_score", "rating_score", "photo_score", "category_score",
+    "location_score", "contact_score", "activity_score",
+)
+
+
+# ===========================================
+# COLUMN HELPERS
+# ===========================================
+
+def _bins(table: tuple) -> tuple[np.ndarray, np.ndarray]:
+    """Scorer bucket table -> (ascending minimums, points per digitize index)"""
+    minimums = np.array([minimum for minimum, _ in reversed(table)], dtype=np.float64)
+    points = np.array([0.0] + [points for _, points in reversed(table)], dtype=np.float64)
+    return minimums, points
+
+
+def _bucketize(values: np.ndarray, table: tuple) -> np.ndarray:
+    minimums, points = _bins(table)
+    return points[np.digitize(values, minimums)]
+
+
+def _present(value) -> bool:
+    # Missing DataFrame cells arrive as NaN, which bool() would call truthy
+    return bool(value) and not (isinstance(value, float) and value != value)
+
+
+def _column(batch, name: str, size: int) -> np.ndarray:
+    if name in batch:
+        return np.asarray(batch[name])
+    return np.full(size, None, dtype=object)
+
+
+def _numbers(batch, name: str, size: int) -> np.ndarray:
+    """Numeric column with missing values as 0 (like `record.get(...) or 0`)"""
+    if name not in batch:
+        return np.zeros(size)
+    values = np.asarray(batch[name])
+    if values.dtype == object:
+        values = np.array([v if _present(v) else 0.0 for v in values], dtype=np.float64)
+    return np.nan_to_num(values.astype(np.float64, copy=False))
+
+
+def _flags(batch, name: str, size: int) -> np.ndarray:
+    """Truthiness of a column, or of its precomputed has_<name> column"""
+    for column in (f"has_{name}", name):
+        if column in batch:
+            values = np.asarray(batch[column])
+            if values.dtype == bool:
+                return values
+            return np.fromiter((_present(v) for v in values), dtype=bool, count=size)
+    return np.zeros(size, dtype=bool)
+
+
+def _factorize(values: np.ndarray) -> tuple[list, np.ndarray]:
+    """(distinct values in first-seen order, code per row); hashing, no sorting"""
+    values = values.tolist()  # Plain str objects hash far faster than numpy scalars
+    codes = {value: code for code, value in enumerate(dict.fromkeys(values))}
+    return list(codes), np.fromiter(map(codes.__getitem__, values), dtype=np.intp, count=len(values))
+
+
+def _per_value(factorized: tuple[list, np.ndarray], fn) -> np.ndarray:
+    """fn() once per distinct value, broadcast back to every row"""
+    uniques, inverse = factorized
+    return np.array([fn(value) for value in uniques], dtype=np.float64)[inverse]
+
+
+def _activity_column(velocity: np.ndarray, has_hours: np.ndarray) -> np.ndarray:
+    """Scorer activity points once per distinct velocity (NaN = unknown), with and without hours"""
+    speeds, inverse = np.unique(velocity, return_inverse=True)
+    points = np.array([
+        [_activity_points(band, False), _activity_points(band, True)]
+        for band in (_velocity_band(None if v != v else v) for v in speeds.tolist())
+    ], dtype=np.float64).reshape(-1, 2)
+    return points[inverse.reshape(-1), has_hours.astype(np.intp)]
+
+
+def _batch_size(batch) -> int:
+    for name in ("category", "review_count", "rating", "id"):
+        if name in batch:
+            return len(batch[name])
+    raise ValueError("Batch needs at least a category, review_count, rating or id column")
+
+
+def columns_from_inputs(businesses: Iterable[BusinessInput]) -> dict[str, list]:
+    """Columnar batch from BusinessInput objects"""
+    businesses = list(businesses)
+    return {
+        "id": [b.id for b in businesses],
+        "category": [b.category for b in businesses],
+        "neighborhood": [b.neighborhood for b in businesses],
+        "rating": [b.rating for b in businesses],
+        "review_count": [b.review_count for b in businesses],
+        "photo_count": [b.photo_count for b in businesses],
+        "has_phone": [bool(b.phone) for b in businesses],
+        "has_email": [bool(b.email) for b in businesses],
+        "has_hours": [bool(b.hours) for b in businesses],
+        "has_website": [bool(b.has_website) for b in businesses],
+        "existing_website": [bool(b.existing_website) for b in businesses],
+        "review_velocity": [np.nan if b.review_velocity is None else b.review_velocity for b in businesses],
+    }
+
+
+# ===========================================
+# RESULT
+# ===========================================
+
+@dataclass
+class ScoreBatch:
+    """Columnar scores of one batch; row i corresponds to row i of the input"""
+    ids: np.ndarray
+    components: dict[str, np.ndarray]
+    total: np.ndarray
+    necessity: np.ndarray
+    decision: np.ndarray         # Index into DECISIONS
+    forced_no_go: np.ndarray     # NO_GO whatever the score (website, no activity)
+
+    def __len__(self) -> int:
+        return len(self.total)
+
+    def decide(self, min_score_go: float, min_score_review: float) -> np.ndarray:
+        """Decision codes under other thresholds (scores are not recomputed)"""
+        decision = np.where(
+            self.total >= min_score_go, GO,
+            np.where(self.total >= min_score_review, REVIEW, NO_GO),
+        ).astype(np.int8)
+        decision[self.forced_no_go] = NO_GO
+        return decision
+
+    def counts(self, decision: Optional[np.ndarray] = None) -> dict[str, int]:
+        codes = np.bincount(self.decision if decision is None else decision, minlength=len(DECISIONS))
+        return {d.value: int(count) for d, count in zip(DECISIONS, codes)}
+
+    def sweep(self, go_values: Iterable[float], review_values: Iterable[float]) -> list[dict]:
+        """
+        Decision counts for every (MIN_SCORE_GO, MIN_SCORE_REVIEW) pair.
+        Two binary searches over the sorted eligible totals per pair.
+        """
+        eligible = np.sort(self.total[~self.forced_no_go])
+        review_values = list(review_values)
+        rows = []
+        for go in go_values:
+            go_count = len(eligible) - int(np.searchsorted(eligible, go, side="left"))
+            for review in review_values:
+                at_least_review = len(eligible) - int(np.searchsorted(eligible, review, side="left"))
+                review_count = max(0, at_least_review - go_count)
+                rows.append({
+                    "min_score_go": go,
+                    "min_score_review": review,
+                    Decision.GO.value: go_count,
+                    Decision.REVIEW.value: review_count,
+                    Decision.NO_GO.value: len(self) - go_count - review_count,
+                })
+        return rows
+
+    def decisions(self) -> list[Decision]:
+        return [DECISIONS[code] for code in self.decision]
+
+    def breakdown(self, i: int) -> ScoreBreakdown:
+        return ScoreBreakdown(**{name: float(values[i]) for name, values in self.components.items()})
+
+
+# ===========================================
+# BATCH SCORING
+# ===========================================
+
+def analyze_batch(
+    analyzer: BusinessAnalyzer,
+    batch,
+    min_score_go: Optional[float] = None,
+    min_score_review: Optional[float] = None,
+) -> ScoreBatch:
+    """Score a columnar batch (or a list of BusinessInput) like analyzer.analyze()"""
+    if isinstance(batch, (list, tuple)):
+        batch = columns_from_inputs(batch)
+    size = _batch_size(batch)
+
+    categories = _factorize(_column(batch, "category", size))
+    neighborhoods = _factorize(_column(batch, "neighborhood", size))
+    rating = _numbers(batch, "rating", size)
+    review_count = _numbers(batch, "review_count", size)
+    photo_count = _numbers(batch, "photo_count", size)
+    has_phone = _flags(batch, "phone", size)
+    has_email = _flags(batch, "email", size)
+    has_hours = _flags(batch, "hours", size)
+    has_website = _flags(batch, "has_website", size)
+    existing_website = _flags(batch, "existing_website", size)
+    velocity = (
+        np.asarray(batch["review_velocity"], dtype=np.float64) if "review_velocity" in batch
+        else np.full(size, np.nan)
+    )
+
+    components = {
+        "review_score": _bucketize(review_count, REVIEW_POINTS),
+        "rating_score": _bucketize(rating, RATING_POINTS),
+        "photo_score": _bucketize(photo_count, PHOTO_POINTS),
+        "category_score": _per_value(categories, lambda c: analyzer._category_score(c or "generic")),
+        "location_score": _per_value(
+            neighborhoods, lambda n: analyzer._location_score(n if _present(n) else None, "Asunción")
+        ),
+        "contact_score": np.select([has_phone & has_email, has_phone, has_email], [10.0, 7.0, 5.0], 0.0),
+        "activity_score": _activity_column(velocity, has_hours),
+    }
+
+    # Same left-to-right float additions as ScoreBreakdown.total; Python's
+    # round() (not np.round) once per distinct sum keeps totals identical
+    raw_total = components["review_score"]
+    for name in COMPONENTS[1:]:
+        raw_total = raw_total + components[name]
+    sums, inverse = np.unique(raw_total, return_inverse=True)
+    total = np.array([round(value, 2) for value in sums.tolist()], dtype=np.float64)[inverse.reshape(-1)]
+
+    lowered = _per_value(categories, lambda c: (c or "generic").lower() in HIGH_NECESSITY_CATEGORIES)
+    premium = _per_value(neighborhoods, lambda n: n in PREMIUM_NEIGHBORHOODS)
+    necessity = (
+        50.0
+        + np.select([review_count >= 20, review_count >= 10], [15.0, 10.0], 0.0)
+        + np.where(rating >= 4.0, 10.0, 0.0)
+        + lowered * 15.0
+        + premium * 10.0
+    )
+    necessity = np.minimum(necessity, 100)
+
+    # analyze() short-circuits businesses with a website: all scores 0
+    skipped = has_website & existing_website
+    for values in components.values():
+        values[skipped] = 0.0
+    total[skipped] = 0.0
+    necessity[skipped] = 0.0
+
+    result = ScoreBatch(
+        ids=_column(batch, "id", size),
+        components=components,
+        total=total,
+        necessity=necessity,
+        decision=np.empty(size, dtype=np.int8),
+        forced_no_go=has_website | ((review_count == 0) & (rating == 0)),
+    )
+    result.decision = result.decide(
+        analyzer.MIN_SCORE_GO if min_score_go is None else min_score_go,
+        analyzer.MIN_SCORE_REVIEW if min_score_review is None else min_score_review,
+    )
+    logger.debug(f"Scored {size} businesses in batch")
+    return result
+
+
+# ===========================================
+# STANDALONE EXECUTION
+# ===========================================
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import time
+    from pathlib import Path
+
+    from agents.analysis.scorer import business_input_from_record
+    from database.blob_store import load_records
+    from database.place_history import open_history
+
+    parser = argparse.ArgumentParser(description="Batch-score a dataset and sweep decision thresholds")
+    parser.add_argument("dataset", type=Path, help="JSON array of businesses")
+    parser.add_argument("--go", type=float, nargs="+", default=[BusinessAnalyzer.MIN_SCORE_GO])
+    parser.add_argument("--review", type=float, nargs="+", default=[BusinessAnalyzer.MIN_SCORE_REVIEW])
+    args = parser.parse_args()
+
+    history = open_history()
+    batch = columns_from_inputs(business_input_from_record(r, history) for r in load_records(args.dataset))
+    start = time.perf_counter()
+    scores = analyze_batch(BusinessAnalyzer(), batch)
+    sweep = scores.sweep(args.go, args.review)
+    print(f"Scored {len(scores)} businesses in {(time.perf_counter() - start) * 1000:.1f} ms")
+    print(json.dumps(sweep, indent=2))
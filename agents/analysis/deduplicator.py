@@ -0,0 +1,361 @@
+"""
+Business Analysis Agent - Entity Resolution for Business Deduplication
+
+Finds records that describe the same real business even when the name is
+spelled differently ("Café Bohemia" / "Cafe Bohemia"), while keeping chain
+branches apart ("Bellini Carmelitas" / "Bellini Sajonia").
+
+Instead of comparing every pair, each record is filed under a few blocking
+keys and only compared with records sharing a key:
+
+    place:<google_place_id>
+    phone:<normalized phone>
+    geo:<geohash7>             (~150 m cell; neighbours are searched too)
+    tri:<geohash5>:<trigram>   (name trigrams within a ~5 km area)
+
+Candidates get a score from name similarity, distance and phone, matches
+are merged with union-find, and every cluster gets a stable ID derived
+from its smallest member key (independent of input order).
+"""
+
+import hashlib
+import logging
+import math
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Optional
+
+from database.jsonl_store import normalize_phone, record_key
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================
+# CONSTANTS
+# ===========================================
+
+MATCH_THRESHOLD = 0.8        # Score needed to merge two records
+MAX_BLOCK_SIZE = 60          # Larger blocks (common trigrams, busy cells) are too vague to search
+GEOHASH_PRECISION = 7        # ~150 m cells for the geo block
+TRIGRAM_AREA_PRECISION = 5   # ~5 km area that name trigrams are scoped to
+
+# Phone and distance add at most this much, so candidates found only by
+# name need a name similarity of at least MATCH_THRESHOLD - MAX_SIGNAL_BONUS
+MAX_SIGNAL_BONUS = 0.5
+
+NAME_STOPWORDS = {"la", "el", "los", "las", "de", "del", "y", "the", "and"}
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+# ===========================================
+# NORMALIZATION & GEOMETRY
+# ===========================================
+
+def match_name(name: Optional[str]) -> str:
+    """Lowercase, accent-free, punctuation-free name without articles"""
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    words = re.sub(r"[^\w\s]", " ", text).split()
+    return " ".join(w for w in words if w not in NAME_STOPWORDS)
+
+
+def trigrams(text: str) -> set[str]:
+    if not text:
+        return set()  # Unnamed places share no name evidence
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def coordinate(value) -> Optional[float]:
+    """Float coordinate, or None for missing/unparsable values ("", "n/a", NaN)"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def geohash(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    code, bits, bit_count, even = [], 0, 0, True
+    while len(code) < precision:
+        rng, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            code.append(_GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+    return "".join(code)
+
+
+def geohash_cells(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> set[str]:
+    """The cell containing the point and its eight neighbours"""
+    lat_step = 180.0 / 2 ** (5 * precision // 2)
+    lon_step = 360.0 / 2 ** ((5 * precision + 1) // 2)
+    return {
+        geohash(lat + dlat * lat_step, lon + dlon * lon_step, precision)
+        for dlat in (-1, 0, 1)
+        for dlon in (-1, 0, 1)
+    }
+
+
+def distance_m(a: tuple, b: tuple) -> float:
+    """Haversine distance in meters"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (*a, *b))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6371000 * math.asin(math.sqrt(h))
+
+
+# ===========================================
+# MATCHING
+# ===========================================
+
+@dataclass
+class Entity:
+    """Pre-computed matching features of one record"""
+    key: str
+    name: str
+    grams: set
+    phone: str
+    place_id: Optional[str]
+    coords: Optional[tuple]
+
+    @classmethod
+    def from_record(cls, record: dict, key: str) -> "Entity":
+        name = match_name(record.get("name"))
+        lat, lon = coordinate(record.get("latitude")), coordinate(record.get("longitude"))
+        return cls(
+            key=key,
+            name=name,
+            grams=trigrams(name),
+            phone=normalize_phone(record.get("phone")),
+            place_id=record.get("google_place_id"),
+            coords=(lat, lon) if lat is not None and lon is not None else None,
+        )
+
+
+@dataclass
+class MatchScore:
+    name_similarity: float
+    distance: Optional[float]
+    phone: Optional[bool]     # True = same, False = different, None = unknown
+    score: float
+
+
+def score_pair(a: Entity, b: Entity) -> MatchScore:
+    """How likely two records are the same business (>= MATCH_THRESHOLD merges)"""
+    name_similarity = 0.0
+    if a.grams and b.grams:
+        name_similarity = len(a.grams & b.grams) / len(a.grams | b.grams)
+
+    phone = (a.phone == b.phone) if a.phone and b.phone else None
+
+    distance = None
+    # Identical coordinates come from the map viewport of the search, not the place
+    if a.coords and b.coords and a.coords != b.coords:
+        distance = distance_m(a.coords, b.coords)
+
+    if a.place_id and a.place_id == b.place_id:
+        return MatchScore(name_similarity, distance, phone, 1.0 + name_similarity)
+
+    score = name_similarity
+    if phone is True:
+        score += 0.3
+    elif phone is False:
+        score -= 0.2
+    if distance is not None:
+        if distance <= 50:
+            score += 0.2
+        elif distance <= 250:
+            score += 0.1
+        elif distance > 1000:
+            score -= 0.4  # Same brand, another branch
+    if a.place_id and b.place_id:
+        score -= 0.3      # Google lists them as two places
+    return MatchScore(name_similarity, distance, phone, score)
+
+
+# ===========================================
+# INDEX
+# ===========================================
+
+class EntityIndex:
+    """
+    Incremental entity-resolution index.
+
+    `add()` files a record under its blocking keys, merges it with every
+    matching candidate and returns its cluster ID; `find_match()` only
+    looks. Work per record is bounded by MAX_BLOCK_SIZE per key.
+    """
+
+    def __init__(self, threshold: float = MATCH_THRESHOLD, max_block_size: int = MAX_BLOCK_SIZE):
+        self.threshold = threshold
+        self.max_block_size = max_block_size
+        self.entities: list[Entity] = []
+        self.blocks: dict[str, list[int]] = {}
+        self._parent: list[int] = []
+        self._by_key: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    # -------------------------------------------
+    # Blocking
+    # -------------------------------------------
+
+    def _keys(self, entity: Entity, searching: bool) -> set[str]:
+        """Blocking keys; a search also covers the neighbouring geo cells"""
+        keys = set()
+        if entity.place_id:
+            keys.add(f"place:{entity.place_id}")
+        if entity.phone:
+            keys.add(f"phone:{entity.phone}")
+        area = ""
+        if entity.coords:
+            lat, lon = entity.coords
+            cells = geohash_cells(lat, lon) if searching else {geohash(lat, lon)}
+            keys.update(f"geo:{cell}" for cell in cells)
+            area = geohash(lat, lon, TRIGRAM_AREA_PRECISION)
+        keys.update(f"tri:{area}:{gram}" for gram in entity.grams if gram.strip())
+        return keys
+
+    def _candidates(self, entity: Entity) -> set[int]:
+        """
+        Records sharing a place, phone or geo block, plus records sharing
+        enough name trigrams to possibly reach the threshold
+        """
+        candidates = set()
+        shared_grams: dict[int, int] = {}
+        for key in self._keys(entity, searching=True):
+            block = self.blocks.get(key)
+            if not block:
+                continue
+            if key.startswith("tri:"):
+                if len(block) <= self.max_block_size:
+                    for i in block:
+                        shared_grams[i] = shared_grams.get(i, 0) + 1
+            elif len(block) <= self.max_block_size or key.startswith(("place:", "phone:")):
+                candidates.update(block)
+        # Jaccard similarity is at most |shared| / |own grams|
+        min_shared = (self.threshold - MAX_SIGNAL_BONUS) * len(entity.grams)
+        candidates.update(i for i, count in shared_grams.items() if count >= min_shared)
+        return candidates
+
+    # -------------------------------------------
+    # Union-find
+    # -------------------------------------------
+
+    def _find(self, i: int) -> int:
+        while self._parent[i] != i:
+            self._parent[i] = self._parent[self._parent[i]]
+            i = self._parent[i]
+        return i
+
+    def _union(self, i: int, j: int) -> None:
+        root_i, root_j = self._find(i), self._find(j)
+        if root_i == root_j:
+            return
+        # The smallest key is the root, which keeps cluster IDs order-independent
+        if self.entities[root_j].key < self.entities[root_i].key:
+            root_i, root_j = root_j, root_i
+        self._parent[root_j] = root_i
+
+    # -------------------------------------------
+    # Public API
+    # -------------------------------------------
+
+    def best_match(self, record: dict) -> Optional[tuple[int, MatchScore]]:
+        """Best matching indexed record at or above the threshold"""
+        entity = Entity.from_record(record, record_key(record) or "")
+        best = None
+        for candidate in self._candidates(entity):
+            match = score_pair(entity, self.entities[candidate])
+            if match.score >= self.threshold and (best is None or match.score > best[1].score):
+                best = (candidate, match)
+        return best
+
+    def find_match(self, record: dict) -> Optional[str]:
+        """Cluster ID of an already indexed record describing the same business"""
+        best = self.best_match(record)
+        return self.cluster_id(best[0]) if best else None
+
+    def add(self, record: dict, key: Optional[str] = None) -> str:
+        """Index a record, merge it with its matches and return its cluster ID"""
+        return self.cluster_id(self._add(record, key))
+
+    def _add(self, record: dict, key: Optional[str] = None) -> int:
+        key = key or record_key(record) or f"row:{len(self.entities)}"
+        if key in self._by_key:
+            return self._by_key[key]
+
+        entity = Entity.from_record(record, key)
+        matches = [
+            candidate for candidate in self._candidates(entity)
+            if score_pair(entity, self.entities[candidate]).score >= self.threshold
+        ]
+
+        index = len(self.entities)
+        self.entities.append(entity)
+        self._parent.append(index)
+        self._by_key[key] = index
+        for block_key in self._keys(entity, searching=False):
+            self.blocks.setdefault(block_key, []).append(index)
+        for candidate in matches:
+            self._union(index, candidate)
+        return index
+
+    def cluster_id(self, index: int) -> str:
+        root_key = self.entities[self._find(index)].key
+        return "ent_" + hashlib.sha1(root_key.encode("utf-8")).hexdigest()[:12]
+
+    def clusters(self) -> dict[str, list[int]]:
+        """Cluster ID -> indexes of its records (in insertion order)"""
+        groups: dict[str, list[int]] = {}
+        for index in range(len(self.entities)):
+            groups.setdefault(self.cluster_id(index), []).append(index)
+        return groups
+
+
+# ===========================================
+# BATCH HELPERS
+# ===========================================
+
+def resolve(records: list[dict]) -> list[str]:
+    """Cluster ID for every record, in input order"""
+    index = EntityIndex()
+    positions = [index._add(record, key=record_key(record) or f"row:{i}") for i, record in enumerate(records)]
+    # IDs are read after all merges, so early records get their final cluster
+    return [index.cluster_id(position) for position in positions]
+
+
+def _completeness(record: dict) -> int:
+    return sum(1 for value in record.values() if value not in (None, "", [], {}))
+
+
+def deduplicate(records: list[dict]) -> list[dict]:
+    """
+    One record per cluster: the most complete one, tagged with `entity_id`.
+    Keeps the position of each cluster's first record.
+    """
+    entity_ids = resolve(records)
+    best: dict[str, dict] = {}
+    order: list[str] = []
+    for record, entity_id in zip(records, entity_ids):
+        if entity_id not in best:
+            order.append(entity_id)
+            best[entity_id] = record
+        elif _completeness(record) > _completeness(best[entity_id]):
+            best[entity_id] = record
+    merged = len(records) - len(order)
+    if merged:
+        logger.info(f"Entity resolution merged {merged} duplicate records into {len(order)} businesses")
+    return [{**best[entity_id], "entity_id": entity_id} for entity_id in order]
@@ -10,8 +10,10 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Optional
+import hashlib
 import json
 import logging
+import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +78,20 @@ LOCATION_TIERS = {
     "default": 0.75,
 }
 
+# Score buckets: (minimum value, points), highest first. Shared by the
+# scalar and the vectorized batch scorer so both always agree.
+REVIEW_POINTS = ((50, 20), (20, 15), (10, 12), (5, 8), (1, 4))     # 0-20
+RATING_POINTS = ((4.5, 15), (4.0, 12), (3.5, 8), (3.0, 4))        # 0-15
+PHOTO_POINTS = ((10, 10), (5, 7), (1, 4))                          # 0-10
+VELOCITY_BAND_POINTS = {3: 5, 2: 4, 1: 3}                         # _velocity_band -> activity
+
+# Website necessity boosts
+HIGH_NECESSITY_CATEGORIES = ["dental", "medical", "legal", "real_estate", "salon"]
+PREMIUM_NEIGHBORHOODS = ["villa_morra", "carmelitas"]
+
+# Bump when the scoring logic changes; stored results of older versions are re-scored
+SCORER_VERSION = 1
+
 
 # ===========================================
 # DATA CLASSES
@@ -99,6 +115,7 @@ class BusinessInput:
     existing_website: Optional[str] = None
     hours: Optional[dict] = None
     raw_data: Optional[dict] = None
+    review_velocity: Optional[float] = None  # New reviews per 90 days (place history), None if unknown
 
 
 @dataclass
@@ -156,12 +173,16 @@ class AnalysisResult:
     recommended_pages: list = field(default_factory=list)
     
     # Decision
-    decision: Decision
+    decision: Decision = Decision.REVIEW
     decision_reasons: list = field(default_factory=list)
     
     # Metadata
     analyzed_at: datetime = field(default_factory=datetime.utcnow)
     
+    # What the result was computed from (see BusinessAnalyzer.is_current)
+    input_fingerprint: str = ""
+    config_version: str = ""
+    
     def to_dict(self) -> dict:
         return {
             "business_id": self.business_id,
@@ -174,7 +195,9 @@ class AnalysisResult:
             "recommended_pages": self.recommended_pages,
             "decision": self.decision.value,
             "decision_reasons": self.decision_reasons,
-            "analyzed_at": self.analyzed_at.isoformat()
+            "analyzed_at": self.analyzed_at.isoformat(),
+            "input_fingerprint": self.input_fingerprint,
+            "config_version": self.config_version,
         }
 
 
@@ -201,7 +224,12 @@ class BusinessAnalyzer:
     
     def analyze(self, business: BusinessInput) -> AnalysisResult:
         """Main analysis entry point"""
-        
+        result = self._analyze(business)
+        result.input_fingerprint = input_fingerprint(business)
+        result.config_version = self.config_version(business)
+        return result
+    
+    def _analyze(self, business: BusinessInput) -> AnalysisResult:
         # Skip if already has website
         if business.has_website and business.existing_website:
             return self._create_no_go_result(
@@ -247,45 +275,20 @@ class BusinessAnalyzer:
         
         # Review score (0-20 points)
         # More reviews = established business
-        if b.review_count >= 50:
-            breakdown.review_score = 20
-        elif b.review_count >= 20:
-            breakdown.review_score = 15
-        elif b.review_count >= 10:
-            breakdown.review_score = 12
-        elif b.review_count >= 5:
-            breakdown.review_score = 8
-        elif b.review_count >= 1:
-            breakdown.review_score = 4
+        breakdown.review_score = _points(b.review_count, REVIEW_POINTS)
         
         # Rating score (0-15 points)
-        if b.rating >= 4.5:
-            breakdown.rating_score = 15
-        elif b.rating >= 4.0:
-            breakdown.rating_score = 12
-        elif b.rating >= 3.5:
-            breakdown.rating_score = 8
-        elif b.rating >= 3.0:
-            breakdown.rating_score = 4
+        breakdown.rating_score = _points(b.rating, RATING_POINTS)
         
         # Photo score (0-10 points)
         # Photos indicate business cares about presence
-        if b.photo_count >= 10:
-            breakdown.photo_score = 10
-        elif b.photo_count >= 5:
-            breakdown.photo_score = 7
-        elif b.photo_count >= 1:
-            breakdown.photo_score = 4
+        breakdown.photo_score = _points(b.photo_count, PHOTO_POINTS)
         
         # Category score (0-25 points)
-        category_key = b.category.lower().replace(" ", "_")
-        weight = self.category_weights.get(category_key, 0.8)
-        breakdown.category_score = round(25 * weight / 1.5, 2)  # Normalize
+        breakdown.category_score = self._category_score(b.category)
         
         # Location score (0-15 points)
-        location_key = self._get_location_key(b.neighborhood, b.city)
-        loc_weight = self.location_tiers.get(location_key, 0.75)
-        breakdown.location_score = round(15 * loc_weight, 2)
+        breakdown.location_score = self._location_score(b.neighborhood, b.city)
         
         # Contact info score (0-10 points)
         if b.phone and b.email:
@@ -296,12 +299,57 @@ class BusinessAnalyzer:
             breakdown.contact_score = 5
         
         # Activity score (0-5 points)
-        # Based on hours and other indicators
-        if b.hours:
-            breakdown.activity_score = 5
+        breakdown.activity_score = _activity_points(_velocity_band(b.review_velocity), bool(b.hours))
         
         return breakdown
     
+    def _category_score(self, category: str) -> float:
+        category_key = category.lower().replace(" ", "_")
+        weight = self.category_weights.get(category_key, 0.8)
+        return round(25 * weight / 1.5, 2)  # Normalize
+    
+    def _location_score(self, neighborhood: Optional[str], city: str) -> float:
+        location_key = self._get_location_key(neighborhood, city)
+        loc_weight = self.location_tiers.get(location_key, 0.75)
+        return round(15 * loc_weight, 2)
+    
+    def config_version(self, b: BusinessInput) -> str:
+        """
+        Hash of the configuration this business's score depends on: scorer
+        version, thresholds and point tables, plus only *its* category weight,
+        location tier and website-necessity boosts. Changing the weight of
+        "salon" changes the version of salons and nothing else.
+        """
+        config = {
+            "version": SCORER_VERSION,
+            "thresholds": [self.MIN_SCORE_GO, self.MIN_SCORE_REVIEW, self.MIN_REVIEWS_QUALIFIED],
+            "points": [REVIEW_POINTS, RATING_POINTS, PHOTO_POINTS, sorted(VELOCITY_BAND_POINTS.items())],
+            "category": self._category_score(b.category),
+            "location": self._location_score(b.neighborhood, b.city),
+            "necessity": [
+                b.category.lower() in HIGH_NECESSITY_CATEGORIES,
+                b.neighborhood in PREMIUM_NEIGHBORHOODS,
+            ],
+        }
+        return _digest(config)
+    
+    def is_current(self, b: BusinessInput, stored: Optional[dict]) -> bool:
+        """Whether a stored score_breakdown was computed from these inputs and this configuration"""
+        return bool(stored) and (
+            stored.get("input_fingerprint") == input_fingerprint(b)
+            and stored.get("config_version") == self.config_version(b)
+        )
+    
+    def analyze_batch(self, batch, min_score_go: Optional[float] = None, min_score_review: Optional[float] = None):
+        """
+        Vectorized scoring of many businesses at once (requires numpy).
+        `batch` is a list of BusinessInput or a columnar mapping / DataFrame;
+        see agents/analysis/batch_scorer.py. Returns a ScoreBatch whose
+        scores and decisions equal analyze() for every row.
+        """
+        from agents.analysis.batch_scorer import analyze_batch
+        return analyze_batch(self, batch, min_score_go, min_score_review)
+    
     def _determine_customer_type(self, b: BusinessInput) -> CustomerType:
         """Determine primary customer type"""
         
@@ -348,12 +396,11 @@ class BusinessAnalyzer:
         
         # Category factor
         category = b.category.lower()
-        high_necessity_cats = ["dental", "medical", "legal", "real_estate", "salon"]
-        if category in high_necessity_cats:
+        if category in HIGH_NECESSITY_CATEGORIES:
             necessity += 15
         
         # Location factor (premium areas need online presence)
-        if b.neighborhood in ["villa_morra", "carmelitas"]:
+        if b.neighborhood in PREMIUM_NEIGHBORHOODS:
             necessity += 10
         
         # Cap at 100
@@ -513,13 +560,140 @@ class BusinessAnalyzer:
         )
 
 
+def _velocity_band(velocity: Optional[float]) -> Optional[int]:
+    """Review velocity as the activity score sees it: None unknown, 0 no growth, 1-3 growing"""
+    if velocity is None:
+        return None
+    if velocity >= 9:
+        return 3
+    if velocity >= 3:
+        return 2
+    return 1 if velocity > 0 else 0
+
+
+def _activity_points(band: Optional[int], has_hours: bool) -> float:
+    """Review growth from the place history; opening hours when there is none yet"""
+    if band:
+        return VELOCITY_BAND_POINTS[band]
+    if not has_hours:
+        return 0.0
+    return 1 if band == 0 else 5   # Band 0: open, but nobody reviews it anymore
+
+
+def _digest(value) -> str:
+    data = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.sha1(data).hexdigest()[:16]
+
+
+def input_fingerprint(b: BusinessInput) -> str:
+    """
+    Hash of the inputs analyze() actually reads. Contact details, hours and
+    websites only count as present/absent, and the review velocity only by
+    band, so a new phone number or a slightly different velocity does not
+    force a re-score.
+    """
+    return _digest([
+        b.name, b.category, b.city, b.neighborhood,
+        b.rating, b.review_count, b.photo_count,
+        bool(b.phone), bool(b.email), bool(b.hours),
+        bool(b.has_website), bool(b.existing_website),
+        _velocity_band(b.review_velocity),
+    ])
+
+
+def _points(value: float, table: tuple) -> float:
+    """Points of the first bucket whose minimum `value` reaches (0 below all)"""
+    for minimum, points in table:
+        if value >= minimum:
+            return points
+    return 0.0
+
+
 # ===========================================
 # DATABASE STORAGE
 # ===========================================
 
-def store_analysis_result(result: AnalysisResult, db_connection) -> None:
+def business_input_from_record(record: dict, history=None) -> BusinessInput:
+    """
+    Build scorer input from a scraped business dict (JSON file or LocalDatabase row).
+    `history` (database.place_history.PlaceHistory) adds the review velocity.
+    """
+    website = record.get("website_url") or record.get("existing_website")
+    place_id = record.get("google_place_id")
+    return BusinessInput(
+        id=record.get("business_id") or record.get("google_place_id") or record.get("name", ""),
+        name=record.get("name", ""),
+        category=record.get("discovered_category") or record.get("category") or "generic",
+        address=record.get("address") or "",
+        city=record.get("city") or "Asunción",
+        neighborhood=record.get("neighborhood"),
+        phone=record.get("phone"),
+        email=record.get("email"),
+        rating=record.get("rating") or 0.0,
+        review_count=record.get("review_count") or 0,
+        photo_count=record.get("photo_count") or len(record.get("photo_urls") or []),
+        has_website=bool(record.get("has_website") or website),
+        existing_website=website,
+        hours=record.get("opening_hours"),
+        raw_data=record,
+        review_velocity=history.velocity(place_id) if history is not None and place_id else None,
+    )
+
+
+ANALYSIS_CHUNK_SIZE = 500   # Results per bulk UPDATE round trip
+
+DECISION_STATUS = {
+    Decision.GO: "qualified",
+    Decision.REVIEW: "manual_review",
+    Decision.NO_GO: "low_priority",
+}
+
+# Statuses analyze_database() re-scores by default: new businesses plus
+# those it scored before (later pipeline statuses are left alone)
+SCORED_STATUSES = ("discovered", *DECISION_STATUS.values())
+
+# The Postgres business_status enum has no manual_review value;
+# 'analyzing' keeps those businesses out of outreach until reviewed
+PG_STATUS_OVERRIDES = {"manual_review": "analyzing"}
+
+# One statement per chunk: the chunk is passed as parallel arrays and
+# joined against businesses with UNNEST
+PG_BULK_UPDATE = """
+    UPDATE businesses AS b SET
+        score = u.score,
+        score_breakdown = u.breakdown::jsonb,
+        status = u.status::business_status,
+        analyzed_at = NOW(),
+        last_updated_at = NOW()
+    FROM UNNEST($1::text[], $2::integer[], $3::text[], $4::text[]) AS u(key, score, breakdown, status)
+    WHERE {match}
+"""
+PG_MATCH_ID = "b.id = u.key::uuid"
+PG_MATCH_PLACE_ID = "b.google_place_id = u.key"
+
+
+def analysis_row(result: AnalysisResult) -> tuple:
+    """
+    (business_id, score, breakdown, status) for one result. The fingerprint
+    and config version travel inside the breakdown JSON, so the next run can
+    skip the business while neither changed.
+    """
+    breakdown = {
+        **result.score_breakdown.to_dict(),
+        "input_fingerprint": result.input_fingerprint,
+        "config_version": result.config_version,
+    }
+    return (
+        result.business_id,
+        result.total_score,
+        breakdown,
+        DECISION_STATUS.get(result.decision, "low_priority"),
+    )
+
+
+def store_analysis_results(results, db_connection, chunk_size: int = ANALYSIS_CHUNK_SIZE) -> int:
     """
-    Store analysis result in database.
+    Store many analysis results in one transaction, one round trip per chunk.
     
     Updates the businesses table with:
     - score
@@ -527,44 +701,123 @@ def store_analysis_result(result: AnalysisResult, db_connection) -> None:
     - status (qualified/low_priority)
     - analyzed_at
     
-    SQL executed:
-    
-    UPDATE businesses SET
-        score = :total_score,
-        score_breakdown = :breakdown_json,
-        status = :new_status,
-        analyzed_at = NOW()
-    WHERE id = :business_id
+    `db_connection` is a database.local_db.LocalDatabase (executemany per
+    chunk); for Postgres use store_analysis_results_pg.
     """
-    
-    new_status = {
-        Decision.GO: "qualified",
-        Decision.REVIEW: "manual_review", 
-        Decision.NO_GO: "low_priority"
-    }.get(result.decision, "low_priority")
-    
-    # This would use SQLAlchemy or asyncpg
-    query = """
-        UPDATE businesses SET
-            score = $1,
-            score_breakdown = $2,
-            status = $3,
-            analyzed_at = NOW()
-        WHERE id = $4
+    updated = db_connection.update_analyses((analysis_row(r) for r in results), chunk_size)
+    logger.info(f"Stored {updated} analysis results")
+    return updated
+
+
+async def store_analysis_results_pg(results, conn, chunk_size: int = ANALYSIS_CHUNK_SIZE) -> int:
     """
-    
-    # Execute: db_connection.execute(query, params)
+    Postgres version of store_analysis_results for an asyncpg connection:
+    one UNNEST-based UPDATE per chunk, all in a single transaction.
+    Results keyed by UUID match businesses.id, others google_place_id.
+    """
+    results = list(results)
+    updated = 0
+    async with conn.transaction():
+        for start in range(0, len(results), chunk_size):
+            rows = [analysis_row(r) for r in results[start:start + chunk_size]]
+            by_match = {PG_MATCH_ID: [], PG_MATCH_PLACE_ID: []}
+            for row in rows:
+                by_match[PG_MATCH_ID if _is_uuid(row[0]) else PG_MATCH_PLACE_ID].append(row)
+            for match, group in by_match.items():
+                if not group:
+                    continue
+                status = await conn.execute(
+                    PG_BULK_UPDATE.format(match=match),
+                    [row[0] for row in group],
+                    [round(row[1]) for row in group],
+                    [json.dumps(row[2]) for row in group],
+                    [PG_STATUS_OVERRIDES.get(row[3], row[3]) for row in group],
+                )
+                updated += int(status.split()[-1])  # "UPDATE <count>"
+    logger.info(f"Stored {updated} analysis results")
+    return updated
+
+
+def _is_uuid(value: str) -> bool:
+    try:
+        uuid.UUID(str(value))
+        return True
+    except ValueError:
+        return False
+
+
+def store_analysis_result(result: AnalysisResult, db_connection) -> None:
+    """Store a single analysis result (see store_analysis_results)"""
+    store_analysis_results([result], db_connection)
     logger.info(
         f"Stored analysis for {result.business_id}: "
         f"score={result.total_score}, decision={result.decision.value}"
     )
 
 
+def analyze_database(
+    db_connection,
+    status: Optional[str] = None,
+    place_ids: Optional[list] = None,
+    force: bool = False,
+) -> dict:
+    """
+    Score every business with the given status (default: SCORED_STATUSES,
+    i.e. new and previously scored ones) and store the results in bulk.
+    With `place_ids` (e.g. a snapshot delta) only those businesses are
+    (re)scored, whatever their status. Businesses whose stored result has
+    the same input fingerprint and config version are skipped (counted as
+    "unchanged") unless `force` is set.
+    """
+    from database.place_history import open_history
+    
+    analyzer = BusinessAnalyzer()
+    history = open_history()
+    counts = {decision.value: 0 for decision in Decision}
+    counts["unchanged"] = 0
+    results = []
+    if place_ids is not None:
+        records = [db_connection.get_business(place_id) for place_id in place_ids]
+        records = [record for record in records if record is not None]
+    else:
+        records = [
+            record
+            for each_status in ((status,) if status else SCORED_STATUSES)
+            for record in db_connection.query_businesses(status=each_status)
+        ]
+    for record in records:
+        business = business_input_from_record(record, history)
+        if not force and analyzer.is_current(business, record.get("score_breakdown")):
+            counts["unchanged"] += 1
+            continue
+        result = analyzer.analyze(business)
+        results.append(result)
+        counts[result.decision.value] += 1
+    store_analysis_results(results, db_connection)
+    return counts
+
+
 # ===========================================
 # EXAMPLE USAGE
 # ===========================================
 
 if __name__ == "__main__":
+    import sys
+    from database.blob_store import load_records
+    from database.local_db import configured_database
+    
+    # With LEADS_DB set, score the new and changed businesses in the database,
+    # or only the places of a snapshot delta file given as argument
+    db = configured_database()
+    if db is not None:
+        logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+        place_ids = None
+        if len(sys.argv) > 1:
+            place_ids = [r["google_place_id"] for r in load_records(sys.argv[1]) if r.get("google_place_id")]
+        print(json.dumps(analyze_database(db, place_ids=place_ids), indent=2))
+        db.close()
+        raise SystemExit(0)
+    
     # Example business from Asunción
     example_business = BusinessInput(
         id="biz_001",
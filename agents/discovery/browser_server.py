@@ -0,0 +1,81 @@
+"""
+Discovery Agent - Shared Browser Server
+
+Launches one long-lived Chromium that short-lived scraper processes attach
+to over a local DevTools endpoint, so scripts skip the browser startup and
+start scraping right away. Every MapsScraper gets its own isolated context
+(cookies, storage, user agent) on the shared browser.
+
+Usage:
+    python -m agents.discovery.browser_server                 # Headless, port 9222
+    python -m agents.discovery.browser_server --port 9333 --headed
+
+    export MAPS_BROWSER_ENDPOINT=http://127.0.0.1:9222
+    python run_discovery.py                                   # Attaches instead of launching
+"""
+
+import argparse
+import asyncio
+import logging
+
+from playwright.async_api import async_playwright
+
+from agents.discovery.google_maps import BROWSER_ARGS, BROWSER_ENDPOINT_ENV
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================
+# CONSTANTS
+# ===========================================
+
+DEFAULT_HOST = "127.0.0.1"     # Never expose the DevTools endpoint beyond localhost
+DEFAULT_PORT = 9222
+
+
+# ===========================================
+# SERVER
+# ===========================================
+
+async def serve(port: int = DEFAULT_PORT, headless: bool = True) -> None:
+    """Launch the shared browser and keep it running until interrupted"""
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(
+            headless=headless,
+            args=BROWSER_ARGS + [
+                f"--remote-debugging-address={DEFAULT_HOST}",
+                f"--remote-debugging-port={port}",
+            ],
+        )
+        endpoint = f"http://{DEFAULT_HOST}:{port}"
+        logger.info(f"Shared browser listening on {endpoint}")
+        logger.info(f"Attach scrapers with: export {BROWSER_ENDPOINT_ENV}={endpoint}")
+
+        disconnected = asyncio.Event()
+        browser.on("disconnected", lambda _: disconnected.set())
+        try:
+            await disconnected.wait()
+            logger.error("Shared browser exited")
+        finally:
+            if browser.is_connected():
+                await browser.close()
+
+
+# ===========================================
+# STANDALONE EXECUTION
+# ===========================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a shared Chromium for MapsScraper clients")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="DevTools port to listen on")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    try:
+        asyncio.run(serve(port=args.port, headless=not args.headed))
+    except KeyboardInterrupt:
+        logger.info("Shared browser stopped")
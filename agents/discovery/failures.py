@@ -0,0 +1,175 @@
+"""
+Discovery Agent - Search Failure Classification & Circuit Breaker
+
+Turns scraper errors into structured failure classes, each with its own
+backoff policy, and provides a circuit breaker that pauses every worker
+sharing it when the failure rate spikes (e.g. Google starts serving
+CAPTCHAs to our IP).
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================
+# ENUMS & CONSTANTS
+# ===========================================
+
+class FailureClass(Enum):
+    NAVIGATION_TIMEOUT = "navigation_timeout"
+    CONSENT_WALL = "consent_wall"
+    EMPTY_RESULTS = "empty_results"
+    CAPTCHA = "captcha"                  # CAPTCHA / "unusual traffic" interstitial
+    BROWSER_CRASH = "browser_crash"
+    UNKNOWN = "unknown"
+
+
+@dataclass(frozen=True)
+class BackoffPolicy:
+    """Exponential backoff with jitter for one failure class"""
+    base_delay: float           # Seconds before the first retry
+    max_delay: float            # Upper bound for any retry delay
+    factor: float = 2.0
+    max_attempts: int = 3       # Attempts per run before giving up on a combo
+    jitter: float = 0.2         # +/- share of random jitter
+
+    def delay(self, attempt: int) -> float:
+        """Delay before retry number `attempt` (1-based)"""
+        delay = min(self.base_delay * self.factor ** max(attempt - 1, 0), self.max_delay)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+BACKOFF_POLICIES = {
+    FailureClass.NAVIGATION_TIMEOUT: BackoffPolicy(base_delay=20, max_delay=180),
+    FailureClass.CONSENT_WALL: BackoffPolicy(base_delay=5, max_delay=30, max_attempts=2),
+    FailureClass.EMPTY_RESULTS: BackoffPolicy(base_delay=60, max_delay=300, max_attempts=2),
+    FailureClass.CAPTCHA: BackoffPolicy(base_delay=300, max_delay=1800, max_attempts=5),
+    FailureClass.BROWSER_CRASH: BackoffPolicy(base_delay=5, max_delay=60),
+    FailureClass.UNKNOWN: BackoffPolicy(base_delay=10, max_delay=120),
+}
+
+# Substrings Playwright uses when the browser, context or page went away
+CRASH_MESSAGES = (
+    "target closed",
+    "target page, context or browser has been closed",
+    "browser has been closed",
+    "browser has disconnected",
+    "connection closed",
+    "page crashed",
+)
+
+
+# ===========================================
+# EXCEPTIONS & CLASSIFICATION
+# ===========================================
+
+class SearchFailure(Exception):
+    """A search that failed for a known, classified reason"""
+
+    def __init__(self, failure_class: FailureClass, message: str = ""):
+        self.failure_class = failure_class
+        super().__init__(message or failure_class.value)
+
+
+def classify_exception(exc: BaseException) -> FailureClass:
+    """Map an exception raised while searching to a FailureClass"""
+    if isinstance(exc, SearchFailure):
+        return exc.failure_class
+
+    message = str(exc).lower()
+    if any(text in message for text in CRASH_MESSAGES):
+        return FailureClass.BROWSER_CRASH
+    # playwright.async_api.TimeoutError and asyncio.TimeoutError
+    if type(exc).__name__ == "TimeoutError" or "timeout" in message:
+        return FailureClass.NAVIGATION_TIMEOUT
+    return FailureClass.UNKNOWN
+
+
+# ===========================================
+# CIRCUIT BREAKER
+# ===========================================
+
+class CircuitBreaker:
+    """
+    Shared failure-rate circuit breaker.
+
+    Tracks the outcome of the last `window` searches. When the failure rate
+    reaches `failure_threshold` (or a CAPTCHA is seen) the circuit opens and
+    every worker awaiting `wait_until_closed()` pauses for the cooldown.
+    After the cooldown one probe search is let through (half-open): success
+    closes the circuit, another failure re-opens it with a doubled cooldown.
+    """
+
+    def __init__(
+        self,
+        window: int = 10,
+        failure_threshold: float = 0.5,
+        min_calls: int = 4,
+        cooldown: float = 60.0,
+        max_cooldown: float = 1800.0,
+    ):
+        self.window = window
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+
+        self.outcomes: deque = deque(maxlen=window)
+        self.cooldown = cooldown
+        self.open_until: float = 0.0
+        self.half_open = False
+        self.trips = 0
+
+    @property
+    def is_open(self) -> bool:
+        return time.monotonic() < self.open_until
+
+    @property
+    def failure_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return sum(1 for ok in self.outcomes if not ok) / len(self.outcomes)
+
+    def record_success(self) -> None:
+        self.outcomes.append(True)
+        if self.half_open:
+            logger.info("Circuit closed after successful probe search")
+            self.half_open = False
+            self.cooldown = self.base_cooldown
+            self.outcomes.clear()
+
+    def record_failure(self, failure_class: FailureClass) -> None:
+        self.outcomes.append(False)
+        if self.half_open:
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            self._trip(f"probe search failed ({failure_class.value})")
+        elif failure_class == FailureClass.CAPTCHA:
+            self._trip("CAPTCHA / interstitial page detected")
+        elif len(self.outcomes) >= self.min_calls and self.failure_rate >= self.failure_threshold:
+            self._trip(f"failure rate {self.failure_rate:.0%} over last {len(self.outcomes)} searches")
+
+    def _trip(self, reason: str) -> None:
+        self.trips += 1
+        self.half_open = False
+        self.open_until = time.monotonic() + self.cooldown
+        logger.warning(f"Circuit opened for {self.cooldown:.0f}s: {reason}")
+
+    def remaining(self) -> float:
+        return max(self.open_until - time.monotonic(), 0.0)
+
+    async def wait_until_closed(self) -> Optional[float]:
+        """Block while the circuit is open. Returns seconds waited, if any."""
+        waited = self.remaining()
+        if waited <= 0:
+            return None
+        await asyncio.sleep(waited)
+        self.half_open = True
+        return waited
@@ -9,8 +9,10 @@ businesses without an official website.
 import asyncio
 import json
 import logging
+import os
 import random
 import re
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -19,6 +21,12 @@ from urllib.parse import urlparse
 
 from playwright.async_api import async_playwright, Page, Browser, TimeoutError as PlaywrightTimeout
 
+from agents.discovery.failures import FailureClass, SearchFailure, classify_exception
+from agents.discovery.network import NetworkAccountant
+from agents.discovery.supervisor import BrowserSupervisor
+from database.background_writer import shared_writer
+from database.local_db import configured_database
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,6 +52,27 @@ SOCIAL_MEDIA_DOMAINS = [
     "youtube.com", "youtu.be",
 ]
 
+# Chromium flags shared by locally launched browsers and the shared browser server
+BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-web-security',
+    '--lang=es-PY,es',
+]
+
+# Optional long-lived browser (python -m agents.discovery.browser_server) to attach to
+BROWSER_ENDPOINT_ENV = "MAPS_BROWSER_ENDPOINT"
+
+# Early termination of the results feed scroll when known places dominate
+UNSEEN_WINDOW = 15          # Most recent surfaced places considered
+MIN_UNSEEN_RATIO = 0.2      # Stop scrolling when fewer than this share are unseen
+
+# Per-business extraction deadline - optional sections are skipped once it is spent
+BUSINESS_TIME_BUDGET = 30.0   # Seconds per business
+MIN_WAIT_MS = 500             # Floor for selector waits clamped to the remaining budget
+
 # Selectors for Google Maps (updated January 2026 - ULTRA Deep Data Extraction)
 SELECTORS = {
     "search_input": '#UGojuc, input.UGojuc, input[name="q"]',
@@ -121,6 +150,10 @@ SELECTORS = {
     "update_text": 'div.ZXMsO',  # Update text content
     "update_date": 'div.jrtH8d',  # "Hace un año"
     
+    # === BLOCKING PAGES ===
+    "captcha": 'form#captcha-form, iframe[src*="recaptcha"], div#recaptcha, div.g-recaptcha',
+    "consent_form": 'form[action*="consent"]',
+    
     # === INFORMATION TAB (Business Attributes) ===
     "info_tab": 'button[aria-label*="Información sobre"]',  # Tab button
     "info_section": 'div.iP2t7d.fontBodyMedium',  # Each attribute section
@@ -212,6 +245,9 @@ class ScrapedBusiness:
     # Customer Updates (posts from the business or customers)
     customer_updates: list = field(default_factory=list)  # [{"text", "date"}, ...]
     
+    # Sections skipped because the per-business time budget ran out (for later enrichment)
+    partial_sections: list = field(default_factory=list)  # ["reviews", "photos", ...]
+    
     # Metadata
     latitude: Optional[float] = None
     longitude: Optional[float] = None
@@ -278,6 +314,7 @@ class ScrapedBusiness:
             # Updates
             "customer_updates": self.customer_updates,
             # Meta
+            "partial_sections": self.partial_sections,
             "scraped_at": self.scraped_at.isoformat(),
         }
 
@@ -300,16 +337,37 @@ class MapsScraper:
         delay_max: float = 5.0,
         max_results_per_search: int = 60,
         timeout: int = 30000,
+        business_time_budget: float = BUSINESS_TIME_BUDGET,
+        browser_endpoint: Optional[str] = None,
     ):
         self.headless = headless
         self.delay_min = delay_min
         self.delay_max = delay_max
         self.max_results = max_results_per_search
         self.timeout = timeout
+        self.business_time_budget = business_time_budget
+        # Attach to a shared browser server instead of launching Chromium
+        self.browser_endpoint = browser_endpoint or os.environ.get(BROWSER_ENDPOINT_ENV)
+        self._owns_browser = True
         
         self.browser: Optional[Browser] = None
+        self.context = None
         self.page: Optional[Page] = None
+        self._playwright = None
         self.results: list[ScrapedBusiness] = []
+        self.last_scroll_stats: dict = {}
+        self.last_failure: Optional[FailureClass] = None
+        
+        # Requests/bytes per resource type, attributed to the current search and business
+        self.network = NetworkAccountant()
+        self.last_network_stats: dict = {}
+        
+        # Per-business time budget state (reset for every business)
+        self._business_deadline: float = 0.0
+        self._partial_sections: list = []
+        
+        # Progress of the current search, kept across browser crashes so it can resume
+        self.search_checkpoint: Optional[dict] = None
         
         # Load locations config
         self.locations = self._load_locations()
@@ -565,23 +623,36 @@ class MapsScraper:
                 return 0.0
         return 0.0
     
-    async def initialize(self) -> None:
-        """Initialize browser with anti-detection settings"""
-        playwright = await async_playwright().start()
-        
-        self.browser = await playwright.chromium.launch(
-            headless=self.headless,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-web-security',
-                '--lang=es-PY,es',
-            ]
-        )
+    async def initialize(self, storage_state: Optional[str] = None) -> None:
+        """Initialize browser with anti-detection settings
+        
+        With a browser endpoint configured, connects to the shared browser
+        server instead of launching Chromium and works in its own isolated
+        context. Falls back to a local launch if the server is unreachable.
+        
+        Args:
+            storage_state: Path to a saved session (cookies, consent) to restore
+        """
+        self._playwright = await async_playwright().start()
+        
+        self.browser = None
+        if self.browser_endpoint:
+            try:
+                self.browser = await self._playwright.chromium.connect_over_cdp(self.browser_endpoint)
+                self._owns_browser = False
+                logger.info(f"Connected to shared browser at {self.browser_endpoint}")
+            except Exception as e:
+                logger.warning(f"Shared browser at {self.browser_endpoint} unavailable ({e}), launching locally")
+        
+        if not self.browser:
+            self.browser = await self._playwright.chromium.launch(
+                headless=self.headless,
+                args=BROWSER_ARGS,
+            )
+            self._owns_browser = True
         
         context = await self.browser.new_context(
+            storage_state=storage_state,
             user_agent=self._get_random_user_agent(),
             viewport={"width": 1920, "height": 1080},
             locale="es-PY",
@@ -597,22 +668,71 @@ class MapsScraper:
             window.chrome = {runtime: {}};
         """)
         
+        self.context = context
         self.page = await context.new_page()
         self.page.set_default_timeout(self.timeout)
+        await self.network.attach(context, self.page)
         
         logger.info("Browser initialized with anti-detection measures")
     
     async def close(self) -> None:
-        """Close browser"""
+        """Close browser (also safe after the browser crashed)
+        
+        A shared browser server is left running - only our context is closed
+        and the connection dropped.
+        """
+        if self.context and not self._owns_browser:
+            try:
+                await self.context.close()
+            except Exception as e:
+                logger.debug(f"Context already gone: {e}")
         if self.browser:
-            await self.browser.close()
-            logger.info("Browser closed")
+            try:
+                await self.browser.close()
+                logger.info("Browser closed" if self._owns_browser else "Disconnected from shared browser")
+            except Exception as e:
+                logger.debug(f"Browser already gone: {e}")
+        if self._playwright:
+            try:
+                await self._playwright.stop()
+            except Exception as e:
+                logger.debug(f"Playwright already stopped: {e}")
+        self.browser = None
+        self.context = None
+        self.page = None
+        self._playwright = None
+    
+    def take_network_stats(self) -> dict:
+        """
+        Network report of the last search or place page, handed out once:
+        a later task that fails before opening anything reports nothing
+        instead of counting the same traffic again.
+        """
+        stats, self.last_network_stats = self.last_network_stats, {}
+        return stats
+    
+    def is_alive(self) -> bool:
+        """True if the browser is connected and the search page is open"""
+        return bool(
+            self.browser
+            and self.browser.is_connected()
+            and self.page
+            and not self.page.is_closed()
+        )
+    
+    async def save_session(self, path: str) -> None:
+        """Save cookies/consent state so a relaunched browser can restore it"""
+        if self.context:
+            await self.context.storage_state(path=path)
     
     async def search_businesses(
         self,
         query: str,
         location: str,
-        max_results: Optional[int] = None
+        max_results: Optional[int] = None,
+        known_places: Optional[set] = None,
+        raise_on_failure: bool = False,
+        resume: bool = False,
     ) -> list[ScrapedBusiness]:
         """
         Search for businesses on Google Maps.
@@ -621,6 +741,15 @@ class MapsScraper:
             query: Search term (e.g., "restaurantes", "salón de belleza")
             location: Location to search (e.g., "Villa Morra, Asunción")
             max_results: Maximum results to scrape
+            known_places: Place IDs (or "name:<name>" keys) already scraped.
+                Known places are skipped and the feed scroll stops early
+                once they dominate the newly surfaced results.
+            raise_on_failure: Raise SearchFailure (navigation timeout, consent
+                wall, empty results, CAPTCHA, browser crash) instead of
+                logging and returning an empty list.
+            resume: Continue the interrupted search in `search_checkpoint`
+                (same query and location) instead of starting over. Places
+                already extracted are kept and skipped while scrolling.
             
         Returns:
             List of ScrapedBusiness objects
@@ -630,98 +759,343 @@ class MapsScraper:
         
         max_results = max_results or self.max_results
         search_query = f"{query} en {location}, Paraguay"
+        self.last_scroll_stats = {}
+        self.last_failure = None
+        
+        checkpoint = self.search_checkpoint
+        if not (
+            resume and checkpoint
+            and checkpoint["query"] == query and checkpoint["location"] == location
+        ):
+            checkpoint = {"query": query, "location": location, "results": [], "done": set()}
+        elif checkpoint["done"]:
+            logger.info(f"Resuming search after {len(checkpoint['done'])} extracted places")
+        self.search_checkpoint = checkpoint
+        
+        remaining = max_results - len(checkpoint["done"])
+        if remaining <= 0:
+            self.search_checkpoint = None
+            return list(checkpoint["results"])
         
         logger.info(f"Searching: {search_query}")
+        self.network.begin_search(search_query)
         
         try:
-            # Navigate to Google Maps
-            await self.page.goto("https://www.google.com/maps?hl=es", wait_until="domcontentloaded")
-            await self._random_delay(1.0)
-            
-            # Handle cookie consent - try multiple button variations
-            for selector in [
-                'button[aria-label*="Aceptar"]',
-                'button[aria-label*="Accept"]', 
-                'button:has-text("Aceptar todo")',
-                'button:has-text("Accept all")',
-                'form[action*="consent"] button',
-                'button#L2AGLb',
-            ]:
-                try:
-                    btn = await self.page.query_selector(selector)
-                    if btn:
-                        await btn.click()
-                        logger.info("Accepted cookie consent")
-                        await self._random_delay(0.5)
-                        break
-                except Exception:
-                    continue
-            
-            # Perform search
-            search_box = await self.page.wait_for_selector(SELECTORS["search_input"], timeout=10000)
-            await search_box.click()
-            await self._random_delay(0.3)
-            await search_box.fill(search_query)
-            await self._random_delay(0.3)
-            
-            # Click search button or press Enter
-            search_btn = await self.page.query_selector(SELECTORS["search_button"])
-            if search_btn:
-                await search_btn.click()
-            else:
-                await self.page.keyboard.press("Enter")
-            
-            await self._random_delay(1.5)
-            
-            # Wait for results panel to appear (left sidebar with business list)
-            try:
-                await self.page.wait_for_selector(SELECTORS["results_container"], timeout=10000)
-            except PlaywrightTimeout:
-                # If no results panel, try scrollable container
-                try:
-                    await self.page.wait_for_selector('div.m6QErb.WNBkOb', timeout=5000)
-                except PlaywrightTimeout:
-                    logger.warning("Results panel not found, checking for map pins...")
-            
-            await self._random_delay()
-            
-            # Scroll to load more results
-            businesses = await self._scroll_and_collect_results(max_results)
+            businesses = await self._open_search_results(
+                search_query, remaining, known_places, skip_places=checkpoint["done"]
+            )
             
             # Process each business
-            results = []
-            for i, business_el in enumerate(businesses[:max_results]):
+            results = checkpoint["results"]
+            for i, business_el in enumerate(businesses[:remaining]):
                 try:
-                    business = await self._extract_business_details(business_el, location)
+                    label = await business_el.get_attribute("aria-label")
+                    place = self._href_place_key(await business_el.get_attribute("href"), label)
+                    self.network.begin_business(label or place or f"#{i}")
+                    try:
+                        business = await self._extract_business_details(business_el, location)
+                    finally:
+                        self.network.end_business()
                     if business:
                         results.append(business)
                         logger.info(f"[{i+1}/{len(businesses)}] Scraped: {business.name}")
+                    if place:
+                        checkpoint["done"].add(place)
                     
                     await self._random_delay(0.5)
                     
                 except Exception as e:
+                    # A dead browser fails every remaining place - surface it so the
+                    # search can resume from here after a relaunch
+                    if classify_exception(e) == FailureClass.BROWSER_CRASH:
+                        raise
                     logger.warning(f"Error extracting business {i}: {e}")
                     continue
             
+            self.search_checkpoint = None
             self.results.extend(results)
-            return results
+            return list(results)
             
-        except PlaywrightTimeout:
+        except PlaywrightTimeout as e:
             # Save screenshot for debugging
-            await self.page.screenshot(path="debug_timeout.png")
-            logger.error(f"Timeout searching for: {search_query}. Screenshot saved.")
+            try:
+                await self.page.screenshot(path="debug_timeout.png")
+                logger.error(f"Timeout searching for: {search_query}. Screenshot saved.")
+            except Exception:
+                logger.error(f"Timeout searching for: {search_query}.")
+            self.last_failure = FailureClass.NAVIGATION_TIMEOUT
+            if raise_on_failure:
+                raise SearchFailure(self.last_failure, str(e)) from e
             return []
         except Exception as e:
-            logger.error(f"Error during search: {e}")
+            self.last_failure = classify_exception(e)
+            logger.error(f"Error during search ({self.last_failure.value}): {e}")
+            if raise_on_failure:
+                if isinstance(e, SearchFailure):
+                    raise
+                raise SearchFailure(self.last_failure, str(e)) from e
             return []
+        finally:
+            self.last_network_stats = self.network.end_search()
+    
+    async def collect_place_links(
+        self,
+        query: str,
+        location: str,
+        max_results: Optional[int] = None,
+        known_places: Optional[set] = None,
+    ) -> list[dict]:
+        """
+        Run a search and return its place links without opening them.
+        
+        Used by distributed discovery, where opening each place is a separate
+        task. Raises SearchFailure like search_businesses(raise_on_failure=True).
+        
+        Returns:
+            List of {"url", "name", "place_key"} dicts
+        """
+        if not self.page:
+            await self.initialize()
+        
+        search_query = f"{query} en {location}, Paraguay"
+        self.last_scroll_stats = {}
+        self.last_failure = None
+        logger.info(f"Collecting links: {search_query}")
+        self.network.begin_search(search_query)
+        
+        try:
+            elements = await self._open_search_results(
+                search_query, max_results or self.max_results, known_places
+            )
+            links = []
+            for element in elements:
+                href = await element.get_attribute("href")
+                name = await element.get_attribute("aria-label")
+                if href:
+                    links.append({
+                        "url": href,
+                        "name": (name or "").strip(),
+                        "place_key": self._href_place_key(href, name),
+                    })
+            return links
+        except Exception as e:
+            self.last_failure = classify_exception(e)
+            if isinstance(e, SearchFailure):
+                raise
+            raise SearchFailure(self.last_failure, str(e)) from e
+        finally:
+            self.last_network_stats = self.network.end_search()
     
-    async def _scroll_and_collect_results(self, target_count: int) -> list:
+    async def scrape_place(self, url: str, location: str) -> Optional[ScrapedBusiness]:
+        """
+        Open a place URL directly and extract its details.
+        
+        Raises SearchFailure for blocking pages and browser crashes; returns
+        None if the panel could not be read.
+        """
+        if not self.page:
+            await self.initialize()
+        
+        self.network.begin_search(url)
+        self.network.begin_business(url)
+        try:
+            await self.page.goto(url, wait_until="domcontentloaded")
+            await self._random_delay(1.0)
+            await self._accept_consent()
+            
+            blocking = await self.detect_blocking_page()
+            if blocking:
+                raise SearchFailure(blocking, f"{blocking.value} page opening place: {self.page.url}")
+            
+            business = await self._extract_business_details(None, location)
+            if business:
+                self.results.append(business)
+            return business
+        except Exception as e:
+            self.last_failure = classify_exception(e)
+            if isinstance(e, SearchFailure):
+                raise
+            raise SearchFailure(self.last_failure, str(e)) from e
+        finally:
+            self.last_network_stats = self.network.end_search()
+    
+    async def _accept_consent(self) -> None:
+        """Handle cookie consent - try multiple button variations"""
+        for selector in [
+            'button[aria-label*="Aceptar"]',
+            'button[aria-label*="Accept"]', 
+            'button:has-text("Aceptar todo")',
+            'button:has-text("Accept all")',
+            'form[action*="consent"] button',
+            'button#L2AGLb',
+        ]:
+            try:
+                btn = await self.page.query_selector(selector)
+                if btn:
+                    await btn.click()
+                    logger.info("Accepted cookie consent")
+                    await self._random_delay(0.5)
+                    break
+            except Exception:
+                continue
+    
+    async def _open_search_results(
+        self,
+        search_query: str,
+        target_count: int,
+        known_places: Optional[set] = None,
+        skip_places: Optional[set] = None,
+    ) -> list:
+        """
+        Run a search on Google Maps and scroll its results feed.
+        
+        Returns the result link elements to open. Raises SearchFailure when
+        a blocking page is served or no results surface at all.
+        """
+        # Navigate to Google Maps
+        await self.page.goto("https://www.google.com/maps?hl=es", wait_until="domcontentloaded")
+        await self._random_delay(1.0)
+        
+        await self._accept_consent()
+        
+        # Bail out early if Google served a CAPTCHA or kept us on the consent wall
+        blocking = await self.detect_blocking_page()
+        if blocking:
+            raise SearchFailure(blocking, f"{blocking.value} page before search: {self.page.url}")
+        
+        # Perform search
+        search_box = await self.page.wait_for_selector(SELECTORS["search_input"], timeout=10000)
+        await search_box.click()
+        await self._random_delay(0.3)
+        await search_box.fill(search_query)
+        await self._random_delay(0.3)
+        
+        # Click search button or press Enter
+        search_btn = await self.page.query_selector(SELECTORS["search_button"])
+        if search_btn:
+            await search_btn.click()
+        else:
+            await self.page.keyboard.press("Enter")
+        
+        await self._random_delay(1.5)
+        
+        # Wait for results panel to appear (left sidebar with business list)
+        try:
+            await self.page.wait_for_selector(SELECTORS["results_container"], timeout=10000)
+        except PlaywrightTimeout:
+            # If no results panel, try scrollable container
+            try:
+                await self.page.wait_for_selector('div.m6QErb.WNBkOb', timeout=5000)
+            except PlaywrightTimeout:
+                logger.warning("Results panel not found, checking for map pins...")
+        
+        await self._random_delay()
+        
+        # Scroll to load more results
+        businesses = await self._scroll_and_collect_results(
+            target_count, known_places, skip_places=skip_places
+        )
+        
+        if not self.last_scroll_stats.get("surfaced"):
+            blocking = await self.detect_blocking_page()
+            raise SearchFailure(
+                blocking or FailureClass.EMPTY_RESULTS,
+                f"No results surfaced for: {search_query}"
+            )
+        
+        return businesses
+    
+    async def detect_blocking_page(self) -> Optional[FailureClass]:
+        """Detect CAPTCHA/"unusual traffic" interstitials and consent walls from the DOM"""
+        try:
+            url = self.page.url.lower()
+            if "/sorry/" in url or await self.page.query_selector(SELECTORS["captcha"]):
+                return FailureClass.CAPTCHA
+            
+            body_text = (await self.page.evaluate(
+                "() => document.body ? document.body.innerText.slice(0, 3000) : ''"
+            )).lower()
+            if "tráfico inusual" in body_text or "unusual traffic" in body_text:
+                return FailureClass.CAPTCHA
+            
+            if "consent.google." in url:
+                return FailureClass.CONSENT_WALL
+            consent_form = await self.page.query_selector(SELECTORS["consent_form"])
+            if consent_form and await consent_form.is_visible():
+                return FailureClass.CONSENT_WALL
+        except Exception as e:
+            if classify_exception(e) == FailureClass.BROWSER_CRASH:
+                return FailureClass.BROWSER_CRASH
+            logger.debug(f"Blocking page detection failed: {e}")
+        return None
+    
+    def _href_place_key(self, href: str, aria_label: Optional[str]) -> Optional[str]:
+        """Place key for a result link, matching jsonl_store.record_key()"""
+        place_id = self._extract_place_id(href)
+        if place_id:
+            return place_id
+        name = (aria_label or "").lower().strip()
+        return f"name:{name}" if name else None
+    
+    def _parse_feed_rating(self, aria_label: str) -> Optional[tuple[float, int]]:
+        """Parse (rating, review count) from a result card label like '4,6 estrellas 206 reseñas'"""
+        if not aria_label:
+            return None
+        rating_match = re.search(r'([\d,\.]+)\s*(?:estrellas?|stars?)', aria_label, re.IGNORECASE)
+        count_match = re.search(r'([\d\.,]+)\s*(?:rese\u00f1as?|reviews?)', aria_label, re.IGNORECASE)
+        if not rating_match or not count_match:
+            return None
+        return self._parse_rating(rating_match.group(1)), self._parse_review_count(count_match.group(1))
+    
+    async def _feed_card_observation(self, item, key: Optional[str]) -> Optional[dict]:
+        """Rating and review count of a result card, read without opening the place"""
+        if not key:
+            return None
+        try:
+            aria_label = await item.evaluate(
+                """(el, sel) => {
+                    const card = el.closest(sel.card) || el.parentElement;
+                    const stars = card && card.querySelector(sel.stars);
+                    return stars ? stars.getAttribute("aria-label") : null;
+                }""",
+                {"card": SELECTORS["result_card"], "stars": SELECTORS["rating_stars"]},
+            )
+        except Exception as e:
+            logger.debug(f"Feed card rating not readable: {e}")
+            return None
+        parsed = self._parse_feed_rating(aria_label)
+        if not parsed:
+            return None
+        rating, review_count = parsed
+        # Shaped so that jsonl_store.record_key() gives back `key`
+        identity = {"name": key[len("name:"):]} if key.startswith("name:") else {"google_place_id": key}
+        return {**identity, "rating": rating, "review_count": review_count}
+    
+    async def _scroll_and_collect_results(
+        self,
+        target_count: int,
+        known_places: Optional[set] = None,
+        skip_places: Optional[set] = None,
+    ) -> list:
         """Scroll through results to load more businesses
         
         Google Maps loads results lazily as you scroll. We need to:
         1. Scroll down in the results panel
         2. Wait for new results to load
         3. Repeat until we have enough results or hit the end
+        
+        If known_places is given, already-scraped places are not collected
+        and scrolling stops early once the share of unseen places among the
+        last UNSEEN_WINDOW surfaced results drops below MIN_UNSEEN_RATIO.
+        
+        Places in skip_places (already extracted by an interrupted run of the
+        same search) are not collected and do not count towards that ratio.
+        
+        The keys of all surfaced places, skipped ones included, are left in
+        last_scroll_stats["surfaced_keys"] for overlap and yield accounting.
+        Known places are not opened, but the rating and review count on their
+        result card are left in last_scroll_stats["known_observations"] so
+        their place history keeps growing.
         """
         # Try multiple selectors for the scrollable container
         results_container = None
@@ -745,6 +1119,11 @@ class MapsScraper:
         
         collected = []
         seen_hrefs = set()
+        surfaced_keys = []  # Every surfaced place, known and skipped ones included
+        recent_unseen = []  # 1 = unseen, 0 = known, for the most recent surfaced places
+        known_count = 0
+        known_observations = []  # Feed-card rating/review counts of skipped known places
+        stopped_early = False
         last_count = 0
         no_change_count = 0
         max_no_change = 8  # Increased: Allow more attempts before giving up
@@ -761,9 +1140,35 @@ class MapsScraper:
                 href = await item.get_attribute("href")
                 if href and href not in seen_hrefs:
                     seen_hrefs.add(href)
+                    key = self._href_place_key(href, await item.get_attribute("aria-label"))
+                    if key:
+                        surfaced_keys.append(key)
+                    if skip_places and key in skip_places:
+                        continue
+                    if known_places is not None:
+                        is_known = key in known_places
+                        recent_unseen = (recent_unseen + [0 if is_known else 1])[-UNSEEN_WINDOW:]
+                        if is_known:
+                            known_count += 1
+                            card = await self._feed_card_observation(item, key)
+                            if card:
+                                known_observations.append(card)
+                            continue
                     collected.append(item)
             
-            current_count = len(collected)
+            current_count = len(seen_hrefs)
+            
+            # Stop when this zone is already mapped: almost everything surfacing is known
+            if (
+                len(recent_unseen) >= UNSEEN_WINDOW
+                and sum(recent_unseen) / len(recent_unseen) < MIN_UNSEEN_RATIO
+            ):
+                logger.info(
+                    f"📍 Stopping scroll early: only {sum(recent_unseen)}/{len(recent_unseen)} "
+                    f"recent places are unseen ({known_count} known skipped)"
+                )
+                stopped_early = True
+                break
             
             if current_count == last_count:
                 no_change_count += 1
@@ -798,9 +1203,34 @@ class MapsScraper:
             
             logger.debug(f"📜 Scrolling... found {current_count} unique results (attempt {no_change_count}/{max_no_change})")
         
+        self.last_scroll_stats = {
+            "surfaced": len(seen_hrefs),
+            "surfaced_keys": surfaced_keys,
+            "collected": len(collected),
+            "known": known_count,
+            "known_observations": known_observations,
+            "stopped_early": stopped_early,
+        }
         logger.info(f"✅ Collected {len(collected)} business links (target was {target_count})")
         return collected[:target_count]
     
+    def _budget_left(self) -> float:
+        """Seconds left of the current business' time budget"""
+        return max(self._business_deadline - time.monotonic(), 0.0)
+    
+    def _budget_timeout(self, timeout_ms: int) -> int:
+        """Clamp a selector wait to what is left of the business budget"""
+        return max(int(min(timeout_ms, self._budget_left() * 1000)), MIN_WAIT_MS)
+    
+    def _skip_section(self, section: str) -> bool:
+        """True once the business budget is spent; marks the section as partial"""
+        if self._budget_left() > 0:
+            return False
+        if section not in self._partial_sections:
+            self._partial_sections.append(section)
+            logger.info(f"⏱️ Time budget spent - skipping {section}")
+        return True
+    
     async def _extract_business_details(self, element, location: str) -> Optional[ScrapedBusiness]:
         """Extract details from a business listing - ULTRA DEEP DATA VERSION
         
@@ -810,7 +1240,13 @@ class MapsScraper:
         3. 5-Star Review Filtering - Only extract quality reviews > 40 chars
         4. ARIA-Label Rating Extraction - Most accurate source for ratings
         5. Deep Location Attributes - Plus Code, About section, etc.
+        
+        Extraction runs against a per-business time budget. Once it is spent,
+        optional sections (about tab, reviews, info tab, photo gallery) are
+        skipped and listed in `partial_sections` so they can be enriched later.
         """
+        self._business_deadline = time.monotonic() + self.business_time_budget
+        self._partial_sections = []
         try:
             # ========================================
             # FIX 1: ISOLATION LOGIC - PREVENT DATA MISALIGNMENT
@@ -818,32 +1254,35 @@ class MapsScraper:
             # CRITICAL: We must wait for the NEW business panel to fully load
             # before extracting ANY data. Otherwise we get stale data from previous business.
             
-            # Step 1: Get expected business name from the listing BEFORE clicking
+            # Steps 1-3 open a result from the feed. A place page opened directly
+            # by URL (element=None, see scrape_place) already shows its panel.
             expected_name = None
-            try:
-                aria_label = await element.get_attribute("aria-label")
-                if aria_label:
-                    expected_name = aria_label.strip()
-                    logger.info(f"🎯 Clicking on: {expected_name}")
-            except Exception:
-                pass
-            
-            # Step 2: Get CURRENT h1 text (so we know when it changes)
             old_h1_text = ""
-            try:
-                old_h1 = await self.page.query_selector('h1.DUwDvf')
-                if old_h1:
-                    old_h1_text = (await old_h1.inner_text()).strip()
-            except Exception:
-                pass
-            
-            # Step 3: Click on the business to open details panel
-            await element.click()
-            await self._random_delay(0.5)
+            if element is not None:
+                # Step 1: Get expected business name from the listing BEFORE clicking
+                try:
+                    aria_label = await element.get_attribute("aria-label")
+                    if aria_label:
+                        expected_name = aria_label.strip()
+                        logger.info(f"🎯 Clicking on: {expected_name}")
+                except Exception:
+                    pass
+                
+                # Step 2: Get CURRENT h1 text (so we know when it changes)
+                try:
+                    old_h1 = await self.page.query_selector('h1.DUwDvf')
+                    if old_h1:
+                        old_h1_text = (await old_h1.inner_text()).strip()
+                except Exception:
+                    pass
+                
+                # Step 3: Click on the business to open details panel
+                await element.click()
+                await self._random_delay(0.5)
             
             # Step 4: WAIT for h1 to CHANGE (this is the key isolation!)
             # Poll until h1 changes OR matches expected name
-            max_wait = 8  # seconds
+            max_wait = min(8, self._budget_left())  # seconds
             poll_interval = 0.3
             waited = 0
             name = "Unknown"
@@ -1179,7 +1618,7 @@ class MapsScraper:
             # Also try clicking "About" tab for more info
             try:
                 about_tab = await self.page.query_selector('button[aria-label*="Acerca de"], button[data-tab-index="1"]')
-                if about_tab and not about_summary:
+                if about_tab and not about_summary and not self._skip_section("about"):
                     await about_tab.click()
                     await self._random_delay(0.5)
                     
@@ -1282,6 +1721,8 @@ class MapsScraper:
                 
                 clicked_reviews = False
                 for selector in reviews_button_selectors:
+                    if self._skip_section("reviews"):
+                        break
                     try:
                         review_btn = await self.page.query_selector(selector)
                         if review_btn:
@@ -1295,12 +1736,14 @@ class MapsScraper:
                 
                 # If we clicked, wait for review cards to appear and scroll to load more
                 if clicked_reviews:
-                    await self.page.wait_for_selector('div.jftiEf[data-review-id]', timeout=5000)
+                    await self.page.wait_for_selector('div.jftiEf[data-review-id]', timeout=self._budget_timeout(5000))
                     
                     # Scroll down in the reviews panel to load more reviews
                     reviews_panel = await self.page.query_selector('div.m6QErb.DxyBCb')
                     if reviews_panel:
                         for _ in range(3):  # Scroll 3 times to load more
+                            if self._skip_section("reviews"):
+                                break
                             await reviews_panel.evaluate('el => el.scrollTop += 500')
                             await self._random_delay(0.5)
                     
@@ -1318,6 +1761,8 @@ class MapsScraper:
             logger.debug(f"Found {len(review_cards)} review cards to process")
             
             for card in review_cards[:20]:  # Process more cards to find quality 5-star reviews
+                if self._skip_section("reviews"):
+                    break
                 try:
                     # First check rating - ONLY keep 5-star reviews
                     # Rating: <span class="kvMYJc" role="img" aria-label="5 estrellas">
@@ -1489,12 +1934,12 @@ class MapsScraper:
             # Try to click on the "Información" tab to load these attributes
             try:
                 info_tab = await self.page.query_selector('button[aria-label*="Información sobre"], button[data-tab-index="3"]')
-                if info_tab:
+                if info_tab and not self._skip_section("attributes"):
                     await info_tab.click()
                     await self._random_delay(0.5)
                     
                     # Wait for info content to load
-                    await self.page.wait_for_selector('div.iP2t7d.fontBodyMedium', timeout=3000)
+                    await self.page.wait_for_selector('div.iP2t7d.fontBodyMedium', timeout=self._budget_timeout(3000))
                     
                     # Extract all attribute sections
                     info_sections = await self.page.query_selector_all('div.iP2t7d.fontBodyMedium')
@@ -1589,12 +2034,12 @@ class MapsScraper:
             
             # Try to click on photos to get more images
             try:
-                if photos_btn and photo_count > 0:
+                if photos_btn and photo_count > 0 and not self._skip_section("photos"):
                     await photos_btn.click()
                     await self._random_delay(1.5)
                     
                     # Wait for photo gallery to load
-                    await self.page.wait_for_selector('div[data-photo-index], img.U39Pmb, div.p0Jrsd img', timeout=5000)
+                    await self.page.wait_for_selector('div[data-photo-index], img.U39Pmb, div.p0Jrsd img', timeout=self._budget_timeout(5000))
                     
                     # Get all photo URLs from the gallery - multiple selectors
                     photo_selectors = [
@@ -1733,6 +2178,7 @@ class MapsScraper:
                 reviews=reviews,
                 # Updates
                 customer_updates=customer_updates,
+                partial_sections=list(self._partial_sections),
             )
             
             logger.debug(f"ULTRA deep data: price_histogram={len(price_histogram)}, reviews={len(reviews)}, topics={len(review_topics)}, popular_times={len(popular_times)}")
@@ -2213,8 +2659,11 @@ async def main():
     # OPTION: Set to True to RE-SCRAPE all businesses (update existing data)
     RESCRAPE_ALL = True  # Change to False to skip existing businesses
     
+    supervisor = BrowserSupervisor(scraper)
+    writer = shared_writer()  # JSON dumps run off the event loop
+    
     try:
-        await scraper.initialize()
+        await supervisor.start()
         
         for query, location in all_searches:
             logger.info(f"\n{'='*50}")
@@ -2222,9 +2671,9 @@ async def main():
             logger.info(f"{'='*50}")
             
             try:
-                results = await scraper.search_businesses(
-                    query=query,
-                    location=location,
+                results = await supervisor.search(
+                    query,
+                    location,
                     max_results=20  # Get 20 results per search
                 )
                 
@@ -2267,8 +2716,7 @@ async def main():
                 # Save progress every 5 searches
                 if searches_completed % 5 == 0:
                     all_results = list(all_results_dict.values())
-                    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-                        json.dump(all_results, f, ensure_ascii=False, indent=2)
+                    writer.submit(OUTPUT_FILE, all_results, indent=2)
                     logger.info(f"💾 Progress saved: {len(all_results)} total businesses")
                 
             except Exception as e:
@@ -2280,8 +2728,11 @@ async def main():
         
         # Final save
         all_results = list(all_results_dict.values())
-        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-            json.dump(all_results, f, ensure_ascii=False, indent=2)
+        writer.submit(OUTPUT_FILE, all_results, indent=2)
+        db = configured_database()
+        if db is not None:
+            db.bulk_upsert(all_results)
+            db.close()
         
         # Summary
         no_website = [b for b in all_results if not b.get('has_website', True)]
@@ -2298,7 +2749,8 @@ async def main():
         print(f"{'='*60}\n")
         
     finally:
-        await scraper.close()
+        await supervisor.close()
+        writer.flush()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,246 @@
+"""
+Discovery Agent - Memory Profiling for Endurance Runs
+
+Opt-in profiler that periodically records Python heap usage (tracemalloc,
+top allocators) and the RSS of this process and its Chromium children. It
+writes a JSONL time series, warns when memory grows faster than a set
+amount per scraped business, and reports the allocators that grew the most
+since the first snapshot. Runs on the production box itself, so no
+external tools have to be attached.
+
+Usage:
+    python -m agents.discovery.memory_profile memory_profile.jsonl   # Summarize a series
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================
+# CONSTANTS
+# ===========================================
+
+TRACEBACK_FRAMES = 5               # Frames kept per allocation (more = slower)
+TOP_ALLOCATORS = 10                # Allocators recorded per snapshot
+GROWTH_WARN_KB_PER_BUSINESS = 256  # Warn when RSS grows faster than this per business
+MIN_BUSINESSES_FOR_WARNING = 20    # Businesses since baseline before judging growth
+
+DEFAULT_PROFILE_FILE = Path(__file__).parent.parent.parent / "memory_profile.jsonl"
+
+BROWSER_PROCESS_NAMES = ("chrome", "chromium", "headless_shell")
+
+# Allocations made by the profiler itself are noise
+_IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<unknown>")
+
+
+# ===========================================
+# PROCESS MEMORY (/proc, Linux only)
+# ===========================================
+
+def _read_rss_kb(pid: int) -> int:
+    """Resident set size of a process in KB (0 if unavailable)"""
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def _process_table() -> dict[int, tuple[int, str]]:
+    """pid -> (parent pid, process name) for every visible process"""
+    table = {}
+    proc = Path("/proc")
+    if not proc.exists():
+        return table
+    for entry in proc.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+            # The name is in parentheses and may contain spaces
+            name = stat[stat.index("(") + 1:stat.rindex(")")]
+            ppid = int(stat[stat.rindex(")") + 2:].split()[1])
+            table[int(entry.name)] = (ppid, name)
+        except (OSError, ValueError, IndexError):
+            continue
+    return table
+
+
+def browser_rss_kb(root_pid: Optional[int] = None) -> tuple[int, int]:
+    """
+    Total RSS (KB) and count of Chromium processes descending from root_pid.
+
+    A shared browser server (see browser_server.py) is not our descendant
+    and is not included.
+    """
+    root_pid = root_pid or os.getpid()
+    table = _process_table()
+    children: dict[int, list[int]] = {}
+    for pid, (ppid, _) in table.items():
+        children.setdefault(ppid, []).append(pid)
+
+    total, count = 0, 0
+    stack = list(children.get(root_pid, []))
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        name = table[pid][1].lower()
+        if any(browser in name for browser in BROWSER_PROCESS_NAMES):
+            total += _read_rss_kb(pid)
+            count += 1
+    return total, count
+
+
+# ===========================================
+# PROFILER
+# ===========================================
+
+class MemoryProfiler:
+    """
+    Periodic tracemalloc + RSS snapshots for long runs.
+
+    Call `snapshot()` every few searches with the number of businesses
+    scraped so far. The first snapshot is the baseline for growth checks
+    and the diff report.
+    """
+
+    def __init__(
+        self,
+        filepath: Path = DEFAULT_PROFILE_FILE,
+        top: int = TOP_ALLOCATORS,
+        warn_kb_per_business: float = GROWTH_WARN_KB_PER_BUSINESS,
+    ):
+        self.filepath = filepath
+        self.top = top
+        self.warn_kb_per_business = warn_kb_per_business
+
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._baseline_point: Optional[dict] = None
+        self.points: list[dict] = []
+        self.warnings = 0
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEBACK_FRAMES)
+        logger.info(f"Memory profiling enabled, writing to {self.filepath}")
+
+    def stop(self) -> None:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def _take(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, filename) for filename in _IGNORED_FILES
+        ])
+
+    def snapshot(self, label: str, businesses: int) -> dict:
+        """Record one point of the time series and check growth"""
+        snap = self._take()
+        current, peak = tracemalloc.get_traced_memory()
+        browser_kb, browser_processes = browser_rss_kb()
+
+        point = {
+            "timestamp": time.time(),
+            "label": label,
+            "businesses": businesses,
+            "python_heap_kb": current // 1024,
+            "python_peak_kb": peak // 1024,
+            "process_rss_kb": _read_rss_kb(os.getpid()),
+            "browser_rss_kb": browser_kb,
+            "browser_processes": browser_processes,
+            "top_allocators": [
+                {"where": str(stat.traceback[0]), "size_kb": stat.size // 1024, "count": stat.count}
+                for stat in snap.statistics("lineno")[:self.top]
+            ],
+        }
+
+        if self._baseline is None:
+            self._baseline = snap
+            self._baseline_point = point
+        else:
+            self._check_growth(point)
+
+        self.points.append(point)
+        try:
+            with open(self.filepath, "a", encoding="utf-8") as f:
+                f.write(json.dumps(point, ensure_ascii=False) + "\n")
+        except Exception as e:
+            logger.error(f"Could not write memory profile: {e}")
+        return point
+
+    def _growth_per_business(self, point: dict) -> Optional[dict]:
+        base = self._baseline_point
+        businesses = point["businesses"] - base["businesses"]
+        if businesses < MIN_BUSINESSES_FOR_WARNING:
+            return None
+        return {
+            key: (point[key] - base[key]) / businesses
+            for key in ("python_heap_kb", "process_rss_kb", "browser_rss_kb")
+        }
+
+    def _check_growth(self, point: dict) -> None:
+        growth = self._growth_per_business(point)
+        if not growth:
+            return
+        total = growth["process_rss_kb"] + growth["browser_rss_kb"]
+        if total > self.warn_kb_per_business:
+            self.warnings += 1
+            logger.warning(
+                f"Memory growing {total:.0f} KB/business "
+                f"(python heap {growth['python_heap_kb']:.0f}, process RSS {growth['process_rss_kb']:.0f}, "
+                f"browser RSS {growth['browser_rss_kb']:.0f}) - threshold {self.warn_kb_per_business:.0f}"
+            )
+
+    def diff_report(self, limit: int = TOP_ALLOCATORS) -> str:
+        """Allocators that grew the most since the baseline snapshot"""
+        if self._baseline is None or not self.points:
+            return ""
+        first, last = self._baseline_point, self.points[-1]
+        lines = [
+            f"Memory over {last['businesses'] - first['businesses']} businesses: "
+            f"python heap {first['python_heap_kb']} -> {last['python_heap_kb']} KB, "
+            f"process RSS {first['process_rss_kb']} -> {last['process_rss_kb']} KB, "
+            f"browser RSS {first['browser_rss_kb']} -> {last['browser_rss_kb']} KB"
+        ]
+        growth = self._growth_per_business(last)
+        if growth:
+            lines.append("Per business: " + ", ".join(f"{k} {v:+.1f}" for k, v in growth.items()))
+        lines.append("Top growth since baseline:")
+        for stat in self._take().compare_to(self._baseline, "lineno")[:limit]:
+            if stat.size_diff <= 0:
+                break
+            lines.append(f"  {stat.size_diff / 1024:+10.1f} KB  {stat.count_diff:+7d} blocks  {stat.traceback[0]}")
+        return "\n".join(lines)
+
+
+def summarize(filepath: Path) -> str:
+    """Table of an existing JSONL time series"""
+    with open(filepath, "r", encoding="utf-8") as f:
+        points = [json.loads(line) for line in f if line.strip()]
+    lines = [f"{'label':<24} {'biz':>6} {'heap KB':>10} {'rss KB':>10} {'browser KB':>11}"]
+    for point in points:
+        lines.append(
+            f"{point['label'][:24]:<24} {point['businesses']:>6} {point['python_heap_kb']:>10} "
+            f"{point['process_rss_kb']:>10} {point['browser_rss_kb']:>11}"
+        )
+    return "\n".join(lines)
+
+
+# ===========================================
+# STANDALONE EXECUTION
+# ===========================================
+
+if __name__ == "__main__":
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PROFILE_FILE
+    print(summarize(path))
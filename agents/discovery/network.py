@@ -0,0 +1,239 @@
+"""
+Discovery Agent - Network Accounting
+
+Subscribes to Chrome DevTools Protocol network events and attributes
+request counts and transferred bytes (on the wire, per resource type) to
+the search and the business being scraped when each request was sent.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================
+# DATA CLASSES
+# ===========================================
+
+@dataclass
+class ResourceUsage:
+    """Traffic of one resource type"""
+    requests: int = 0
+    bytes: int = 0
+    failed: int = 0
+
+
+class NetworkUsage:
+    """Requests and bytes per resource type (Document, Script, Image, XHR, ...)"""
+
+    def __init__(self):
+        self.by_type: dict[str, ResourceUsage] = {}
+
+    def _get(self, resource_type: str) -> ResourceUsage:
+        return self.by_type.setdefault(resource_type, ResourceUsage())
+
+    def add_request(self, resource_type: str) -> None:
+        self._get(resource_type).requests += 1
+
+    def add_bytes(self, resource_type: str, count: int) -> None:
+        self._get(resource_type).bytes += count
+
+    def add_failed(self, resource_type: str) -> None:
+        self._get(resource_type).failed += 1
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "NetworkUsage":
+        usage = cls()
+        for resource_type, counts in data.get("by_type", {}).items():
+            usage.by_type[resource_type] = ResourceUsage(**counts)
+        return usage
+
+    def merge(self, other: "NetworkUsage") -> None:
+        for resource_type, usage in other.by_type.items():
+            mine = self._get(resource_type)
+            mine.requests += usage.requests
+            mine.bytes += usage.bytes
+            mine.failed += usage.failed
+
+    @property
+    def total_requests(self) -> int:
+        return sum(u.requests for u in self.by_type.values())
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(u.bytes for u in self.by_type.values())
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.total_requests,
+            "bytes": self.total_bytes,
+            "by_type": {
+                resource_type: {"requests": u.requests, "bytes": u.bytes, "failed": u.failed}
+                for resource_type, u in sorted(self.by_type.items(), key=lambda item: -item[1].bytes)
+            },
+        }
+
+
+def format_bytes(count: float) -> str:
+    """Human-readable byte count"""
+    if count < 1024:
+        return f"{int(count)} B"
+    for unit in ("KB", "MB", "GB"):
+        count /= 1024
+        if count < 1024 or unit == "GB":
+            return f"{count:.1f} {unit}"
+
+
+# ===========================================
+# ACCOUNTANT
+# ===========================================
+
+class NetworkAccountant:
+    """
+    Attributes CDP network traffic to the current search and business.
+
+    Scopes are captured when a request is sent, so bytes that arrive after
+    the scraper moved on still count towards the business that asked for
+    them. Traffic outside any search (startup, consent pages) only counts
+    towards the run total.
+    """
+
+    def __init__(self):
+        self.run = NetworkUsage()
+        self.search: Optional[NetworkUsage] = None
+        self.business: Optional[NetworkUsage] = None
+        self.businesses: dict[str, NetworkUsage] = {}
+        self.search_label: Optional[str] = None
+        self._requests: dict[str, tuple[str, list]] = {}  # requestId -> (type, buckets)
+        self.enabled = False
+
+    async def attach(self, context, page) -> None:
+        """Enable CDP network events for a page (Chromium only)"""
+        try:
+            session = await context.new_cdp_session(page)
+            await session.send("Network.enable")
+        except Exception as e:
+            logger.warning(f"Network accounting unavailable: {e}")
+            self.enabled = False
+            return
+        session.on("Network.requestWillBeSent", self._on_request)
+        session.on("Network.loadingFinished", self._on_finished)
+        session.on("Network.loadingFailed", self._on_failed)
+        self._requests.clear()
+        self.enabled = True
+
+    # -------------------------------------------
+    # CDP event handlers
+    # -------------------------------------------
+
+    def _on_request(self, params: dict) -> None:
+        resource_type = params.get("type", "Other")
+        buckets = [b for b in (self.run, self.search, self.business) if b is not None]
+        # Redirects reuse the requestId - count the hop as another request
+        self._requests[params["requestId"]] = (resource_type, buckets)
+        for bucket in buckets:
+            bucket.add_request(resource_type)
+
+    def _on_finished(self, params: dict) -> None:
+        entry = self._requests.pop(params["requestId"], None)
+        if not entry:
+            return
+        resource_type, buckets = entry
+        for bucket in buckets:
+            bucket.add_bytes(resource_type, int(params.get("encodedDataLength", 0)))
+
+    def _on_failed(self, params: dict) -> None:
+        entry = self._requests.pop(params["requestId"], None)
+        if not entry:
+            return
+        resource_type, buckets = entry
+        for bucket in buckets:
+            bucket.add_failed(resource_type)
+
+    # -------------------------------------------
+    # Scopes
+    # -------------------------------------------
+
+    def begin_search(self, label: str) -> None:
+        self.search = NetworkUsage()
+        self.search_label = label
+        self.businesses = {}
+        self.business = None
+
+    def begin_business(self, label: str) -> None:
+        self.business = self.businesses.setdefault(label, NetworkUsage())
+
+    def end_business(self) -> None:
+        self.business = None
+
+    def end_search(self) -> dict:
+        """Close the search scope and return its report"""
+        report = {}
+        if self.enabled and self.search is not None:
+            report = {
+                "search": self.search_label,
+                "total": self.search.to_dict(),
+                "businesses": {
+                    label: usage.to_dict() for label, usage in self.businesses.items()
+                },
+            }
+        self.search = None
+        self.business = None
+        self.businesses = {}
+        self.search_label = None
+        return report
+
+
+# ===========================================
+# RUN REPORT
+# ===========================================
+
+class NetworkReport:
+    """Aggregates per-search reports from end_search() for a run summary"""
+
+    def __init__(self):
+        self.searches = 0
+        self.places = 0
+        self.businesses = 0
+        self.total = NetworkUsage()
+        self.search_bytes = 0
+        self.business_bytes = 0
+
+    def add(self, report: dict, place_page: bool = False) -> None:
+        """
+        Add one end_search() report. place_page marks a place opened on its
+        own (distributed mode): its traffic counts for the business, not as
+        a search.
+        """
+        if not report:
+            return
+        usage = NetworkUsage.from_dict(report["total"])
+        self.total.merge(usage)
+        if place_page:
+            self.places += 1
+        else:
+            self.searches += 1
+            self.search_bytes += usage.total_bytes
+        for business in report["businesses"].values():
+            self.businesses += 1
+            self.business_bytes += business["bytes"]
+
+    def format(self, top: int = 4) -> str:
+        if not self.searches and not self.places:
+            return ""
+        per_search = self.search_bytes / self.searches if self.searches else 0
+        per_business = self.business_bytes / self.businesses if self.businesses else 0
+        types = ", ".join(
+            f"{resource_type} {format_bytes(usage['bytes'])}"
+            for resource_type, usage in list(self.total.to_dict()["by_type"].items())[:top]
+        )
+        scope = f"{self.searches} searches"
+        if self.places:
+            scope += f" and {self.places} place pages"
+        return (
+            f"{self.total.total_requests} requests, {format_bytes(self.total.total_bytes)} over "
+            f"{scope} | {format_bytes(per_search)}/search, "
+            f"{format_bytes(per_business)}/business | top: {types}"
+        )
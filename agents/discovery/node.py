@@ -0,0 +1,209 @@
+"""
+Discovery Agent - Distributed Scraper Node
+
+A scraper node leases tasks from the Redis work queue until it is drained:
+
+    search  -> run the search, enqueue one place task per unseen place link
+    place   -> open the place URL, extract its details into the result store
+
+Leases are kept alive with a heartbeat while a task runs. Failures are
+classified and handed back with their class-specific backoff. Browser
+crashes are handled by the BrowserSupervisor.
+"""
+
+import asyncio
+import logging
+import random
+import socket
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from agents.discovery.failures import (
+    BACKOFF_POLICIES,
+    CircuitBreaker,
+    FailureClass,
+    SearchFailure,
+    classify_exception,
+)
+from agents.discovery.google_maps import MapsScraper
+from agents.discovery.network import NetworkReport
+from agents.discovery.supervisor import BrowserSupervisor, session_file_for
+from agents.discovery.work_queue import (
+    TASK_PLACE,
+    TASK_SEARCH,
+    ResultStore,
+    Task,
+    WorkQueue,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================
+# CONSTANTS
+# ===========================================
+
+SEARCH_VISIBILITY_TIMEOUT = 300.0    # Scrolling a feed can take a few minutes
+PLACE_VISIBILITY_TIMEOUT = 120.0     # One place is bounded by the business time budget
+IDLE_POLL_SECONDS = 5.0              # Sleep when nothing is due yet
+MIN_TASK_DELAY = 2.0                 # Anti-blocking pause between tasks
+MAX_TASK_DELAY = 6.0
+
+
+def place_task_id(place_key: str) -> str:
+    return f"place:{place_key}"
+
+
+def search_task_id(search_term: str, location: str) -> str:
+    return f"search:{search_term}|{location}"
+
+
+# ===========================================
+# NODE
+# ===========================================
+
+class DiscoveryNode:
+    """One scraper process consuming the shared work queue"""
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        store: ResultStore,
+        scraper: Optional[MapsScraper] = None,
+        node_id: Optional[str] = None,
+        session_file: Optional[Path] = None,
+    ):
+        self.queue = queue
+        self.store = store
+        self.node_id = node_id or f"{socket.gethostname()}-{uuid.uuid4().hex[:6]}"
+        self.scraper = scraper or MapsScraper(headless=True)
+        # Nodes sharing a directory must not read and write one session file
+        self.supervisor = BrowserSupervisor(
+            self.scraper, session_file=session_file or session_file_for(self.node_id)
+        )
+        self.breaker = CircuitBreaker()
+
+        self.stats = {"searches": 0, "places": 0, "failures": 0}
+        self.network_report = NetworkReport()
+
+    def _visibility_timeout(self, task: Task) -> float:
+        return SEARCH_VISIBILITY_TIMEOUT if task.kind == TASK_SEARCH else PLACE_VISIBILITY_TIMEOUT
+
+    async def _heartbeat(self, task: Task) -> None:
+        """Keep the lease alive while the task runs"""
+        timeout = self._visibility_timeout(task)
+        while True:
+            await asyncio.sleep(timeout / 3)
+            if not self.queue.heartbeat(task, self.node_id, timeout):
+                logger.warning(f"[{self.node_id}] Lost lease on {task.id}")
+                return
+
+    # -------------------------------------------
+    # Task handlers
+    # -------------------------------------------
+
+    async def _run_search(self, task: Task) -> None:
+        payload = task.payload
+        await self.supervisor.ensure_alive()
+        links = await self.scraper.collect_place_links(
+            payload["search_term"],
+            payload["location"],
+            max_results=payload.get("max_results"),
+            known_places=self.store.known_places(),
+        )
+        queued = 0
+        for link in links:
+            key = link["place_key"]
+            if not key or self.store.is_known(key):
+                continue
+            queued += self.queue.enqueue(
+                TASK_PLACE,
+                {
+                    "url": link["url"],
+                    "name": link["name"],
+                    "place_key": key,
+                    "category_key": payload["category_key"],
+                    "location": payload["location"],
+                },
+                task_id=place_task_id(key),
+            )
+        self.stats["searches"] += 1
+        logger.info(
+            f"[{self.node_id}] '{payload['search_term']}' in '{payload['location']}': "
+            f"{len(links)} links, {queued} place tasks queued"
+        )
+
+    async def _run_place(self, task: Task) -> None:
+        payload = task.payload
+        await self.supervisor.ensure_alive()
+        business = await self.scraper.scrape_place(payload["url"], payload["location"])
+        if not business:
+            raise SearchFailure(FailureClass.UNKNOWN, f"Could not read place panel: {payload['name']}")
+
+        business_dict = business.to_dict()
+        business_dict["discovered_category"] = payload["category_key"]
+        business_dict["discovered_location"] = payload["location"]
+        business_dict["discovered_at"] = datetime.now().isoformat()
+        business_dict["discovered_by"] = self.node_id
+        self.store.put(business.google_place_id or payload["place_key"], business_dict)
+        self.stats["places"] += 1
+
+    # -------------------------------------------
+    # Main loop
+    # -------------------------------------------
+
+    async def process(self, task: Task) -> None:
+        """Run one leased task and ack or nack it"""
+        handler = self._run_search if task.kind == TASK_SEARCH else self._run_place
+        heartbeat = asyncio.create_task(self._heartbeat(task))
+        try:
+            await handler(task)
+            self.breaker.record_success()
+            self.queue.ack(task, self.node_id)
+        except Exception as e:
+            failure_class = classify_exception(e)
+            self.breaker.record_failure(failure_class)
+            self.stats["failures"] += 1
+            delay = BACKOFF_POLICIES[failure_class].delay(task.attempts)
+            logger.warning(
+                f"[{self.node_id}] {task.id} failed ({failure_class.value}), "
+                f"retry in {delay:.0f}s: {e}"
+            )
+            if failure_class == FailureClass.BROWSER_CRASH:
+                await self.supervisor.restart(str(e))
+            self.queue.nack(task, self.node_id, str(e), delay=delay)
+        finally:
+            heartbeat.cancel()
+            self.network_report.add(self.scraper.take_network_stats(), place_page=task.kind == TASK_PLACE)
+
+    async def run(self, stop_when_drained: bool = True) -> dict:
+        """Consume tasks until the queue is drained (or forever)"""
+        await self.supervisor.start()
+        logger.info(f"[{self.node_id}] Node started")
+        try:
+            while True:
+                if self.breaker.is_open:
+                    logger.warning(f"[{self.node_id}] Circuit open, pausing {self.breaker.remaining():.0f}s")
+                    await self.breaker.wait_until_closed()
+
+                task = self.queue.lease(self.node_id, SEARCH_VISIBILITY_TIMEOUT)
+                if task is None:
+                    if stop_when_drained and self.queue.is_drained():
+                        break
+                    due_in = self.queue.next_due_in()
+                    await asyncio.sleep(min(due_in if due_in is not None else IDLE_POLL_SECONDS, IDLE_POLL_SECONDS))
+                    continue
+
+                # Place tasks get the shorter lease once we know the kind
+                if task.kind == TASK_PLACE:
+                    self.queue.heartbeat(task, self.node_id, PLACE_VISIBILITY_TIMEOUT)
+                await self.process(task)
+                await asyncio.sleep(random.uniform(MIN_TASK_DELAY, MAX_TASK_DELAY))
+        finally:
+            await self.supervisor.close()
+        logger.info(f"[{self.node_id}] Node finished: {self.stats}")
+        if self.network_report.searches or self.network_report.places:
+            logger.info(f"[{self.node_id}] Network: {self.network_report.format()}")
+        return self.stats
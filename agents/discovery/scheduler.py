@@ -0,0 +1,324 @@
+"""
+Discovery Agent - Yield-Driven Search Scheduler
+
+Records what every (search term, location) combination actually produced
+and orders the pending searches by expected qualified leads per minute,
+instead of walking a shuffled cartesian product.
+
+The yield file is per-process state: processes sharing a lead store each
+keep their own statistics in memory and overwrite the file on save (last
+writer wins). Only scheduling hints are lost that way - which searches are
+done and the leads themselves live in the shared store.
+"""
+
+import json
+import logging
+import random
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+from database.background_writer import shared_writer
+from database.jsonl_store import JsonlLog, record_key
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================
+# CONSTANTS
+# ===========================================
+
+PRIOR_WEIGHT = 3.0               # Pseudo-searches of evidence given to the prior
+EXPLORATION_RATE = 0.15          # Share of picks reserved for unexplored terms/locations
+SATURATION_MIN_SEARCHES = 4      # Searches needed before a group can be judged
+SATURATION_NEW_RATIO = 0.15      # Below this share of unseen places -> saturated
+SATURATION_PENALTY = 0.25        # Multiplier on expected yield of saturated groups
+DEFAULT_SEARCH_MINUTES = 3.0     # Assumed cost of a search we know nothing about
+MIN_MAX_RESULTS = 8              # Bounds for the per-zone max_results suggestion
+MAX_MAX_RESULTS = 40
+
+
+# ===========================================
+# HELPERS
+# ===========================================
+
+def combo_key(search_term: str, location: str) -> str:
+    """Same key format as SearchHistory uses for completed searches"""
+    return f"{search_term}|{location}"
+
+
+# ===========================================
+# DATA CLASSES
+# ===========================================
+
+@dataclass
+class YieldStats:
+    """Accumulated yield of a combo, term, category or location"""
+    searches: int = 0
+    new_places: int = 0
+    new_leads: int = 0
+    duplicates: int = 0
+    seconds: float = 0.0
+
+    def add(self, new_places: int, new_leads: int, duplicates: int, seconds: float) -> None:
+        self.searches += 1
+        self.new_places += new_places
+        self.new_leads += new_leads
+        self.duplicates += duplicates
+        self.seconds += seconds
+
+    @property
+    def new_ratio(self) -> float:
+        """Share of returned places that had never been seen before"""
+        total = self.new_places + self.duplicates
+        return self.new_places / total if total else 1.0
+
+    @property
+    def is_saturated(self) -> bool:
+        return (
+            self.searches >= SATURATION_MIN_SEARCHES
+            and self.new_ratio < SATURATION_NEW_RATIO
+        )
+
+
+# ===========================================
+# SCHEDULER
+# ===========================================
+
+class SearchScheduler:
+    """
+    Orders pending searches by expected qualified leads per minute.
+
+    The expected yield of a combo is smoothed from its own history towards
+    a prior built from its search term and location (each smoothed towards
+    the global rate), so combos that were never searched still get a
+    sensible estimate. Saturated locations/categories are demoted and a
+    share of the picks is reserved for exploring unseen terms/locations.
+
+    Known places grow with every search, so they are not part of the yield
+    file: new ones are appended to a JSONL log next to it
+    (search_yield.places.jsonl) and replayed on load.
+    """
+
+    def __init__(
+        self,
+        filepath: Path,
+        exploration_rate: float = EXPLORATION_RATE,
+        places_file: Optional[Path] = None,
+    ):
+        self.filepath = filepath
+        self.exploration_rate = exploration_rate
+        self.places_log = JsonlLog(places_file or filepath.with_suffix(".places.jsonl"))
+
+        self.total = YieldStats()
+        self.combos: dict[str, YieldStats] = {}
+        self.terms: dict[str, YieldStats] = {}
+        self.categories: dict[str, YieldStats] = {}
+        self.locations: dict[str, YieldStats] = {}
+        self.known_places: set = set()
+
+        self._last_location: Optional[str] = None
+        self.load()
+
+    def load(self) -> None:
+        """Load yield history from file and replay the known places log"""
+        self.known_places = {
+            record["key"] for record in self.places_log.read() if record.get("key")
+        }
+        if not self.filepath.exists():
+            return
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.total = YieldStats(**data.get("total", {}))
+            for attr in ("combos", "terms", "categories", "locations"):
+                setattr(self, attr, {
+                    key: YieldStats(**stats)
+                    for key, stats in data.get(attr, {}).items()
+                })
+            # Older yield files carried the known places themselves
+            self._remember(set(data.get("known_places", [])) - self.known_places)
+            logger.info(
+                f"Loaded yield history: {self.total.searches} searches, "
+                f"{len(self.known_places)} known places"
+            )
+        except Exception as e:
+            logger.warning(f"Could not load yield history: {e}")
+
+    def save(self) -> None:
+        """Save yield history to file"""
+        data = {
+            "total": asdict(self.total),
+            "combos": {k: asdict(v) for k, v in self.combos.items()},
+            "terms": {k: asdict(v) for k, v in self.terms.items()},
+            "categories": {k: asdict(v) for k, v in self.categories.items()},
+            "locations": {k: asdict(v) for k, v in self.locations.items()},
+            "last_updated": datetime.now().isoformat(),
+        }
+        try:
+            shared_writer().submit(self.filepath, data)
+        except Exception as e:
+            logger.error(f"Could not save yield history: {e}")
+
+    # -------------------------------------------
+    # Recording
+    # -------------------------------------------
+
+    def split_new_places(
+        self,
+        businesses: list[dict],
+        surfaced_keys: Iterable[str] = (),
+    ) -> tuple[int, int]:
+        """
+        Count (new, duplicate) places of one search and remember the new ones.
+        
+        surfaced_keys are the place keys the results feed showed, including
+        known places the scraper skipped: those count as duplicates, but only
+        scraped places are remembered.
+        """
+        returned = {key for key in map(record_key, businesses) if key}
+        duplicates = (returned | set(surfaced_keys)) & self.known_places
+        new = returned - self.known_places
+        self._remember(new)
+        return len(new), len(duplicates)
+
+    def _remember(self, keys: set) -> None:
+        """Add places to known_places and append them to the places log"""
+        for key in sorted(keys):
+            self.known_places.add(key)
+            try:
+                self.places_log.append({"key": key})
+            except OSError as e:
+                logger.error(f"Could not record known place: {e}")
+
+    def record(
+        self,
+        category_key: str,
+        search_term: str,
+        location: str,
+        new_places: int,
+        new_leads: int,
+        duplicates: int,
+        seconds: float,
+    ) -> None:
+        """Record the outcome of one finished search"""
+        values = (new_places, new_leads, duplicates, seconds)
+        self.total.add(*values)
+        for bucket, key in (
+            (self.combos, combo_key(search_term, location)),
+            (self.terms, combo_key(category_key, search_term)),
+            (self.categories, category_key),
+            (self.locations, location),
+        ):
+            bucket.setdefault(key, YieldStats()).add(*values)
+        self.save()
+
+    # -------------------------------------------
+    # Estimation
+    # -------------------------------------------
+
+    def _smoothed(self, stats: Optional[YieldStats], prior_leads: float, prior_minutes: float) -> tuple[float, float]:
+        """Leads/search and minutes/search shrunk towards a prior"""
+        if not stats:
+            return prior_leads, prior_minutes
+        weight = stats.searches + PRIOR_WEIGHT
+        leads = (stats.new_leads + PRIOR_WEIGHT * prior_leads) / weight
+        minutes = (stats.seconds / 60 + PRIOR_WEIGHT * prior_minutes) / weight
+        return leads, minutes
+
+    def expected_rate(self, category_key: str, search_term: str, location: str) -> float:
+        """Expected qualified leads per minute for a combo"""
+        global_leads = (self.total.new_leads + 1) / (self.total.searches + 1)
+        global_minutes = (
+            self.total.seconds / 60 / self.total.searches
+            if self.total.searches else DEFAULT_SEARCH_MINUTES
+        )
+
+        cat_leads, cat_minutes = self._smoothed(
+            self.categories.get(category_key), global_leads, global_minutes
+        )
+        term_leads, term_minutes = self._smoothed(
+            self.terms.get(combo_key(category_key, search_term)), cat_leads, cat_minutes
+        )
+        loc_leads, loc_minutes = self._smoothed(
+            self.locations.get(location), global_leads, global_minutes
+        )
+
+        # Term and location effects combined multiplicatively around the global rate
+        prior_leads = term_leads * loc_leads / global_leads
+        prior_minutes = (term_minutes + loc_minutes) / 2
+
+        leads, minutes = self._smoothed(
+            self.combos.get(combo_key(search_term, location)), prior_leads, prior_minutes
+        )
+        rate = leads / max(minutes, 0.1)
+
+        if self.is_saturated_category(category_key):
+            rate *= SATURATION_PENALTY
+        if self.is_saturated_location(location):
+            rate *= SATURATION_PENALTY
+        return rate
+
+    def is_saturated_location(self, location: str) -> bool:
+        stats = self.locations.get(location)
+        return bool(stats and stats.is_saturated)
+
+    def is_saturated_category(self, category_key: str) -> bool:
+        stats = self.categories.get(category_key)
+        return bool(stats and stats.is_saturated)
+
+    def _is_unexplored(self, category_key: str, search_term: str, location: str) -> bool:
+        return (
+            combo_key(category_key, search_term) not in self.terms
+            or location not in self.locations
+        )
+
+    # -------------------------------------------
+    # Ordering
+    # -------------------------------------------
+
+    def next_combo(self, pending: list[tuple]) -> tuple:
+        """
+        Pick the next (category_key, search_term, location) to search.
+
+        Exploits the best expected leads/minute most of the time, spends
+        `exploration_rate` of the picks on unexplored terms/locations and
+        avoids hitting the same location twice in a row when possible.
+        """
+        if not pending:
+            raise ValueError("No pending searches to schedule")
+
+        candidates = [c for c in pending if c[2] != self._last_location] or pending
+
+        pick = None
+        if random.random() < self.exploration_rate:
+            unexplored = [c for c in candidates if self._is_unexplored(*c)]
+            if unexplored:
+                pick = random.choice(unexplored)
+
+        if pick is None:
+            # pending is pre-shuffled, so max() breaks ties randomly
+            pick = max(candidates, key=lambda c: self.expected_rate(*c))
+
+        self._last_location = pick[2]
+        return pick
+
+    def suggest_max_results(self, location: str, default: int) -> int:
+        """
+        Scale max_results by how fresh a zone still is.
+
+        Zones where most places are already known get a shorter scroll,
+        zones that keep surfacing unseen places get a longer one.
+        """
+        stats = self.locations.get(location)
+        if not stats or not stats.searches:
+            return default
+        suggested = round(default * (0.5 + stats.new_ratio))
+        return max(MIN_MAX_RESULTS, min(MAX_MAX_RESULTS, suggested))
+
+    def saturated_groups(self) -> tuple[list[str], list[str]]:
+        """Return (saturated categories, saturated locations)"""
+        categories = sorted(k for k, v in self.categories.items() if v.is_saturated)
+        locations = sorted(k for k, v in self.locations.items() if v.is_saturated)
+        return categories, locations
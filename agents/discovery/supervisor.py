@@ -0,0 +1,123 @@
+"""
+Discovery Agent - Browser Crash Supervisor
+
+Keeps a MapsScraper usable through long unattended runs: detects a
+disconnected browser or closed page, relaunches Chromium with the saved
+session (cookies, consent) and resumes the interrupted search from its
+last extracted place instead of starting it over.
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from agents.discovery.failures import FailureClass, SearchFailure
+
+if TYPE_CHECKING:
+    from agents.discovery.google_maps import MapsScraper, ScrapedBusiness
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================
+# CONSTANTS
+# ===========================================
+
+MAX_RESTARTS_PER_SEARCH = 3      # Relaunches allowed while resuming a single search
+RESTART_DELAY = 5.0              # Seconds to let the old Chromium process go away
+
+DEFAULT_SESSION_FILE = Path(__file__).parent.parent.parent / "browser_session.json"
+
+
+def session_file_for(name: str) -> Path:
+    """Session file of one of several concurrent browsers (browser_session.<name>.json)"""
+    return DEFAULT_SESSION_FILE.with_name(f"{DEFAULT_SESSION_FILE.stem}.{name}.json")
+
+
+# ===========================================
+# SUPERVISOR
+# ===========================================
+
+class BrowserSupervisor:
+    """
+    Owns the browser lifecycle of a MapsScraper.
+
+    `search()` wraps `search_businesses()`: when the browser crashes mid
+    search it relaunches with the saved session and calls the search again
+    with `resume=True`, so places that were already extracted are kept and
+    skipped. Any other failure is raised unchanged for the caller's retry
+    handling.
+    """
+
+    def __init__(
+        self,
+        scraper: "MapsScraper",
+        session_file: Path = DEFAULT_SESSION_FILE,
+        max_restarts: int = MAX_RESTARTS_PER_SEARCH,
+    ):
+        self.scraper = scraper
+        self.session_file = session_file
+        self.max_restarts = max_restarts
+        self.restarts = 0
+
+    def _storage_state(self) -> Optional[str]:
+        return str(self.session_file) if self.session_file.exists() else None
+
+    async def start(self) -> None:
+        """Launch the browser, restoring the saved session if there is one"""
+        try:
+            await self.scraper.initialize(storage_state=self._storage_state())
+        except Exception as e:
+            if not self._storage_state():
+                raise
+            # A corrupt session file must not keep the browser from starting
+            logger.warning(f"Could not restore browser session ({e}), starting fresh")
+            await self.scraper.close()
+            self.session_file.unlink(missing_ok=True)
+            await self.scraper.initialize()
+
+    async def restart(self, reason: str) -> None:
+        """Tear down whatever is left of the browser and launch a new one"""
+        self.restarts += 1
+        logger.warning(f"Relaunching browser (restart #{self.restarts}): {reason}")
+        await self.scraper.close()
+        await asyncio.sleep(RESTART_DELAY)
+        await self.start()
+
+    async def ensure_alive(self) -> None:
+        """Relaunch the browser if it disconnected or its page was closed"""
+        if not self.scraper.is_alive():
+            await self.restart("browser disconnected or page closed")
+
+    async def save_session(self) -> None:
+        try:
+            await self.scraper.save_session(str(self.session_file))
+        except Exception as e:
+            logger.debug(f"Could not save browser session: {e}")
+
+    async def search(self, query: str, location: str, **kwargs) -> list["ScrapedBusiness"]:
+        """
+        Run one search, relaunching and resuming on browser crashes.
+
+        Raises SearchFailure for every other failure class, or for a crash
+        that persists after `max_restarts` relaunches.
+        """
+        resume = False
+        for attempt in range(self.max_restarts + 1):
+            await self.ensure_alive()
+            try:
+                results = await self.scraper.search_businesses(
+                    query, location, raise_on_failure=True, resume=resume, **kwargs
+                )
+                await self.save_session()
+                return results
+            except SearchFailure as e:
+                if e.failure_class != FailureClass.BROWSER_CRASH or attempt == self.max_restarts:
+                    raise
+                await self.restart(str(e))
+                resume = True
+
+    async def close(self) -> None:
+        await self.save_session()
+        await self.scraper.close()
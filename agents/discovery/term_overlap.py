@@ -0,0 +1,218 @@
+"""
+Discovery Agent - Search-Term Redundancy Detection
+
+Category synonyms ("restaurantes", "comida", "restaurant", ...) mostly
+return the same places. This module measures result-set overlap between
+the terms of a category per location (Jaccard over place IDs) and
+collapses terms that keep adding too few new places.
+
+Like the scheduler's yield file, the overlap file is per-process state:
+concurrent processes overwrite each other's copy (last writer wins).
+
+Usage:
+    python -m agents.discovery.term_overlap            # Print the overlap report
+"""
+
+import json
+import logging
+from datetime import datetime
+from itertools import combinations
+from pathlib import Path
+from typing import Iterable, Optional
+
+from database.background_writer import shared_writer
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================
+# CONSTANTS
+# ===========================================
+
+MIN_TERM_GAIN = 0.10          # Terms adding less than this share of new places are collapsed
+MIN_SHARED_LOCATIONS = 3      # Locations searched with 2+ terms before judging a term
+
+DEFAULT_OVERLAP_FILE = Path(__file__).parent.parent.parent / "term_overlap.json"
+
+
+# ===========================================
+# HELPERS
+# ===========================================
+
+def jaccard(a: set, b: set) -> float:
+    """Jaccard similarity of two place-ID sets"""
+    union = a | b
+    return len(a & b) / len(union) if union else 0.0
+
+
+# ===========================================
+# TRACKER
+# ===========================================
+
+class TermOverlapTracker:
+    """
+    Tracks which places each search term returned per location and decides
+    which synonyms are redundant.
+
+    A term's gain in a location is the share of the combined result set
+    that only that term found. Terms are collapsed greedily (lowest average
+    gain first, recomputed against the terms still active) so two identical
+    synonyms never collapse each other - one of them always survives.
+    """
+
+    def __init__(
+        self,
+        filepath: Path = DEFAULT_OVERLAP_FILE,
+        min_gain: float = MIN_TERM_GAIN,
+        min_shared_locations: int = MIN_SHARED_LOCATIONS,
+    ):
+        self.filepath = filepath
+        self.min_gain = min_gain
+        self.min_shared_locations = min_shared_locations
+
+        # category_key -> location -> search_term -> set of place keys
+        self.results: dict[str, dict[str, dict[str, set]]] = {}
+        self._collapsed: dict[str, set] = {}
+        self.load()
+
+    def load(self) -> None:
+        """Load recorded result sets from file"""
+        if not self.filepath.exists():
+            return
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.results = {
+                category: {
+                    location: {term: set(keys) for term, keys in terms.items()}
+                    for location, terms in locations.items()
+                }
+                for category, locations in data.get("results", {}).items()
+            }
+            for category in self.results:
+                self._update_collapsed(category)
+        except Exception as e:
+            logger.warning(f"Could not load term overlap data: {e}")
+
+    def save(self) -> None:
+        """Save recorded result sets to file"""
+        data = {
+            "results": {
+                category: {
+                    location: {term: sorted(keys) for term, keys in terms.items()}
+                    for location, terms in locations.items()
+                }
+                for category, locations in self.results.items()
+            },
+            "collapsed": {k: sorted(v) for k, v in self._collapsed.items() if v},
+            "last_updated": datetime.now().isoformat(),
+        }
+        try:
+            shared_writer().submit(self.filepath, data)
+        except Exception as e:
+            logger.error(f"Could not save term overlap data: {e}")
+
+    def record(
+        self,
+        category_key: str,
+        search_term: str,
+        location: str,
+        place_keys: Iterable[Optional[str]],
+    ) -> None:
+        """Record the places a search returned"""
+        terms = self.results.setdefault(category_key, {}).setdefault(location, {})
+        terms[search_term] = {k for k in place_keys if k}
+        self._update_collapsed(category_key)
+        self.save()
+
+    # -------------------------------------------
+    # Analysis
+    # -------------------------------------------
+
+    def _shared_locations(self, category_key: str, active: set) -> list[dict]:
+        """Per-location result sets restricted to active terms, 2+ terms only"""
+        shared = []
+        for terms in self.results.get(category_key, {}).values():
+            observed = {t: keys for t, keys in terms.items() if t in active}
+            if len(observed) >= 2:
+                shared.append(observed)
+        return shared
+
+    def _gain(self, term: str, shared: list[dict]) -> Optional[float]:
+        """Average share of the combined result set only `term` contributed"""
+        gains = []
+        for observed in shared:
+            if term not in observed:
+                continue
+            others = set().union(*(keys for t, keys in observed.items() if t != term))
+            union = others | observed[term]
+            if union:
+                gains.append(len(observed[term] - others) / len(union))
+        if len(gains) < self.min_shared_locations:
+            return None
+        return sum(gains) / len(gains)
+
+    def _update_collapsed(self, category_key: str) -> None:
+        active = {
+            term
+            for terms in self.results.get(category_key, {}).values()
+            for term in terms
+        }
+        collapsed = set()
+
+        while len(active) > 1:
+            shared = self._shared_locations(category_key, active)
+            gains = {
+                term: gain for term in active
+                if (gain := self._gain(term, shared)) is not None
+            }
+            if not gains:
+                break
+            term, gain = min(gains.items(), key=lambda item: item[1])
+            if gain >= self.min_gain:
+                break
+            active.discard(term)
+            collapsed.add(term)
+
+        if collapsed - self._collapsed.get(category_key, set()):
+            logger.info(f"Collapsed redundant search terms for {category_key}: {sorted(collapsed)}")
+        self._collapsed[category_key] = collapsed
+
+    def is_collapsed(self, category_key: str, search_term: str) -> bool:
+        """True if the term adds too few new places to be worth searching"""
+        return search_term in self._collapsed.get(category_key, set())
+
+    def overlap_matrix(self, category_key: str) -> dict[tuple[str, str], float]:
+        """Mean Jaccard similarity per term pair over locations where both ran"""
+        pair_scores: dict[tuple[str, str], list[float]] = {}
+        for terms in self.results.get(category_key, {}).values():
+            for a, b in combinations(sorted(terms), 2):
+                pair_scores.setdefault((a, b), []).append(jaccard(terms[a], terms[b]))
+        return {
+            pair: sum(scores) / len(scores)
+            for pair, scores in pair_scores.items()
+        }
+
+    def format_report(self) -> str:
+        """Human-readable overlap matrix per category"""
+        lines = []
+        for category_key in sorted(self.results):
+            matrix = self.overlap_matrix(category_key)
+            if not matrix:
+                continue
+            lines.append(f"{category_key}:")
+            for (a, b), score in sorted(matrix.items(), key=lambda item: -item[1]):
+                lines.append(f"  {score:5.2f}  '{a}' ~ '{b}'")
+            collapsed = sorted(self._collapsed.get(category_key, set()))
+            if collapsed:
+                lines.append(f"  collapsed: {', '.join(collapsed)}")
+        return "\n".join(lines)
+
+
+# ===========================================
+# STANDALONE EXECUTION
+# ===========================================
+
+if __name__ == "__main__":
+    tracker = TermOverlapTracker()
+    print(tracker.format_report() or "No overlap data recorded yet")
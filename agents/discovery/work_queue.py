@@ -0,0 +1,335 @@
+"""
+Discovery Agent - Redis Work Queue
+
+Leased task queue for distributed discovery. Search combos and place-detail
+tasks are stored in Redis; any number of scraper nodes lease them with a
+visibility timeout, and tasks whose lease expires (node died, network cut)
+become available again. Scraped places go to a shared result store.
+
+Redis layout (all keys under `prefix`):
+    <prefix>:pending    ZSET  task_id -> epoch when it may be leased
+    <prefix>:leased     ZSET  task_id -> epoch when the lease expires
+    <prefix>:owners     HASH  task_id -> worker holding the lease
+    <prefix>:tasks      HASH  task_id -> task JSON
+    <prefix>:done       SET   finished task ids (enqueue is idempotent)
+    <prefix>:dead       HASH  task_id -> task JSON with its last error
+    <prefix>:results    HASH  place key -> business JSON
+    <prefix>:known      SET   place keys already scraped by any node
+
+Use `memory://` as the URL to run against an in-process fakeredis server.
+"""
+
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field, asdict
+from typing import Iterable, Optional
+
+import redis
+from redis.exceptions import WatchError
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================
+# CONSTANTS
+# ===========================================
+
+DEFAULT_PREFIX = "discovery"
+DEFAULT_VISIBILITY_TIMEOUT = 300.0     # Seconds a lease lasts without a heartbeat
+DEFAULT_MAX_ATTEMPTS = 5               # Leases per task before it is dead-lettered
+
+TASK_SEARCH = "search"                 # Run a search, enqueue its places
+TASK_PLACE = "place"                   # Open one place and extract its details
+
+# One fakeredis server per process so every in-process client shares data
+_memory_server = None
+
+
+def connect(url: str) -> redis.Redis:
+    """Redis client for a URL; `memory://` gives an in-process fakeredis"""
+    if url.startswith("memory://"):
+        import fakeredis
+
+        global _memory_server
+        if _memory_server is None:
+            _memory_server = fakeredis.FakeServer()
+        return fakeredis.FakeRedis(server=_memory_server, decode_responses=True)
+    return redis.Redis.from_url(url, decode_responses=True)
+
+
+# ===========================================
+# DATA CLASSES
+# ===========================================
+
+@dataclass
+class Task:
+    """A unit of work in the queue"""
+    id: str
+    kind: str
+    payload: dict = field(default_factory=dict)
+    attempts: int = 0
+    last_error: Optional[str] = None
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, data: str) -> "Task":
+        return cls(**json.loads(data))
+
+
+# ===========================================
+# WORK QUEUE
+# ===========================================
+
+class WorkQueue:
+    """
+    Redis-backed queue with leases and visibility timeouts.
+
+    Every state change that depends on a read (lease, ack, nack, reclaim)
+    runs under WATCH/MULTI, so two nodes can never lease the same task and
+    a node whose lease already expired cannot ack or nack it anymore.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        prefix: str = DEFAULT_PREFIX,
+        visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ):
+        self.client = client
+        self.prefix = prefix
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}:{name}"
+
+    # -------------------------------------------
+    # Producing
+    # -------------------------------------------
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: dict,
+        task_id: Optional[str] = None,
+        delay: float = 0.0,
+    ) -> bool:
+        """
+        Add a task. Returns False if a task with this id is already queued,
+        leased or done, so producers can enqueue the same combo repeatedly.
+        """
+        task_id = task_id or uuid.uuid4().hex
+        if self.client.sismember(self._key("done"), task_id):
+            return False
+        task = Task(id=task_id, kind=kind, payload=payload)
+        if not self.client.hsetnx(self._key("tasks"), task_id, task.to_json()):
+            return False
+        self.client.zadd(self._key("pending"), {task_id: time.time() + delay})
+        return True
+
+    # -------------------------------------------
+    # Consuming
+    # -------------------------------------------
+
+    def lease(self, worker_id: str, visibility_timeout: Optional[float] = None) -> Optional[Task]:
+        """Lease the next available task, or None if nothing is due"""
+        self.reclaim_expired()
+        timeout = visibility_timeout or self.visibility_timeout
+        pending, leased = self._key("pending"), self._key("leased")
+
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(pending)
+                    due = pipe.zrangebyscore(pending, "-inf", time.time(), start=0, num=1)
+                    if not due:
+                        pipe.unwatch()
+                        return None
+                    task_id = due[0]
+                    raw = pipe.hget(self._key("tasks"), task_id)
+                    if raw is None:
+                        # Orphaned id (task acked while it sat in pending)
+                        pipe.multi()
+                        pipe.zrem(pending, task_id)
+                        pipe.execute()
+                        continue
+                    task = Task.from_json(raw)
+                    if task.attempts >= self.max_attempts:
+                        # Its leases kept expiring (node died mid-task every time)
+                        task.last_error = task.last_error or "lease expired repeatedly"
+                        pipe.multi()
+                        pipe.zrem(pending, task_id)
+                        pipe.hdel(self._key("tasks"), task_id)
+                        pipe.hset(self._key("dead"), task_id, task.to_json())
+                        pipe.execute()
+                        logger.warning(f"Task {task_id} dead-lettered after {task.attempts} attempts")
+                        continue
+                    task.attempts += 1
+                    pipe.multi()
+                    pipe.zrem(pending, task_id)
+                    pipe.zadd(leased, {task_id: time.time() + timeout})
+                    pipe.hset(self._key("owners"), task_id, worker_id)
+                    pipe.hset(self._key("tasks"), task_id, task.to_json())
+                    pipe.execute()
+                    return task
+                except WatchError:
+                    continue
+
+    def heartbeat(self, task: Task, worker_id: str, visibility_timeout: Optional[float] = None) -> bool:
+        """Extend a lease. Returns False if the lease was lost."""
+        timeout = visibility_timeout or self.visibility_timeout
+        return self._if_owner(
+            task.id, worker_id,
+            lambda pipe: pipe.zadd(self._key("leased"), {task.id: time.time() + timeout}, xx=True),
+        )
+
+    def ack(self, task: Task, worker_id: str) -> bool:
+        """Mark a leased task as done"""
+        def finish(pipe):
+            pipe.zrem(self._key("leased"), task.id)
+            pipe.hdel(self._key("owners"), task.id)
+            pipe.hdel(self._key("tasks"), task.id)
+            pipe.sadd(self._key("done"), task.id)
+        return self._if_owner(task.id, worker_id, finish)
+
+    def nack(self, task: Task, worker_id: str, error: str = "", delay: float = 0.0) -> bool:
+        """
+        Give a leased task back after a failure. It becomes available again
+        after `delay`, or is dead-lettered once it used up `max_attempts`.
+        """
+        task.last_error = error[:200] or None
+        dead = task.attempts >= self.max_attempts
+
+        def release(pipe):
+            pipe.zrem(self._key("leased"), task.id)
+            pipe.hdel(self._key("owners"), task.id)
+            if dead:
+                pipe.hdel(self._key("tasks"), task.id)
+                pipe.hset(self._key("dead"), task.id, task.to_json())
+            else:
+                pipe.hset(self._key("tasks"), task.id, task.to_json())
+                pipe.zadd(self._key("pending"), {task.id: time.time() + delay})
+
+        released = self._if_owner(task.id, worker_id, release)
+        if released and dead:
+            logger.warning(f"Task {task.id} dead-lettered after {task.attempts} attempts: {error}")
+        return released
+
+    def _if_owner(self, task_id: str, worker_id: str, apply) -> bool:
+        """Run `apply(pipe)` in a transaction only while worker_id holds the lease"""
+        owners = self._key("owners")
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(owners)
+                    if pipe.hget(owners, task_id) != worker_id:
+                        pipe.unwatch()
+                        return False
+                    pipe.multi()
+                    apply(pipe)
+                    pipe.execute()
+                    return True
+                except WatchError:
+                    continue
+
+    def reclaim_expired(self) -> int:
+        """Move tasks whose lease expired back to pending. Returns how many."""
+        leased, owners = self._key("leased"), self._key("owners")
+        reclaimed = 0
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(leased, owners)
+                    expired = pipe.zrangebyscore(leased, "-inf", time.time())
+                    if not expired:
+                        pipe.unwatch()
+                        break
+                    pipe.multi()
+                    for task_id in expired:
+                        pipe.zrem(leased, task_id)
+                        pipe.hdel(owners, task_id)
+                        pipe.zadd(self._key("pending"), {task_id: time.time()})
+                    pipe.execute()
+                    reclaimed = len(expired)
+                    break
+                except WatchError:
+                    continue
+        if reclaimed:
+            logger.info(f"Reclaimed {reclaimed} tasks with expired leases")
+        return reclaimed
+
+    # -------------------------------------------
+    # Introspection
+    # -------------------------------------------
+
+    def next_due_in(self) -> Optional[float]:
+        """Seconds until the next pending task is due (None if queue is empty)"""
+        first = self.client.zrange(self._key("pending"), 0, 0, withscores=True)
+        if not first:
+            return None
+        return max(first[0][1] - time.time(), 0.0)
+
+    def is_drained(self) -> bool:
+        """True when nothing is pending or leased"""
+        return not (
+            self.client.zcard(self._key("pending"))
+            or self.client.zcard(self._key("leased"))
+        )
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.client.zcard(self._key("pending")),
+            "leased": self.client.zcard(self._key("leased")),
+            "done": self.client.scard(self._key("done")),
+            "dead": self.client.hlen(self._key("dead")),
+        }
+
+
+# ===========================================
+# SHARED RESULT STORE
+# ===========================================
+
+class ResultStore:
+    """Scraped places shared by all nodes, keyed by place key"""
+
+    def __init__(self, client: redis.Redis, prefix: str = DEFAULT_PREFIX):
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}:{name}"
+
+    def is_known(self, place_key: str) -> bool:
+        return bool(self.client.sismember(self._key("known"), place_key))
+
+    def known_places(self) -> set:
+        return set(self.client.smembers(self._key("known")))
+
+    def add_known(self, place_keys: Iterable[str]) -> None:
+        keys = [k for k in place_keys if k]
+        if keys:
+            self.client.sadd(self._key("known"), *keys)
+
+    def put(self, place_key: str, business: dict) -> None:
+        """Store (or overwrite) a scraped place"""
+        with self.client.pipeline() as pipe:
+            pipe.hset(self._key("results"), place_key, json.dumps(business, ensure_ascii=False))
+            pipe.sadd(self._key("known"), place_key)
+            pipe.execute()
+
+    def pop_all(self) -> list[dict]:
+        """Take every stored result out of the store (for merging into leads)"""
+        results_key = self._key("results")
+        with self.client.pipeline() as pipe:
+            pipe.hgetall(results_key)
+            pipe.delete(results_key)
+            raw, _ = pipe.execute()
+        return [json.loads(value) for value in raw.values()]
+
+    def count(self) -> int:
+        return self.client.hlen(self._key("results"))
@@ -30,6 +30,8 @@ from jinja2 import Environment, FileSystemLoader
 
 # Import the CopyWriter for rich content generation
 from agents.generation.copy_writer import CopyWriter
+from agents.generation.lead_repository import shared_repository
+from database.local_db import DB_ENV, configured_database, load_businesses
 
 # Import the new theme configuration system
 from agents.generation.theme_config import (
@@ -377,11 +379,10 @@ def slugify(text: str) -> str:
 
 
 def load_leads() -> list:
-    """Load businesses from datos_definitivos.json"""
-    if not DATA_FILE.exists():
-        return []
-    with open(DATA_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """Load businesses from datos_definitivos.json (or the LEADS_DB database)"""
+    if not os.environ.get(DB_ENV):
+        return shared_repository(DATA_FILE).all()  # Parsed once, re-read only when the file changes
+    return load_businesses(DATA_FILE)
 
 
 def load_intake_data(filepath: Path = None, business_name: str = None, google_place_id: str = None) -> Optional[dict]:
@@ -431,25 +432,26 @@ def load_intake_data(filepath: Path = None, business_name: str = None, google_pl
 
 def find_lead_by_name(name: str) -> Optional[dict]:
     """Find a lead by business name (partial match)"""
-    leads = load_leads()
-    name_lower = name.lower()
-    
-    for lead in leads:
-        if name_lower in lead.get('name', '').lower():
-            return lead
+    db = configured_database()
+    if db is not None:
+        try:
+            return db.find_by_name(name)
+        finally:
+            db.close()
     
-    return None
+    return shared_repository(DATA_FILE).find(name)
 
 
 def find_lead_by_google_id(google_place_id: str) -> Optional[dict]:
     """Find a lead by Google Place ID"""
-    leads = load_leads()
-    
-    for lead in leads:
-        if lead.get('google_place_id') == google_place_id:
-            return lead
+    db = configured_database()
+    if db is not None:
+        try:
+            return db.get_business(google_place_id)
+        finally:
+            db.close()
     
-    return None
+    return shared_repository(DATA_FILE).get(google_place_id)
 
 
 # Global CopyWriter instance
@@ -573,6 +575,17 @@ def generate_static_site(business: BusinessData, output_path: Path) -> Path:
     return output_path
 
 
+def record_generated_site(lead: dict, output_path: Path) -> None:
+    """Register the generated site in the websites table (LEADS_DB only)"""
+    db = configured_database()
+    if db is None or not lead.get('google_place_id'):
+        return
+    try:
+        db.record_website(lead['google_place_id'], str(output_path), template_id=lead.get('category'))
+    finally:
+        db.close()
+
+
 def generate_all_sites(limit: int = None) -> int:
     """Generate static sites for all leads"""
     leads = load_leads()
@@ -589,6 +602,7 @@ def generate_all_sites(limit: int = None) -> int:
             output_path = OUTPUT_DIR / f"{i:04d}-{slug}"
             
             generate_static_site(business, output_path)
+            record_generated_site(lead, output_path)
             print(f"✅ Generated: {business.name} → {output_path}")
             
         except Exception as e:
@@ -665,6 +679,12 @@ Examples:
             output_path = Path(args.output) if args.output else OUTPUT_DIR / f"custom-{slug}"
             
             generate_static_site(business, output_path)
+            # The intake's business_id is the Google Place ID of the lead
+            intake = business.intake_data or {}
+            record_generated_site(
+                {'google_place_id': intake.get('business_id'), 'category': business.category},
+                output_path,
+            )
             print(f"\n✅ Generated: {business.name}")
             print(f"   Output: {output_path}")
             print(f"   Open: file://{output_path}/index.html")
@@ -27,6 +27,8 @@ from pathlib import Path
 from typing import Optional, List, Dict
 import sys
 
+from agents.generation.lead_repository import shared_repository
+
 
 # ===========================================
 # CONFIGURATION
@@ -216,12 +218,9 @@ class ClientIntakeForm:
     def load_business_by_google_id(self, google_place_id: str) -> Optional[dict]:
         """Carga los datos del negocio desde discovered_businesses.json"""
         try:
-            with open(DATA_FILE, 'r', encoding='utf-8') as f:
-                businesses = json.load(f)
-                
-            for business in businesses:
-                if business.get('google_place_id') == google_place_id:
-                    return business
+            business = shared_repository(DATA_FILE).get(google_place_id)
+            if business:
+                return business
             
             print(f"{Colors.RED}❌ No se encontró negocio con Google Place ID: {google_place_id}{Colors.ENDC}")
             return None
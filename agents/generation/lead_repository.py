@@ -0,0 +1,189 @@
+"""
+Generation Agent - Cached Lead Repository
+
+Loads a business JSON file once and indexes it by Google Place ID and
+normalized name, so the builder and the intake form stop re-parsing the
+whole dataset for every lookup. Name search ignores case and accents
+("cafe" finds "Café Bohemia") and supports prefix search.
+
+The file is re-checked on every access: a changed mtime or size triggers
+a content hash, and only a changed hash re-parses the file (a `touch` or
+an identical rewrite keeps the index).
+
+Usage:
+    repo = shared_repository(DATA_FILE)
+    repo.get("0x945da89f7ce6aed5:0")
+    repo.find("bohemia")
+    repo.search("caf", limit=10)
+"""
+
+import bisect
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Optional
+
+from database.blob_store import resolve_records
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================
+# CONSTANTS
+# ===========================================
+
+HASH_CHUNK_SIZE = 1 << 20
+
+
+# ===========================================
+# HELPERS
+# ===========================================
+
+def search_key(name: Optional[str]) -> str:
+    """Lowercase, accent-free name with collapsed whitespace"""
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def file_hash(filepath: Path) -> str:
+    digest = hashlib.sha1()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ===========================================
+# REPOSITORY
+# ===========================================
+
+class LeadRepository:
+    """
+    In-memory index over one JSON array of businesses.
+
+    `get()` and exact-name `find()` are dict lookups, `search()` is a
+    binary search over the sorted names.
+    """
+
+    def __init__(self, filepath: Path):
+        self.filepath = Path(filepath)
+        self._lock = threading.Lock()
+        self._stat: Optional[tuple] = None
+        self._hash: Optional[str] = None
+        self._leads: list[dict] = []
+        self._by_place_id: dict[str, dict] = {}
+        self._by_name: dict[str, dict] = {}
+        self._keys: list[str] = []                # search_key per position
+        self._names: list[tuple[str, int]] = []   # (search_key, position), sorted
+
+    # -------------------------------------------
+    # Loading
+    # -------------------------------------------
+
+    def _refresh(self) -> None:
+        """Re-index when the file's content changed since the last load"""
+        with self._lock:
+            try:
+                st = os.stat(self.filepath)
+            except FileNotFoundError:
+                if self._stat is not None:
+                    logger.warning(f"{self.filepath.name} disappeared, clearing lead index")
+                self._index([], None, None)
+                return
+
+            stat = (st.st_mtime_ns, st.st_size)
+            if stat == self._stat:
+                return
+            digest = file_hash(self.filepath)
+            if digest == self._hash:
+                self._stat = stat
+                return
+
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                leads = resolve_records(json.load(f))  # Reviews etc. load on first access
+            self._index(leads, stat, digest)
+            logger.info(f"Indexed {len(leads)} leads from {self.filepath.name}")
+
+    def _index(self, leads: list[dict], stat: Optional[tuple], digest: Optional[str]) -> None:
+        by_place_id, by_name, keys, names = {}, {}, [], []
+        for position, lead in enumerate(leads):
+            place_id = lead.get("google_place_id")
+            if place_id:
+                by_place_id.setdefault(place_id, lead)
+            key = search_key(lead.get("name"))
+            keys.append(key)
+            if key:
+                by_name.setdefault(key, lead)
+                names.append((key, position))
+        names.sort()
+        self._leads, self._keys = leads, keys
+        self._by_place_id, self._by_name, self._names = by_place_id, by_name, names
+        self._stat, self._hash = stat, digest
+
+    # -------------------------------------------
+    # Lookups
+    # -------------------------------------------
+
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self._leads)
+
+    def all(self) -> list[dict]:
+        """Every lead, in file order"""
+        self._refresh()
+        return self._leads
+
+    def get(self, google_place_id: str) -> Optional[dict]:
+        self._refresh()
+        return self._by_place_id.get(google_place_id)
+
+    def search(self, prefix: str, limit: Optional[int] = None) -> list[dict]:
+        """Leads whose name starts with `prefix` (case and accent-insensitive), by name"""
+        self._refresh()
+        prefix = search_key(prefix)
+        if not prefix:
+            return []
+        start = bisect.bisect_left(self._names, (prefix, -1))
+        results = []
+        for i in range(start, len(self._names)):
+            key, position = self._names[i]
+            if not key.startswith(prefix) or (limit is not None and len(results) >= limit):
+                break
+            results.append(self._leads[position])
+        return results
+
+    def find(self, name: str) -> Optional[dict]:
+        """Exact name first, then the first name starting with it, then a substring match"""
+        self._refresh()
+        key = search_key(name)
+        if not key:
+            return None
+        lead = self._by_name.get(key)
+        if lead is not None:
+            return lead
+        prefixed = self.search(key, limit=1)
+        if prefixed:
+            return prefixed[0]
+        for position, lead_key in enumerate(self._keys):
+            if key in lead_key:
+                return self._leads[position]
+        return None
+
+
+_repositories: dict[Path, LeadRepository] = {}
+_repositories_lock = threading.Lock()
+
+
+def shared_repository(filepath: Path) -> LeadRepository:
+    """Process-wide repository for a file, so every caller shares one index"""
+    filepath = Path(filepath).resolve()
+    with _repositories_lock:
+        if filepath not in _repositories:
+            _repositories[filepath] = LeadRepository(filepath)
+        return _repositories[filepath]
@@ -0,0 +1 @@
+# Database - Lead storage backends
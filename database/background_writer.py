@@ -0,0 +1,201 @@
+"""
+Database - Background Coalescing JSON Writer
+
+Moves large `json.dump` calls off the asyncio event loop. Callers submit
+the latest state for a file; a writer thread coalesces bursts (only the
+newest state per file is written) and writes atomically via a temp file
+plus rename, so a crash never leaves a half-written file behind. Pending
+writes are flushed on `close()` and at interpreter exit, including after
+KeyboardInterrupt.
+"""
+
+import atexit
+import json
+import logging
+import os
+import stat
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================
+# CONSTANTS
+# ===========================================
+
+COALESCE_DELAY = 0.5      # Seconds to wait for more updates before writing
+
+
+# ===========================================
+# HELPERS
+# ===========================================
+
+@contextmanager
+def atomic_open(filepath: Path):
+    """
+    Text file to write `filepath` through: a uniquely named temp file in the
+    same directory (so concurrent writers never share one), fsynced and
+    renamed over `filepath` on success, removed on failure.
+    """
+    filepath = Path(filepath)
+    f = tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=filepath.parent,
+        prefix=f"{filepath.name}.", suffix=".tmp", delete=False,
+    )
+    try:
+        with f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # NamedTemporaryFile is created 0600 - keep the mode of the file it replaces
+        try:
+            os.chmod(f.name, stat.S_IMODE(os.stat(filepath).st_mode))
+        except FileNotFoundError:
+            os.chmod(f.name, 0o644)
+        os.replace(f.name, filepath)
+    except BaseException:
+        try:
+            os.unlink(f.name)
+        except OSError:
+            pass
+        raise
+
+
+def write_json_atomic(filepath: Path, data: Any, indent: Optional[int] = None) -> os.stat_result:
+    """
+    Write JSON to a temp file in the same directory, fsync, then rename over.
+    Returns the stat of the written file (size and mtime survive the rename).
+    """
+    with atomic_open(filepath) as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+        f.flush()
+        written = os.fstat(f.fileno())
+    return written
+
+
+def _write(filepath: Path, data: Any, indent: Optional[int], on_written: Optional[Callable]) -> None:
+    written = write_json_atomic(filepath, data, indent)
+    if on_written is not None:
+        on_written(written)
+
+
+def _snapshot(data: Any) -> Any:
+    """
+    Copy the containers the caller is likely to keep mutating (the top level
+    and its direct list/dict values). Records inside them are shared, so
+    callers must not edit a record in place after submitting it.
+    """
+    if isinstance(data, dict):
+        return {
+            key: list(value) if isinstance(value, list) else dict(value) if isinstance(value, dict) else value
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return list(data)
+    return data
+
+
+# ===========================================
+# WRITER
+# ===========================================
+
+class BackgroundWriter:
+    """Single writer thread; the newest submitted state per file wins"""
+
+    def __init__(self, coalesce_delay: float = COALESCE_DELAY):
+        self.coalesce_delay = coalesce_delay
+        self._pending: dict[Path, tuple[Any, Optional[int], Optional[Callable]]] = {}
+        self._cond = threading.Condition()
+        self._writing = False
+        self._flush_requested = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="background-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(
+        self,
+        filepath: Path,
+        data: Any,
+        indent: Optional[int] = None,
+        on_written: Optional[Callable[[os.stat_result], None]] = None,
+    ) -> None:
+        """
+        Queue `data` to be written to `filepath` (replacing any pending state).
+        `on_written` is called with the written file's stat once it is on disk.
+        """
+        if self._closed:
+            _write(Path(filepath), data, indent, on_written)
+            return
+        with self._cond:
+            self._pending[Path(filepath)] = (_snapshot(data), indent, on_written)
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending and self._closed:
+                    return
+                # Let a burst of updates collapse into one write per file
+                deadline = time.monotonic() + self.coalesce_delay
+                while not self._closed and not self._flush_requested:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, {}
+                self._flush_requested = False
+                self._writing = True
+            try:
+                for filepath, pending in batch.items():
+                    try:
+                        _write(filepath, *pending)
+                    except Exception as e:
+                        logger.error(f"Background write of {filepath.name} failed: {e}")
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every submitted state is on disk. Returns False on timeout."""
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._writing, timeout=timeout
+            )
+
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """Flush pending writes and stop the thread (idempotent)"""
+        if self._closed:
+            return
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        # Anything submitted while the thread was stopping is written inline
+        with self._cond:
+            batch, self._pending = self._pending, {}
+        for filepath, pending in batch.items():
+            _write(filepath, *pending)
+
+
+_shared_writer: Optional[BackgroundWriter] = None
+_shared_lock = threading.Lock()
+
+
+def shared_writer() -> BackgroundWriter:
+    """Process-wide writer used by the discovery state files"""
+    global _shared_writer
+    with _shared_lock:
+        if _shared_writer is None or _shared_writer._closed:
+            _shared_writer = BackgroundWriter()
+        return _shared_writer
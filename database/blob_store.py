@@ -0,0 +1,305 @@
+"""
+Database - Content-Addressed Blob Store for Large Place Payloads
+
+Reviews, customer updates, "About" text and photo URL lists make up most
+of every scraped record, and the same payloads are repeated in
+scrape_progress.json, datos_definitivos.json and discovered_businesses.json.
+`pack()` moves them into compressed blobs named by the SHA-256 of their
+canonical JSON, so each payload is stored once no matter how many files or
+snapshots reference it; the record keeps `{"$blob": "<sha256>"}` instead.
+
+    blobs/ab/abcdef...json.zst   (zstd when `zstandard` is installed)
+    blobs/ab/abcdef...json.gz    (gzip otherwise; both are readable)
+
+Readers get `LazyRecord`s from `load_records()`: plain dicts whose blob
+fields are fetched and decompressed on first access, so listing names or
+ratings never touches the reviews. `iter_records()` does the same one
+record at a time, for files too large to hold in memory.
+
+Usage:
+    python -m database.blob_store pack datos_definitivos.json      # Externalize payloads in place
+    python -m database.blob_store unpack datos_definitivos.json    # Inline them again
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, TextIO
+
+from database.background_writer import write_json_atomic
+
+# zstd compresses these payloads better and faster; gzip is the fallback
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================
+# CONSTANTS
+# ===========================================
+
+BLOB_DIR_ENV = "BLOB_DIR"
+DEFAULT_BLOB_DIR = Path(__file__).parent.parent / "blobs"
+
+BLOB_FIELDS = ("reviews", "customer_updates", "about_summary", "photo_urls", "popular_times")
+MIN_BLOB_BYTES = 256       # Smaller payloads stay inline (a reference is ~80 bytes)
+REF_KEY = "$blob"
+
+ZSTD_LEVEL = 10
+GZIP_LEVEL = 6
+
+STREAM_CHUNK_SIZE = 1 << 20   # Characters read per step when streaming a JSON array
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+
+
+# ===========================================
+# HELPERS
+# ===========================================
+
+def canonical_bytes(value: Any) -> bytes:
+    """Stable JSON encoding, so equal payloads hash alike"""
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def is_ref(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and REF_KEY in value
+
+
+def _compress(data: bytes) -> tuple[bytes, str]:
+    if HAS_ZSTD:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data), ".zst"
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0), ".gz"
+
+
+# ===========================================
+# STORE
+# ===========================================
+
+class BlobStore:
+    """Immutable, hash-named JSON blobs under one directory"""
+
+    def __init__(self, root: Path = DEFAULT_BLOB_DIR):
+        self.root = Path(root)
+
+    def _path(self, digest: str, suffix: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.json{suffix}"
+
+    def exists(self, digest: str) -> bool:
+        return self._path(digest, ".zst").exists() or self._path(digest, ".gz").exists()
+
+    def put(self, value: Any) -> str:
+        """Store a JSON value (once) and return its SHA-256"""
+        data = canonical_bytes(value)
+        digest = hashlib.sha256(data).hexdigest()
+        if self.exists(digest):
+            return digest
+        compressed, suffix = _compress(data)
+        path = self._path(digest, suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp name: two processes may store the same blob concurrently
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest: str) -> Any:
+        zst_path = self._path(digest, ".zst")
+        if zst_path.exists():
+            if not HAS_ZSTD:
+                raise RuntimeError(f"Blob {digest[:12]} is zstd-compressed; install zstandard to read it")
+            data = zstandard.ZstdDecompressor().decompress(zst_path.read_bytes())
+        else:
+            data = gzip.decompress(self._path(digest, ".gz").read_bytes())
+        return json.loads(data)
+
+    # -------------------------------------------
+    # Records
+    # -------------------------------------------
+
+    def pack(self, record: dict) -> dict:
+        """Copy of `record` with large BLOB_FIELDS replaced by references"""
+        packed = record.raw() if isinstance(record, LazyRecord) else dict(record)
+        for field in BLOB_FIELDS:
+            value = packed.get(field)
+            if not value or is_ref(value):
+                continue
+            if len(canonical_bytes(value)) >= MIN_BLOB_BYTES:
+                packed[field] = {REF_KEY: self.put(value)}
+        return packed
+
+    def unpack(self, record: dict) -> dict:
+        """Copy of `record` with every reference resolved"""
+        raw = record.raw() if isinstance(record, LazyRecord) else record
+        return {key: self.get(value[REF_KEY]) if is_ref(value) else value for key, value in raw.items()}
+
+    def lazy(self, record: dict) -> "LazyRecord":
+        return LazyRecord(record, self)
+
+
+class LazyRecord(dict):
+    """
+    A record whose blob references are resolved on first access through
+    `[]`, `get()`, `items()` or `values()`; copies (`dict(r)`, `{**r}`) and
+    json.dump get the full record. `raw()` returns the stored form without
+    loading anything.
+    """
+
+    __slots__ = ("_store",)
+
+    def __init__(self, record: dict, store: BlobStore):
+        super().__init__(record)
+        self._store = store
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if is_ref(value):
+            value = self._store.get(value[REF_KEY])
+            super().__setitem__(key, value)
+        return value
+
+    def __iter__(self):
+        # Overriding __iter__ keeps dict(r) / {**r} off CPython's raw-copy fast path
+        return super().__iter__()
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def raw(self) -> dict:
+        return dict(super().items())
+
+    def copy(self) -> dict:
+        return dict(self.items())
+
+
+_shared_store: Optional[BlobStore] = None
+
+
+def shared_blob_store() -> BlobStore:
+    """The store under BLOB_DIR (default: ./blobs next to the dataset files)"""
+    global _shared_store
+    root = Path(os.environ.get(BLOB_DIR_ENV) or DEFAULT_BLOB_DIR)
+    if _shared_store is None or _shared_store.root != root:
+        _shared_store = BlobStore(root)
+    return _shared_store
+
+
+# ===========================================
+# DATASET FILES
+# ===========================================
+
+def has_refs(records: Iterable[dict]) -> bool:
+    return any(is_ref(record.get(field)) for record in records for field in BLOB_FIELDS if isinstance(record, dict))
+
+
+def resolve_records(records: list[dict], lazy: bool = True, store: Optional[BlobStore] = None) -> list[dict]:
+    """Records from a (possibly packed) dataset file; plain ones pass through untouched"""
+    if not has_refs(records):
+        return records
+    store = store or shared_blob_store()
+    return [store.lazy(record) if lazy else store.unpack(record) for record in records]
+
+
+def load_records(filepath: Path, lazy: bool = True, store: Optional[BlobStore] = None) -> list[dict]:
+    """json.load for dataset files that may contain blob references"""
+    with open(filepath, "r", encoding="utf-8") as f:
+        return resolve_records(json.load(f), lazy, store)
+
+
+def _iter_json_array(f: TextIO) -> Iterator[Any]:
+    """Elements of a JSON array, decoded one at a time from a text stream"""
+    decoder = json.JSONDecoder()
+    buffer, pos, eof, opened = "", 0, False, False
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                raise ValueError(f"Unterminated JSON array in {getattr(f, 'name', 'stream')}")
+            chunk = f.read(STREAM_CHUNK_SIZE)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+            continue
+        if not opened:
+            if buffer[pos] != "[":
+                raise ValueError(f"{getattr(f, 'name', 'stream')} is not a JSON array")
+            opened, pos = True, pos + 1
+            continue
+        if buffer[pos] == "]":
+            return
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+            after = _WHITESPACE.match(buffer, end).end()
+        except json.JSONDecodeError:
+            end = None
+        # An element cut by the chunk boundary (e.g. "12" of "123") is only
+        # complete once the next "," or "]" has been read
+        if end is None or after == len(buffer) or buffer[after] not in ",]":
+            if eof:
+                raise ValueError(f"Invalid JSON array element in {getattr(f, 'name', 'stream')}")
+            # Read at least as much as is pending, so huge elements are re-decoded O(log n) times
+            chunk = f.read(max(STREAM_CHUNK_SIZE, len(buffer) - pos))
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+            continue
+        yield value
+        pos = end
+
+
+def iter_records(filepath: Path, lazy: bool = True, store: Optional[BlobStore] = None) -> Iterator[dict]:
+    """
+    Streaming load_records: JSON arrays are decoded one element at a time and
+    .jsonl files one line at a time, so memory does not grow with the file.
+    """
+    filepath = Path(filepath)
+    with open(filepath, "r", encoding="utf-8") as f:
+        if filepath.suffix == ".jsonl":
+            values = (json.loads(line) for line in f if line.strip())
+        else:
+            values = _iter_json_array(f)
+        for record in values:
+            if not isinstance(record, dict):
+                continue
+            if has_refs([record]):
+                store = store or shared_blob_store()
+                record = store.lazy(record) if lazy else store.unpack(record)
+            yield record
+
+
+def pack_records(records: Iterable[dict], store: Optional[BlobStore] = None) -> list[dict]:
+    store = store or shared_blob_store()
+    return [store.pack(record) for record in records]
+
+
+# ===========================================
+# STANDALONE EXECUTION
+# ===========================================
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Move large place payloads into the blob store (or back)")
+    parser.add_argument("command", choices=["pack", "unpack"])
+    parser.add_argument("files", nargs="+", type=Path, help="JSON arrays of businesses")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    for path in args.files:
+        before = path.stat().st_size
+        records = load_records(path, lazy=False)
+        if args.command == "pack":
+            records = pack_records(records)
+        write_json_atomic(path, records, indent=2)
+        print(f"{path}: {before / 1024:.0f} KB -> {path.stat().st_size / 1024:.0f} KB ({len(records)} records)")
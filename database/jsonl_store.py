@@ -0,0 +1,315 @@
+"""
+Database - Append-Only JSONL Lead Store
+
+Leads are appended one JSON object per line instead of rewriting a whole
+JSON array on every change. The file is replayed on load (last record per
+key wins) into an index by name, Place ID and phone, and compacted once
+superseded lines pile up. `export_json()` writes the legacy
+`discovered_businesses.json` array for older consumers.
+
+Usage:
+    python -m database.jsonl_store discovered_businesses.jsonl   # Export legacy JSON
+"""
+
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Iterator, Optional
+
+from database.background_writer import BackgroundWriter, atomic_open, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================
+# CONSTANTS
+# ===========================================
+
+COMPACT_RATIO = 2.0        # Compact when the log has this many lines per live record
+COMPACT_MIN_LINES = 500    # ...and at least this many superseded lines
+
+
+# ===========================================
+# HELPERS
+# ===========================================
+
+def normalize_name(name: Optional[str]) -> str:
+    return (name or "").lower().strip()
+
+
+def normalize_phone(phone: Optional[str]) -> str:
+    """Digits only, so "+595 21 123 456" and "021 123456" index alike"""
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-9:] if len(digits) >= 6 else ""
+
+
+def record_key(record: dict) -> Optional[str]:
+    """Stable identity for a scraped place (Place ID, falling back to the lowercased name)"""
+    place_id = record.get("google_place_id")
+    if place_id:
+        return place_id
+    name = normalize_name(record.get("name"))
+    return f"name:{name}" if name else None
+
+
+def _file_signature(stat: os.stat_result) -> dict:
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+# ===========================================
+# APPEND LOG
+# ===========================================
+
+class JsonlLog:
+    """Append-only JSONL file with atomic rewrite (compaction)"""
+
+    def __init__(self, filepath: Path):
+        self.filepath = filepath
+        self.lines = 0
+        self._handle = None
+
+    def read(self) -> Iterator[dict]:
+        """Yield every record; a torn last line (crash mid-write) is skipped"""
+        self.lines = 0
+        if not self.filepath.exists():
+            return
+        with open(self.filepath, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping corrupt line {number} in {self.filepath.name}")
+                    continue
+                self.lines += 1
+                yield record
+
+    def append(self, record: dict) -> None:
+        if self._handle is None:
+            self._handle = open(self.filepath, "a", encoding="utf-8")
+        self._handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._handle.flush()
+        self.lines += 1
+
+    def rewrite(self, records: list[dict]) -> None:
+        """Replace the log with `records` atomically (write temp file, then rename)"""
+        self.close()
+        with atomic_open(self.filepath) as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.lines = len(records)
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+# ===========================================
+# LEAD STORE
+# ===========================================
+
+class JsonlLeadStore:
+    """
+    Lead records keyed by Place ID (or name), persisted as a JSONL log.
+
+    `put()` is an O(1) append; updating a lead appends a newer version that
+    supersedes the old line on the next load or compaction.
+    """
+
+    def __init__(
+        self,
+        filepath: Path,
+        legacy_json: Optional[Path] = None,
+        compact_ratio: float = COMPACT_RATIO,
+    ):
+        self.filepath = filepath
+        self.legacy_json = legacy_json
+        self.compact_ratio = compact_ratio
+        self.log = JsonlLog(filepath)
+
+        self.records: dict[str, dict] = {}
+        self.by_name: dict[str, str] = {}
+        self.by_place_id: dict[str, str] = {}
+        self.by_phone: dict[str, str] = {}
+        self.load()
+
+    def load(self) -> None:
+        """
+        Replay the log, then import the legacy JSON array if it changed since
+        this store last exported or imported it (first use, or a tool that
+        still writes the JSON directly).
+        """
+        self.records.clear()
+        for index in (self.by_name, self.by_place_id, self.by_phone):
+            index.clear()
+
+        for record in self.log.read():
+            self._index(record)
+
+        if self._legacy_changed():
+            self.import_legacy()
+
+    # -------------------------------------------
+    # Legacy JSON
+    # -------------------------------------------
+
+    @property
+    def _legacy_marker(self) -> Path:
+        """Size and mtime of the legacy JSON as last exported or imported"""
+        return self.filepath.with_suffix(".legacy.json")
+
+    def _legacy_changed(self) -> bool:
+        """True if something other than this store wrote the legacy JSON since"""
+        if not (self.legacy_json and self.legacy_json.exists()):
+            return False
+        if not self.filepath.exists():
+            return True
+        try:
+            with open(self._legacy_marker, "r", encoding="utf-8") as f:
+                synced = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return True
+        return synced != _file_signature(self.legacy_json.stat())
+
+    def _mark_legacy_synced(self, stat: os.stat_result) -> None:
+        try:
+            write_json_atomic(self._legacy_marker, _file_signature(stat))
+        except OSError as e:
+            logger.warning(f"Could not write {self._legacy_marker.name}: {e}")
+
+    def import_legacy(self) -> int:
+        """
+        Merge the legacy JSON array into the log; its version of a lead wins.
+        Only new or changed leads are appended. Returns how many there were.
+        """
+        try:
+            # Stat first: a write that lands while reading triggers another import
+            stat = self.legacy_json.stat()
+            with open(self.legacy_json, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not import {self.legacy_json.name}: {e}")
+            return 0
+
+        changed = [
+            record for record in legacy
+            if (key := record_key(record)) and self.records.get(key) != record
+        ]
+        for record in changed:
+            self._index(record)
+        if not self.filepath.exists():
+            self.log.rewrite(list(self.records.values()))
+        else:
+            for record in changed:
+                self.log.append(record)
+            self.log.close()
+        self._mark_legacy_synced(stat)
+        if changed:
+            logger.info(f"Imported {len(changed)} leads from {self.legacy_json.name}")
+        return len(changed)
+
+    def _index(self, record: dict) -> Optional[str]:
+        key = record_key(record)
+        if not key:
+            return None
+        self.records[key] = record
+        name = normalize_name(record.get("name"))
+        if name:
+            self.by_name[name] = key
+        if record.get("google_place_id"):
+            self.by_place_id[record["google_place_id"]] = key
+        phone = normalize_phone(record.get("phone"))
+        if phone:
+            self.by_phone[phone] = key
+        return key
+
+    # -------------------------------------------
+    # Access
+    # -------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def values(self) -> list[dict]:
+        return list(self.records.values())
+
+    def find(
+        self,
+        name: Optional[str] = None,
+        place_id: Optional[str] = None,
+        phone: Optional[str] = None,
+    ) -> Optional[dict]:
+        """Look a lead up by Place ID, name or phone (first match wins)"""
+        for index, value in (
+            (self.by_place_id, place_id),
+            (self.by_name, normalize_name(name)),
+            (self.by_phone, normalize_phone(phone)),
+        ):
+            if value and value in index:
+                return self.records.get(index[value])
+        return None
+
+    # -------------------------------------------
+    # Writes
+    # -------------------------------------------
+
+    def put(self, record: dict) -> bool:
+        """Insert or update a lead with a single appended line"""
+        if not self._index(record):
+            return False
+        self.log.append(record)
+        self.maybe_compact()
+        return True
+
+    def maybe_compact(self) -> bool:
+        superseded = self.log.lines - len(self.records)
+        if (
+            superseded >= COMPACT_MIN_LINES
+            and self.log.lines >= self.compact_ratio * len(self.records)
+        ):
+            self.compact()
+            return True
+        return False
+
+    def compact(self) -> None:
+        """Rewrite the log with only the live version of each lead"""
+        before = self.log.lines
+        self.log.rewrite(list(self.records.values()))
+        logger.info(f"Compacted {self.filepath.name}: {before} -> {self.log.lines} lines")
+
+    def export_json(self, filepath: Optional[Path] = None, writer: Optional[BackgroundWriter] = None) -> Path:
+        """
+        Write the legacy JSON array (indent=2) atomically. With a writer the
+        dump happens on its thread and this returns immediately.
+        """
+        filepath = filepath or self.legacy_json
+        # Our own export must not look like an outside change on the next load
+        on_written = self._mark_legacy_synced if filepath == self.legacy_json else None
+        if writer:
+            writer.submit(filepath, self.values(), indent=2, on_written=on_written)
+        else:
+            written = write_json_atomic(filepath, self.values(), indent=2)
+            if on_written:
+                on_written(written)
+        return filepath
+
+    def close(self) -> None:
+        self.log.close()
+
+
+# ===========================================
+# STANDALONE EXECUTION
+# ===========================================
+
+if __name__ == "__main__":
+    import sys
+
+    source = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("discovered_businesses.jsonl")
+    target = Path(sys.argv[2]) if len(sys.argv) > 2 else source.with_suffix(".json")
+    store = JsonlLeadStore(source)
+    store.export_json(target)
+    print(f"Exported {len(store)} leads to {target}")
@@ -0,0 +1,477 @@
+"""
+Database - Local SQLite Implementation of schema.sql
+
+Mirrors the core tables of database/schema.sql (businesses, websites,
+jobs) and their indexes in a single SQLite file, keyed by
+`google_place_id`. Scraped records are kept whole in `raw_data`; the
+columns the pipeline filters and sorts on are copied out so queries such
+as "qualified leads in Villa Morra by score" use an index instead of
+scanning a JSON file.
+
+Set LEADS_DB=automation.db to make the scrapers, scorer, builder and
+exporters read and write through it instead of the JSON files.
+
+Usage:
+    python -m database.local_db import datos_definitivos_final.json
+    python -m database.local_db query --neighborhood "Villa Morra" --status qualified
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from database.blob_store import load_records
+from database.jsonl_store import normalize_name, normalize_phone
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================
+# CONSTANTS
+# ===========================================
+
+DB_ENV = "LEADS_DB"
+DEFAULT_DB_FILE = Path(__file__).parent.parent / "automation.db"
+
+# Differences from schema.sql: UUIDs are TEXT, JSONB/TEXT[] are JSON TEXT,
+# enums are TEXT, and `neighborhood` is a column because the scraper and
+# scorer both work at that level.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS businesses (
+    id                TEXT PRIMARY KEY,
+    google_place_id   TEXT UNIQUE,
+    name              TEXT NOT NULL,
+    normalized_name   TEXT,
+    primary_category  TEXT,
+    google_category   TEXT,
+    address           TEXT,
+    neighborhood      TEXT,
+    city              TEXT,
+    country           TEXT DEFAULT 'Paraguay',
+    latitude          REAL,
+    longitude         REAL,
+    phone             TEXT,
+    phone_normalized  TEXT,
+    email             TEXT,
+    rating            REAL,
+    review_count      INTEGER DEFAULT 0,
+    photo_count       INTEGER DEFAULT 0,
+    has_website       INTEGER DEFAULT 0,
+    existing_website  TEXT,
+    website_status    TEXT,
+    score             REAL DEFAULT 0,
+    score_breakdown   TEXT,
+    status            TEXT DEFAULT 'discovered',
+    source            TEXT DEFAULT 'google_maps',
+    raw_data          TEXT NOT NULL,
+    discovered_at     TEXT DEFAULT CURRENT_TIMESTAMP,
+    analyzed_at       TEXT,
+    last_updated_at   TEXT DEFAULT CURRENT_TIMESTAMP,
+    is_active         INTEGER DEFAULT 1
+);
+
+CREATE TABLE IF NOT EXISTS websites (
+    id                TEXT PRIMARY KEY,
+    business_id       TEXT NOT NULL REFERENCES businesses(id) ON DELETE CASCADE,
+    template_id       TEXT,
+    template_name     TEXT,
+    template_category TEXT,
+    preview_url       TEXT,
+    status            TEXT DEFAULT 'generating',
+    error_message     TEXT,
+    generation_time_ms INTEGER,
+    created_at        TEXT DEFAULT CURRENT_TIMESTAMP,
+    last_updated_at   TEXT DEFAULT CURRENT_TIMESTAMP,
+    version           INTEGER DEFAULT 1
+);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id                TEXT PRIMARY KEY,
+    job_type          TEXT NOT NULL,
+    job_name          TEXT,
+    input_data        TEXT,
+    status            TEXT DEFAULT 'pending',
+    progress          INTEGER DEFAULT 0,
+    output_data       TEXT,
+    error_message     TEXT,
+    started_at        TEXT,
+    completed_at      TEXT,
+    worker_id         TEXT,
+    created_at        TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at        TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_businesses_status ON businesses(status);
+CREATE INDEX IF NOT EXISTS idx_businesses_score ON businesses(score DESC);
+CREATE INDEX IF NOT EXISTS idx_businesses_city ON businesses(city);
+CREATE INDEX IF NOT EXISTS idx_businesses_neighborhood_score ON businesses(neighborhood, score DESC);
+CREATE INDEX IF NOT EXISTS idx_businesses_category ON businesses(primary_category);
+CREATE INDEX IF NOT EXISTS idx_businesses_discovered_at ON businesses(discovered_at DESC);
+CREATE INDEX IF NOT EXISTS idx_businesses_normalized_name ON businesses(normalized_name);
+CREATE INDEX IF NOT EXISTS idx_businesses_phone ON businesses(phone_normalized);
+CREATE INDEX IF NOT EXISTS idx_businesses_active ON businesses(is_active) WHERE is_active = 1;
+
+CREATE INDEX IF NOT EXISTS idx_websites_business ON websites(business_id);
+CREATE INDEX IF NOT EXISTS idx_websites_status ON websites(status);
+CREATE INDEX IF NOT EXISTS idx_websites_preview_url ON websites(preview_url);
+CREATE INDEX IF NOT EXISTS idx_websites_created ON websites(created_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_type ON jobs(job_type);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created_at DESC);
+"""
+
+# Columns copied out of a scraped record (raw_data keeps everything)
+BUSINESS_COLUMNS = (
+    "id", "google_place_id", "name", "normalized_name", "primary_category",
+    "google_category", "address", "neighborhood", "city", "latitude", "longitude",
+    "phone", "phone_normalized", "email", "rating", "review_count", "photo_count",
+    "has_website", "existing_website", "website_status", "raw_data", "last_updated_at",
+)
+
+# Scoring columns are owned by the scorer - a re-scrape must not reset them
+_UPSERT_BUSINESS = f"""
+    INSERT INTO businesses ({", ".join(BUSINESS_COLUMNS)})
+    VALUES ({", ".join("?" for _ in BUSINESS_COLUMNS)})
+    ON CONFLICT(google_place_id) DO UPDATE SET
+        {", ".join(f"{c} = excluded.{c}" for c in BUSINESS_COLUMNS if c not in ("id", "google_place_id"))}
+"""
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+def business_row(record: dict, business_id: Optional[str] = None) -> tuple:
+    """Column values for a scraped business dict, in BUSINESS_COLUMNS order"""
+    website = record.get("website_url") or record.get("existing_website")
+    return (
+        business_id or uuid.uuid4().hex,
+        # Records without a Place ID still need a stable unique key
+        record.get("google_place_id") or f"name:{normalize_name(record.get('name'))}",
+        record.get("name") or "",
+        normalize_name(record.get("name")),
+        record.get("discovered_category") or record.get("category"),
+        record.get("category"),
+        record.get("address"),
+        record.get("neighborhood"),
+        record.get("city"),
+        record.get("latitude"),
+        record.get("longitude"),
+        record.get("phone"),
+        normalize_phone(record.get("phone")) or None,
+        record.get("email"),
+        record.get("rating"),
+        record.get("review_count") or 0,
+        record.get("photo_count") or len(record.get("photo_urls") or []),
+        int(bool(record.get("has_website") or website)),
+        website,
+        record.get("website_status"),
+        json.dumps(record, ensure_ascii=False),
+        _now(),
+    )
+
+
+# ===========================================
+# DATABASE
+# ===========================================
+
+class LocalDatabase:
+    """SQLite mirror of the Postgres schema for single-machine use"""
+
+    def __init__(self, filepath: Path = DEFAULT_DB_FILE):
+        self.filepath = Path(filepath)
+        self.conn = sqlite3.connect(str(self.filepath))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM businesses").fetchone()[0]
+
+    # -------------------------------------------
+    # Businesses - writes
+    # -------------------------------------------
+
+    def upsert_business(self, record: dict) -> str:
+        """Insert or update one scraped business. Returns its id."""
+        row = business_row(record)
+        with self.conn:
+            self.conn.execute(_UPSERT_BUSINESS, row)
+        return self.conn.execute(
+            "SELECT id FROM businesses WHERE google_place_id = ?", (row[1],)
+        ).fetchone()["id"]
+
+    def bulk_upsert(self, records: Iterable[dict]) -> int:
+        """Insert or update many businesses in one transaction"""
+        rows = [business_row(record) for record in records if record.get("name")]
+        with self.conn:
+            self.conn.executemany(_UPSERT_BUSINESS, rows)
+        return len(rows)
+
+    def import_json(self, filepath: Path) -> int:
+        """Load a JSON array of scraped businesses (datos_definitivos*.json, leads.json, ...)"""
+        records = load_records(filepath)
+        count = self.bulk_upsert(records)
+        logger.info(f"Imported {count} businesses from {Path(filepath).name}")
+        return count
+
+    def update_analysis(self, business_id: str, score: float, breakdown: dict, status: str) -> bool:
+        """Store a scorer result. `business_id` may be the row id or the Place ID."""
+        return self.update_analyses([(business_id, score, breakdown, status)]) > 0
+
+    def update_analyses(self, rows: Iterable[tuple], chunk_size: int = 500) -> int:
+        """
+        Store many (business_id, score, breakdown, status) results: one
+        executemany per chunk, all inside a single transaction. Returns the
+        number of businesses updated.
+        """
+        sql = """
+            UPDATE businesses SET
+                score = ?, score_breakdown = ?, status = ?,
+                analyzed_at = ?, last_updated_at = ?
+            WHERE id = ? OR google_place_id = ?
+        """
+        updated = 0
+        chunk = []
+        with self.conn:
+            for business_id, score, breakdown, status in rows:
+                now = _now()
+                chunk.append((score, json.dumps(breakdown), status, now, now, business_id, business_id))
+                if len(chunk) >= chunk_size:
+                    updated += self.conn.executemany(sql, chunk).rowcount
+                    chunk = []
+            if chunk:
+                updated += self.conn.executemany(sql, chunk).rowcount
+        return updated
+
+    # -------------------------------------------
+    # Businesses - reads
+    # -------------------------------------------
+
+    @staticmethod
+    def _record(row: sqlite3.Row) -> dict:
+        """The scraped record plus the columns the pipeline adds"""
+        record = json.loads(row["raw_data"])
+        record["business_id"] = row["id"]
+        record["score"] = row["score"]
+        record["status"] = row["status"]
+        if row["score_breakdown"]:
+            record["score_breakdown"] = json.loads(row["score_breakdown"])
+        return record
+
+    def get_business(self, google_place_id: str) -> Optional[dict]:
+        row = self.conn.execute(
+            "SELECT * FROM businesses WHERE google_place_id = ? OR id = ?",
+            (google_place_id, google_place_id),
+        ).fetchone()
+        return self._record(row) if row else None
+
+    def find_by_name(self, name: str) -> Optional[dict]:
+        """Exact normalized name first, then a substring match"""
+        name = normalize_name(name)
+        row = self.conn.execute(
+            "SELECT * FROM businesses WHERE normalized_name = ? LIMIT 1", (name,)
+        ).fetchone() or self.conn.execute(
+            "SELECT * FROM businesses WHERE normalized_name LIKE ? ORDER BY rowid LIMIT 1", (f"%{name}%",)
+        ).fetchone()
+        return self._record(row) if row else None
+
+    def query_businesses(
+        self,
+        status: Optional[str] = None,
+        neighborhood: Optional[str] = None,
+        city: Optional[str] = None,
+        category: Optional[str] = None,
+        has_website: Optional[bool] = None,
+        min_score: Optional[float] = None,
+        order_by_score: bool = False,
+        limit: Optional[int] = None,
+    ) -> list[dict]:
+        """Active businesses matching every given filter"""
+        clauses, params = ["is_active = 1"], []
+        for column, value in (
+            ("status", status),
+            ("neighborhood", neighborhood),
+            ("city", city),
+            ("primary_category", category),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if has_website is not None:
+            clauses.append("has_website = ?")
+            params.append(int(has_website))
+        if min_score is not None:
+            clauses.append("score >= ?")
+            params.append(min_score)
+
+        sql = f"SELECT * FROM businesses WHERE {' AND '.join(clauses)}"
+        sql += " ORDER BY score DESC" if order_by_score else " ORDER BY rowid"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [self._record(row) for row in self.conn.execute(sql, params)]
+
+    def iter_businesses(self, status: Optional[str] = None, page_size: int = 1000) -> Iterator[dict]:
+        """
+        Active businesses (optionally with one status) in rowid order, one page
+        at a time, so large tables stream in bounded memory. Pages are keyed on
+        rowid, so updating rows between pages is safe.
+        """
+        clauses, params = ["is_active = 1", "rowid > ?"], [0]
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        sql = f"SELECT rowid AS _rowid, * FROM businesses WHERE {' AND '.join(clauses)} ORDER BY rowid LIMIT ?"
+        while True:
+            rows = self.conn.execute(sql, [*params, page_size]).fetchall()
+            for row in rows:
+                yield self._record(row)
+            if len(rows) < page_size:
+                return
+            params[0] = rows[-1]["_rowid"]
+
+    # -------------------------------------------
+    # Websites & jobs
+    # -------------------------------------------
+
+    def record_website(
+        self,
+        google_place_id: str,
+        preview_url: str,
+        template_id: Optional[str] = None,
+        status: str = "generated",
+    ) -> Optional[str]:
+        """Register a generated site; bumps the version if the business already had one"""
+        business = self.conn.execute(
+            "SELECT id FROM businesses WHERE google_place_id = ?", (google_place_id,)
+        ).fetchone()
+        if not business:
+            return None
+        version = self.conn.execute(
+            "SELECT COALESCE(MAX(version), 0) + 1 FROM websites WHERE business_id = ?", (business["id"],)
+        ).fetchone()[0]
+        website_id = uuid.uuid4().hex
+        with self.conn:
+            self.conn.execute(
+                """
+                INSERT INTO websites (id, business_id, template_id, preview_url, status, version)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (website_id, business["id"], template_id, preview_url, status, version),
+            )
+            self.conn.execute(
+                "UPDATE businesses SET status = 'generated', last_updated_at = ? WHERE id = ?",
+                (_now(), business["id"]),
+            )
+        return website_id
+
+    def create_job(self, job_type: str, input_data: Optional[dict] = None, job_name: Optional[str] = None) -> str:
+        job_id = uuid.uuid4().hex
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO jobs (id, job_type, job_name, input_data) VALUES (?, ?, ?, ?)",
+                (job_id, job_type, job_name, json.dumps(input_data or {})),
+            )
+        return job_id
+
+    def update_job(
+        self,
+        job_id: str,
+        status: str,
+        progress: Optional[int] = None,
+        output_data: Optional[dict] = None,
+        error_message: Optional[str] = None,
+    ) -> None:
+        now = _now()
+        with self.conn:
+            self.conn.execute(
+                """
+                UPDATE jobs SET
+                    status = ?,
+                    progress = COALESCE(?, progress),
+                    output_data = COALESCE(?, output_data),
+                    error_message = COALESCE(?, error_message),
+                    started_at = CASE WHEN ? = 'running' THEN COALESCE(started_at, ?) ELSE started_at END,
+                    completed_at = CASE WHEN ? IN ('completed', 'failed') THEN ? ELSE completed_at END,
+                    updated_at = ?
+                WHERE id = ?
+                """,
+                (
+                    status, progress,
+                    json.dumps(output_data) if output_data is not None else None,
+                    error_message, status, now, status, now, now, job_id,
+                ),
+            )
+
+
+# ===========================================
+# ENTRY POINT HELPERS
+# ===========================================
+
+def configured_database() -> Optional[LocalDatabase]:
+    """The database named by LEADS_DB, or None to keep using JSON files"""
+    path = os.environ.get(DB_ENV)
+    return LocalDatabase(Path(path)) if path else None
+
+
+def load_businesses(json_fallback: Path, **filters) -> list[dict]:
+    """Businesses from LEADS_DB when set, otherwise the given JSON file"""
+    db = configured_database()
+    if db is not None:
+        try:
+            return db.query_businesses(**filters)
+        finally:
+            db.close()
+    if not Path(json_fallback).exists():
+        return []
+    return load_records(json_fallback)
+
+
+# ===========================================
+# STANDALONE EXECUTION
+# ===========================================
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local SQLite business database")
+    parser.add_argument("--db", default=os.environ.get(DB_ENV, str(DEFAULT_DB_FILE)))
+    sub = parser.add_subparsers(dest="command", required=True)
+    import_parser = sub.add_parser("import", help="Upsert JSON arrays of scraped businesses")
+    import_parser.add_argument("files", nargs="+")
+    query_parser = sub.add_parser("query", help="List businesses by score")
+    query_parser.add_argument("--status")
+    query_parser.add_argument("--neighborhood")
+    query_parser.add_argument("--city")
+    query_parser.add_argument("--category")
+    query_parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    db = LocalDatabase(Path(args.db))
+    if args.command == "import":
+        for file in args.files:
+            db.import_json(Path(file))
+        print(f"{len(db)} businesses in {db.filepath.name}")
+    else:
+        for business in db.query_businesses(
+            status=args.status,
+            neighborhood=args.neighborhood,
+            city=args.city,
+            category=args.category,
+            order_by_score=True,
+            limit=args.limit,
+        ):
+            print(f"{business['score']:6.1f}  {business['status']:<14} {business['name']}")
+    db.close()
@@ -0,0 +1,314 @@
+"""
+Database - Rating & Review History per Place
+
+Re-scrapes overwrite rating, review_count, rating_distribution and
+popular_times, so growth was invisible. Every save now appends one
+fixed-width observation per place to a binary log:
+
+    place_history.bin        48-byte rows (struct OBSERVATION, little endian)
+    place_history.keys.jsonl {"id", "key", "category"} per place
+
+Every row carries a stable place id (64-bit hash of the place key), so
+several processes can append to the same files: identity never depends on
+line order, duplicate key lines are harmless and a lost key line only
+hides that place's name. Appends hold an exclusive file lock where fcntl
+is available.
+
+On load the rows are read into typed `array` columns and indexed by place,
+so "review velocity over the last 90 days" is a couple of array lookups
+per place - no historical JSON dumps involved. A torn last row (crash
+mid-append) is ignored.
+
+Places the discovery loop already knows are not opened again; their
+observations come from the result card and carry only rating and
+review_count (the other columns are 0), which is all velocity needs.
+
+Usage:
+    python -m database.place_history record datos_definitivos.json
+    python -m database.place_history velocity --days 90 [--category Restaurante]
+"""
+
+import hashlib
+import json
+import logging
+import os
+import statistics
+import struct
+import time
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Optional
+
+# Serializes appends of concurrent processes; Unix only
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+from database.blob_store import load_records
+from database.jsonl_store import JsonlLog, record_key
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================
+# CONSTANTS
+# ===========================================
+
+DEFAULT_HISTORY_FILE = Path(__file__).parent.parent / "place_history.bin"
+
+# place id, observed_at (epoch s), rating, review_count, stars 5..1, photo_count, avg busyness
+OBSERVATION = struct.Struct("<QIfI5IIf")
+COLUMNS = ("place", "observed_at", "rating", "review_count",
+           "stars_5", "stars_4", "stars_3", "stars_2", "stars_1",
+           "photo_count", "busyness")
+TYPECODES = ("Q", "I", "f", "I", "I", "I", "I", "I", "I", "I", "f")
+
+VELOCITY_DAYS = 90
+MIN_SPAN_DAYS = 7              # Fewer days between observations say nothing about growth
+MIN_OBSERVATION_INTERVAL = 3600  # An unchanged place is recorded at most once an hour
+DAY = 86400
+
+
+# ===========================================
+# HELPERS
+# ===========================================
+
+def place_id(key: str) -> int:
+    """Stable 64-bit id of a place key, the same in every process"""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+@contextmanager
+def _exclusive(f):
+    if HAS_FCNTL:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    try:
+        yield f
+    finally:
+        if HAS_FCNTL:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _busyness(popular_times) -> float:
+    """Average busyness over every hour of popular_times (0 when unknown)"""
+    values = [
+        value for hours in (popular_times or {}).values() if isinstance(hours, dict)
+        for value in hours.values() if isinstance(value, (int, float))
+    ]
+    return sum(values) / len(values) if values else 0.0
+
+
+def _int(value) -> int:
+    try:
+        return max(0, int(value or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def observation(place: int, record: dict, observed_at: int) -> tuple:
+    """Row for OBSERVATION; `place` is place_id() of the record's key"""
+    distribution = record.get("rating_distribution") or {}
+    return (
+        place,
+        observed_at,
+        float(record.get("rating") or 0.0),
+        _int(record.get("review_count")),
+        *(_int(distribution.get(str(stars))) for stars in (5, 4, 3, 2, 1)),
+        _int(record.get("photo_count") or len(record.get("photo_urls") or [])),
+        _busyness(record.get("popular_times")),
+    )
+
+
+# ===========================================
+# HISTORY STORE
+# ===========================================
+
+class PlaceHistory:
+    """Append-only observation log with columnar, per-place indexed reads"""
+
+    def __init__(self, filepath: Path = DEFAULT_HISTORY_FILE):
+        self.filepath = Path(filepath)
+        self.keys_log = JsonlLog(self.filepath.with_suffix(".keys.jsonl"))
+        self.keys: dict[int, str] = {}                   # place id -> place key
+        self.categories: dict[int, Optional[str]] = {}   # place id -> category
+        self.columns: dict[str, array] = {name: array(code) for name, code in zip(COLUMNS, TYPECODES)}
+        self.rows_by_place: dict[int, list[int]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        for entry in self.keys_log.read():
+            if "id" not in entry or "key" not in entry:
+                continue
+            self.keys[entry["id"]] = entry["key"]
+            self.categories[entry["id"]] = entry.get("category")
+
+        if not self.filepath.exists():
+            return
+        data = self.filepath.read_bytes()
+        usable = len(data) - len(data) % OBSERVATION.size
+        if usable != len(data):
+            logger.warning(f"Ignoring a torn observation at the end of {self.filepath.name}")
+        for row in OBSERVATION.iter_unpack(memoryview(data)[:usable]):
+            self._add_row(row)
+
+    def _add_row(self, row: tuple) -> None:
+        position = len(self.columns["place"])
+        for name, value in zip(COLUMNS, row):
+            self.columns[name].append(value)
+        self.rows_by_place.setdefault(row[0], []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.columns["place"])
+
+    # -------------------------------------------
+    # Writes
+    # -------------------------------------------
+
+    def _place(self, key: str, category: Optional[str]) -> int:
+        place = place_id(key)
+        if place not in self.keys:
+            self.keys_log.append({"id": place, "key": key, "category": category})
+            self.keys[place] = key
+            self.categories[place] = category
+        return place
+
+    def _unchanged(self, row: tuple) -> bool:
+        rows = self.rows_by_place.get(row[0])
+        if not rows:
+            return False
+        last = rows[-1]
+        recent = row[1] - self.columns["observed_at"][last] < MIN_OBSERVATION_INTERVAL
+        same = all(
+            self.columns[name][last] == value
+            for name, value in zip(COLUMNS[2:], OBSERVATION.unpack(OBSERVATION.pack(*row))[2:])
+        )
+        return recent and same
+
+    def record(self, records: Iterable[dict], observed_at: Optional[float] = None) -> int:
+        """Append one observation per place (unchanged repeats within the hour are skipped)"""
+        observed_at = int(observed_at if observed_at is not None else time.time())
+        rows = []
+        for record in records:
+            key = record_key(record)
+            if not key:
+                continue
+            category = record.get("discovered_category") or record.get("category")
+            row = observation(self._place(key, category), record, observed_at)
+            if not self._unchanged(row):
+                rows.append(row)
+
+        if rows:
+            with open(self.filepath, "ab") as f, _exclusive(f):
+                # Drop a torn row first, or every later row would be misaligned.
+                # Safe under the lock: no other append can be in flight.
+                size = os.fstat(f.fileno()).st_size
+                if size % OBSERVATION.size:
+                    os.truncate(self.filepath, size - size % OBSERVATION.size)
+                f.write(b"".join(OBSERVATION.pack(*row) for row in rows))
+                f.flush()
+                os.fsync(f.fileno())
+            for row in rows:
+                # Stored values are float32; keep memory and disk identical
+                self._add_row(OBSERVATION.unpack(OBSERVATION.pack(*row)))
+        self.keys_log.close()
+        return len(rows)
+
+    # -------------------------------------------
+    # Queries
+    # -------------------------------------------
+
+    def series(self, key: str, column: str = "review_count") -> list[tuple[int, float]]:
+        """(observed_at, value) pairs of one place, oldest first"""
+        rows = self.rows_by_place.get(place_id(key), [])
+        observed_at, values = self.columns["observed_at"], self.columns[column]
+        return [(observed_at[i], values[i]) for i in rows]
+
+    def velocity(self, key: str, days: int = VELOCITY_DAYS, now: Optional[float] = None) -> Optional[float]:
+        """
+        New reviews per `days`, from the oldest observation inside the window
+        to the newest. None when the observations span less than MIN_SPAN_DAYS.
+        """
+        rows = self.rows_by_place.get(place_id(key))
+        if not rows:
+            return None
+        observed_at, counts = self.columns["observed_at"], self.columns["review_count"]
+        newest = rows[-1]
+        window_start = (now if now is not None else observed_at[newest]) - days * DAY
+        oldest = next((i for i in rows if observed_at[i] >= window_start), newest)
+        span = (observed_at[newest] - observed_at[oldest]) / DAY
+        if span < MIN_SPAN_DAYS:
+            return None
+        gained = max(0, counts[newest] - counts[oldest])
+        return gained * days / span
+
+    def category_velocity(self, category: str, days: int = VELOCITY_DAYS) -> Optional[float]:
+        """Median velocity of the places of one category (None without data)"""
+        velocities = [
+            v for place, key in self.keys.items()
+            if self.categories.get(place) == category
+            and (v := self.velocity(key, days)) is not None
+        ]
+        return statistics.median(velocities) if velocities else None
+
+    def velocities_by_category(self, days: int = VELOCITY_DAYS) -> dict[str, dict]:
+        groups: dict[str, list[float]] = {}
+        for place, key in self.keys.items():
+            v = self.velocity(key, days)
+            if v is not None:
+                groups.setdefault(self.categories.get(place) or "unknown", []).append(v)
+        return {
+            category: {"places": len(values), "median": statistics.median(values), "max": max(values)}
+            for category, values in sorted(groups.items())
+        }
+
+
+def open_history(filepath: Path = DEFAULT_HISTORY_FILE) -> Optional[PlaceHistory]:
+    """The history store, or None when nothing was recorded yet"""
+    return PlaceHistory(filepath) if Path(filepath).exists() else None
+
+
+def record_observations(records: Iterable[dict], filepath: Path = DEFAULT_HISTORY_FILE) -> int:
+    """Append the current rating/review numbers of `records` to the history"""
+    try:
+        added = PlaceHistory(filepath).record(records)
+        logger.info(f"Recorded {added} place observations")
+        return added
+    except OSError as e:
+        logger.error(f"Could not record place history: {e}")
+        return 0
+
+
+# ===========================================
+# STANDALONE EXECUTION
+# ===========================================
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rating & review history per place")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY_FILE)
+    sub = parser.add_subparsers(dest="command", required=True)
+    record_parser = sub.add_parser("record", help="Append observations from JSON datasets")
+    record_parser.add_argument("files", nargs="+", type=Path)
+    velocity_parser = sub.add_parser("velocity", help="Review velocity per category (or one category's places)")
+    velocity_parser.add_argument("--days", type=int, default=VELOCITY_DAYS)
+    velocity_parser.add_argument("--category")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if args.command == "record":
+        for path in args.files:
+            print(f"{path}: {record_observations(load_records(path), args.history)} observations")
+    else:
+        history = PlaceHistory(args.history)
+        if args.category:
+            rows = {
+                key: history.velocity(key, args.days)
+                for place, key in history.keys.items() if history.categories.get(place) == args.category
+            }
+            print(json.dumps({k: v for k, v in rows.items() if v is not None}, indent=2, ensure_ascii=False))
+        else:
+            print(json.dumps(history.velocities_by_category(args.days), indent=2, ensure_ascii=False))
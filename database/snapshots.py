@@ -0,0 +1,300 @@
+"""
+Database - Versioned Dataset Snapshots and Incremental Diffs
+
+Every run of the scraper rewrites one big JSON array, so "what changed
+since last time?" used to mean loading and comparing two full dumps.
+A snapshot manifest records, per place, a content hash, a short hash per
+field and the values of the fields people ask about (rating, reviews,
+website, hours). Places are grouped into buckets by key hash and every
+bucket carries a hash of its members, so a diff skips unchanged buckets
+and only compares the places of buckets that differ.
+
+Field hashes match blob references (database/blob_store.py), so packed and
+inline copies of the same record hash alike.
+
+`take` also writes the added and changed places since the previous
+snapshot to <dataset>.delta.json, so scoring and site generation can work
+on the delta only.
+
+Usage:
+    python -m database.snapshots take datos_definitivos.json   # -> snapshots/datos_definitivos_<stamp>.manifest.json
+    python -m database.snapshots diff snapshots/a.manifest.json snapshots/b.manifest.json
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from database.background_writer import write_json_atomic
+from database.blob_store import REF_KEY, canonical_bytes, is_ref, load_records
+from database.jsonl_store import record_key
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================
+# CONSTANTS
+# ===========================================
+
+DEFAULT_SNAPSHOT_DIR = Path(__file__).parent.parent / "snapshots"
+MANIFEST_SUFFIX = ".manifest.json"
+MANIFEST_VERSION = 1
+
+BUCKET_PREFIX = 2          # Hex digits of the key hash per bucket (256 buckets)
+FIELD_HASH_LENGTH = 12
+
+# Bookkeeping that changes on every scrape without the place changing
+VOLATILE_FIELDS = {"scraped_at", "entity_id", "is_open_now", "open_status_text"}
+
+# Fields whose old and new values are kept in the manifest for change summaries
+SUMMARY_FIELDS = ("rating", "review_count", "has_website", "website_url", "website_status", "opening_hours")
+
+
+# ===========================================
+# HASHING
+# ===========================================
+
+def field_hash(value: Any) -> str:
+    """SHA-256 of the canonical JSON (a blob reference already is that hash)"""
+    if is_ref(value):
+        return value[REF_KEY][:FIELD_HASH_LENGTH]
+    return hashlib.sha256(canonical_bytes(value)).hexdigest()[:FIELD_HASH_LENGTH]
+
+
+def _raw_items(record: dict) -> Iterable[tuple]:
+    # LazyRecord.raw() keeps blob references unresolved; hashing never needs the payload
+    raw = record.raw() if hasattr(record, "raw") else record
+    return raw.items()
+
+
+def place_entry(record: dict) -> dict:
+    """Manifest entry: record hash, per-field hashes and summary values"""
+    fields = {
+        name: field_hash(value)
+        for name, value in sorted(_raw_items(record))
+        if name not in VOLATILE_FIELDS and value not in (None, "", [], {})
+    }
+    digest = hashlib.sha256(canonical_bytes(fields)).hexdigest()[:FIELD_HASH_LENGTH]
+    return {
+        "hash": digest,
+        "fields": fields,
+        "values": {name: record.get(name) for name in SUMMARY_FIELDS if name in fields},
+    }
+
+
+def bucket_of(key: str) -> str:
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:BUCKET_PREFIX]
+
+
+# ===========================================
+# MANIFEST
+# ===========================================
+
+@dataclass
+class Manifest:
+    """Content hashes of every place in one dataset version"""
+    created_at: str
+    source: str
+    places: dict[str, dict]                               # key -> place_entry
+    buckets: dict[str, str] = field(default_factory=dict)  # bucket -> hash of its members
+    members: dict[str, list] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict], source: str = "") -> "Manifest":
+        places = {}
+        for record in records:
+            key = record_key(record)
+            if key:
+                places[key] = place_entry(record)
+        manifest = cls(created_at=datetime.now().isoformat(), source=str(source), places=places)
+        manifest._index()
+        return manifest
+
+    def _index(self) -> None:
+        members: dict[str, list] = {}
+        for key in self.places:
+            members.setdefault(bucket_of(key), []).append(key)
+        self.members = {bucket: sorted(keys) for bucket, keys in members.items()}
+        self.buckets = {
+            bucket: hashlib.sha256(
+                "".join(f"{key}\0{self.places[key]['hash']}\n" for key in keys).encode("utf-8")
+            ).hexdigest()[:FIELD_HASH_LENGTH]
+            for bucket, keys in self.members.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def save(self, filepath: Path) -> Path:
+        write_json_atomic(filepath, {
+            "version": MANIFEST_VERSION,
+            "created_at": self.created_at,
+            "source": self.source,
+            "count": len(self.places),
+            "buckets": self.buckets,
+            "places": self.places,
+        })
+        return filepath
+
+    @classmethod
+    def load(cls, filepath: Path) -> "Manifest":
+        with open(filepath, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        manifest = cls(created_at=data["created_at"], source=data.get("source", ""), places=data["places"])
+        manifest._index()
+        return manifest
+
+
+# ===========================================
+# DIFF
+# ===========================================
+
+@dataclass
+class PlaceChange:
+    key: str
+    fields: list[str]                                         # Every changed field
+    values: dict[str, tuple] = field(default_factory=dict)   # SUMMARY_FIELDS: (old, new)
+
+
+@dataclass
+class SnapshotDiff:
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: list[PlaceChange] = field(default_factory=list)
+    buckets_compared: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def delta_keys(self) -> set[str]:
+        """Places downstream stages need to (re)process"""
+        return set(self.added) | {change.key for change in self.changed}
+
+    def field_summary(self) -> dict[str, int]:
+        """How many places changed each field, most frequent first"""
+        counts: dict[str, int] = {}
+        for change in self.changed:
+            for name in change.fields:
+                counts[name] = counts.get(name, 0) + 1
+        return dict(sorted(counts.items(), key=lambda item: -item[1]))
+
+    def to_dict(self) -> dict:
+        return {
+            "added": self.added,
+            "removed": self.removed,
+            "changed": [
+                {"key": c.key, "fields": c.fields, "values": {k: list(v) for k, v in c.values.items()}}
+                for c in self.changed
+            ],
+            "field_summary": self.field_summary(),
+        }
+
+    def format(self) -> str:
+        lines = [f"+{len(self.added)} added, -{len(self.removed)} removed, ~{len(self.changed)} changed"]
+        for name, count in self.field_summary().items():
+            lines.append(f"   {name}: {count}")
+        return "\n".join(lines)
+
+
+def diff(old: Manifest, new: Manifest) -> SnapshotDiff:
+    """Added, removed and changed places; only buckets whose hash differs are opened"""
+    result = SnapshotDiff()
+    for bucket in sorted(old.buckets.keys() | new.buckets.keys()):
+        if old.buckets.get(bucket) == new.buckets.get(bucket):
+            continue
+        result.buckets_compared += 1
+        old_keys = set(old.members.get(bucket, ()))
+        new_keys = set(new.members.get(bucket, ()))
+        result.added.extend(sorted(new_keys - old_keys))
+        result.removed.extend(sorted(old_keys - new_keys))
+        for key in sorted(old_keys & new_keys):
+            before, after = old.places[key], new.places[key]
+            if before["hash"] == after["hash"]:
+                continue
+            names = sorted(
+                name for name in before["fields"].keys() | after["fields"].keys()
+                if before["fields"].get(name) != after["fields"].get(name)
+            )
+            values = {
+                name: (before["values"].get(name), after["values"].get(name))
+                for name in SUMMARY_FIELDS if name in names
+            }
+            result.changed.append(PlaceChange(key, names, values))
+    return result
+
+
+# ===========================================
+# SNAPSHOT DIRECTORY
+# ===========================================
+
+def snapshot_path(source: Path, snapshot_dir: Path = DEFAULT_SNAPSHOT_DIR, stamp: Optional[str] = None) -> Path:
+    stamp = stamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    return Path(snapshot_dir) / f"{Path(source).stem}_{stamp}{MANIFEST_SUFFIX}"
+
+
+def latest_manifest(source: Path, snapshot_dir: Path = DEFAULT_SNAPSHOT_DIR) -> Optional[Path]:
+    """Newest manifest of a dataset file (timestamps sort by name)"""
+    paths = sorted(Path(snapshot_dir).glob(f"{Path(source).stem}_*{MANIFEST_SUFFIX}"))
+    return paths[-1] if paths else None
+
+
+def delta_records(records: Iterable[dict], changes: SnapshotDiff) -> list[dict]:
+    """The added and changed places of a diff, as full records"""
+    keys = changes.delta_keys()
+    return [record for record in records if record_key(record) in keys]
+
+
+def take_snapshot(
+    records: list[dict],
+    source: Path,
+    snapshot_dir: Path = DEFAULT_SNAPSHOT_DIR,
+) -> tuple[Path, SnapshotDiff]:
+    """
+    Save a manifest of `records` (the contents of `source`), diff it against
+    the previous snapshot of the same file and write the delta records to
+    <source>.delta.json. The first snapshot counts every place as added.
+    """
+    source = Path(source)
+    Path(snapshot_dir).mkdir(parents=True, exist_ok=True)
+    previous = latest_manifest(source, snapshot_dir)
+    manifest = Manifest.from_records(records, str(source))
+    if previous is not None:
+        changes = diff(Manifest.load(previous), manifest)
+    else:
+        changes = SnapshotDiff(added=sorted(manifest.places))
+    path = manifest.save(snapshot_path(source, snapshot_dir))
+    write_json_atomic(source.with_suffix(".delta.json"), delta_records(records, changes), indent=2)
+    return path, changes
+
+
+# ===========================================
+# STANDALONE EXECUTION
+# ===========================================
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Dataset snapshot manifests and diffs")
+    parser.add_argument("--dir", type=Path, default=DEFAULT_SNAPSHOT_DIR, help="Snapshot directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    take_parser = sub.add_parser("take", help="Snapshot a dataset file and diff it against the previous one")
+    take_parser.add_argument("dataset", type=Path)
+    diff_parser = sub.add_parser("diff", help="Diff two manifests")
+    diff_parser.add_argument("old", type=Path)
+    diff_parser.add_argument("new", type=Path)
+    diff_parser.add_argument("--json", action="store_true", help="Print the full diff as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if args.command == "take":
+        path, changes = take_snapshot(load_records(args.dataset), args.dataset, args.dir)
+        print(f"Snapshot: {path}")
+        print(changes.format())
+        print(f"Delta: {len(changes.delta_keys())} places -> {args.dataset.with_suffix('.delta.json')}")
+    else:
+        changes = diff(Manifest.load(args.old), Manifest.load(args.new))
+        print(json.dumps(changes.to_dict(), indent=2, ensure_ascii=False) if args.json else changes.format())
@@ -0,0 +1,338 @@
+"""
+Database - Shared SQLite Store for Concurrent Scrapers
+
+Several run_discovery.py / scrape_full_dataset.py processes can share one
+SQLite file in WAL mode: readers never block the writer, and each write is
+a short `BEGIN IMMEDIATE` transaction, so processes queue behind each
+other instead of overwriting each other's JSON snapshot.
+
+    SqliteLeadStore   - leads upserted by Place ID (same interface as JsonlLeadStore)
+    SqliteSearchLog   - search events plus leases, so two processes never
+                        run the same search at the same time
+
+Enable in run_discovery.py with DISCOVERY_STORE=sqlite.
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from database.background_writer import BackgroundWriter, write_json_atomic
+from database.jsonl_store import normalize_name, normalize_phone, record_key
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================
+# CONSTANTS
+# ===========================================
+
+DEFAULT_DB_FILE = Path(__file__).parent.parent / "discovery.db"
+
+BUSY_TIMEOUT_MS = 30000    # Wait this long for another process's write lock
+SEARCH_LEASE = 1800.0      # Seconds a claimed search stays reserved (crashed owners expire)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    key         TEXT PRIMARY KEY,
+    place_id    TEXT,
+    name_norm   TEXT,
+    phone_norm  TEXT,
+    data        TEXT NOT NULL,
+    updated_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_leads_place_id ON leads(place_id);
+CREATE INDEX IF NOT EXISTS idx_leads_name ON leads(name_norm);
+CREATE INDEX IF NOT EXISTS idx_leads_phone ON leads(phone_norm);
+
+CREATE TABLE IF NOT EXISTS searches (
+    key          TEXT PRIMARY KEY,
+    status       TEXT NOT NULL,          -- claimed | completed | failed
+    owner        TEXT,
+    lease_until  REAL,
+    entry        TEXT,                   -- retry queue entry (JSON) for failed searches
+    updated_at   REAL NOT NULL
+);
+"""
+
+
+def connect(filepath: Path = DEFAULT_DB_FILE) -> sqlite3.Connection:
+    """Open the shared database in WAL mode (autocommit; writes use transaction())"""
+    conn = sqlite3.connect(str(filepath), timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints; WAL keeps it consistent
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Take the write lock up front so read-then-write steps cannot interleave"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+# ===========================================
+# LEAD STORE
+# ===========================================
+
+class SqliteLeadStore:
+    """
+    Leads keyed by Place ID (or name) in a shared SQLite file.
+
+    Every `put()` is an upsert committed immediately, so other processes
+    see it on their next lookup and nothing is lost when two processes
+    write at the same time.
+    """
+
+    def __init__(
+        self,
+        filepath: Path = DEFAULT_DB_FILE,
+        legacy_json: Optional[Path] = None,
+        conn: Optional[sqlite3.Connection] = None,
+    ):
+        self.filepath = filepath
+        self.legacy_json = legacy_json
+        self.conn = conn or connect(filepath)
+
+    def _upsert(self, record: dict) -> bool:
+        key = record_key(record)
+        if not key:
+            return False
+        self.conn.execute(
+            """
+            INSERT INTO leads (key, place_id, name_norm, phone_norm, data, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                place_id = excluded.place_id,
+                name_norm = excluded.name_norm,
+                phone_norm = excluded.phone_norm,
+                data = excluded.data,
+                updated_at = excluded.updated_at
+            """,
+            (
+                key,
+                record.get("google_place_id"),
+                normalize_name(record.get("name")) or None,
+                normalize_phone(record.get("phone")) or None,
+                json.dumps(record, ensure_ascii=False),
+                time.time(),
+            ),
+        )
+        return True
+
+    # -------------------------------------------
+    # Access
+    # -------------------------------------------
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
+
+    def values(self) -> list[dict]:
+        return [json.loads(row["data"]) for row in self.conn.execute("SELECT data FROM leads ORDER BY rowid")]
+
+    def find(
+        self,
+        name: Optional[str] = None,
+        place_id: Optional[str] = None,
+        phone: Optional[str] = None,
+    ) -> Optional[dict]:
+        """Look a lead up by Place ID, name or phone (first match wins)"""
+        for column, value in (
+            ("place_id", place_id),
+            ("name_norm", normalize_name(name)),
+            ("phone_norm", normalize_phone(phone)),
+        ):
+            if not value:
+                continue
+            row = self.conn.execute(f"SELECT data FROM leads WHERE {column} = ? LIMIT 1", (value,)).fetchone()
+            if row:
+                return json.loads(row["data"])
+        return None
+
+    # -------------------------------------------
+    # Writes
+    # -------------------------------------------
+
+    def put(self, record: dict) -> bool:
+        """Insert or update a lead (by Place ID, else name)"""
+        with transaction(self.conn):
+            return self._upsert(record)
+
+    def put_many(self, records: list[dict]) -> int:
+        """Upsert a batch in one transaction"""
+        with transaction(self.conn):
+            return sum(self._upsert(record) for record in records)
+
+    def compact(self) -> None:
+        """Fold the WAL back into the main file"""
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def export_json(self, filepath: Optional[Path] = None, writer: Optional[BackgroundWriter] = None) -> Path:
+        """Write every process's leads as the legacy JSON array (indent=2)"""
+        filepath = filepath or self.legacy_json
+        if writer:
+            writer.submit(filepath, self.values(), indent=2)
+        else:
+            write_json_atomic(filepath, self.values(), indent=2)
+        return filepath
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+# ===========================================
+# SEARCH LOG
+# ===========================================
+
+class SqliteSearchLog:
+    """
+    Search history shared between processes.
+
+    Speaks the same event format as the JSONL search log
+    ({"event": "completed" | "failed", "key", "entry"}) and adds leases:
+    `claim()` reserves a search for one owner until it is completed, failed
+    or its lease expires.
+    """
+
+    def __init__(
+        self,
+        filepath: Path = DEFAULT_DB_FILE,
+        owner: str = "",
+        lease: float = SEARCH_LEASE,
+        conn: Optional[sqlite3.Connection] = None,
+    ):
+        self.filepath = filepath
+        self.owner = owner
+        self.lease = lease
+        self.conn = conn or connect(filepath)
+
+    def read(self) -> Iterator[dict]:
+        """
+        Completed and failed searches. A retry whose claim expired (its
+        process died mid-search) reads as the failure it was retrying, so
+        its attempt count and backoff survive the crash.
+        """
+        rows = self.conn.execute(
+            """
+            SELECT key, status, entry FROM searches
+            WHERE status != 'claimed'
+               OR (entry IS NOT NULL AND COALESCE(lease_until, 0) <= ?)
+            """,
+            (time.time(),),
+        )
+        for row in rows:
+            status = "failed" if row["status"] == "claimed" else row["status"]
+            event = {"event": status, "key": row["key"]}
+            if status == "failed":
+                event["entry"] = json.loads(row["entry"])
+            yield event
+
+    def append(self, event: dict) -> None:
+        """Record a completion or failure (and release our claim)"""
+        entry = event.get("entry")
+        with transaction(self.conn):
+            self.conn.execute(
+                """
+                INSERT INTO searches (key, status, owner, lease_until, entry, updated_at)
+                VALUES (?, ?, ?, NULL, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    status = excluded.status,
+                    owner = excluded.owner,
+                    lease_until = NULL,
+                    entry = excluded.entry,
+                    updated_at = excluded.updated_at
+                WHERE searches.status != 'completed'
+                """,
+                (
+                    event["key"],
+                    event["event"],
+                    self.owner,
+                    json.dumps(entry, ensure_ascii=False) if entry is not None else None,
+                    time.time(),
+                ),
+            )
+
+    def rewrite(self, events: list[dict]) -> None:
+        """
+        Only fills in searches the table has never seen - rows are updated in
+        place, and replaying this process's view would overwrite newer
+        results from other processes.
+        """
+        now = time.time()
+        with transaction(self.conn):
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO searches (key, status, entry, updated_at) VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        event["key"],
+                        event["event"],
+                        json.dumps(event["entry"], ensure_ascii=False) if "entry" in event else None,
+                        now,
+                    )
+                    for event in events
+                ],
+            )
+
+    def claim(self, key: str) -> Optional[str]:
+        """
+        Reserve a search for this owner.
+
+        Returns None when claimed, otherwise why not: "completed" or "claimed"
+        (another live process holds the lease).
+        """
+        now = time.time()
+        with transaction(self.conn):
+            row = self.conn.execute(
+                "SELECT status, owner, lease_until FROM searches WHERE key = ?", (key,)
+            ).fetchone()
+            if row and row["status"] == "completed":
+                return "completed"
+            if (
+                row and row["status"] == "claimed"
+                and row["owner"] != self.owner
+                and (row["lease_until"] or 0) > now
+            ):
+                return "claimed"
+            self.conn.execute(
+                """
+                INSERT INTO searches (key, status, owner, lease_until, updated_at)
+                VALUES (?, 'claimed', ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    status = 'claimed',
+                    owner = excluded.owner,
+                    lease_until = excluded.lease_until,
+                    updated_at = excluded.updated_at
+                """,
+                (key, self.owner, now + self.lease, now),
+            )
+        return None
+
+    def release(self, key: str) -> None:
+        """Give up a claim without a result (a queued retry keeps its entry)"""
+        with transaction(self.conn):
+            self.conn.execute(
+                """
+                UPDATE searches SET status = 'failed', owner = NULL, lease_until = NULL
+                WHERE key = ? AND status = 'claimed' AND owner = ? AND entry IS NOT NULL
+                """,
+                (key, self.owner),
+            )
+            self.conn.execute(
+                "DELETE FROM searches WHERE key = ? AND status = 'claimed' AND owner = ?",
+                (key, self.owner),
+            )
+
+    def close(self) -> None:
+        self.conn.close()
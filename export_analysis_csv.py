@@ -4,18 +4,15 @@ Export businesses to CSV for data analysis.
 Includes computed fields to help identify the best business opportunities.
 """
 
-import json
 import csv
 from pathlib import Path
 from datetime import datetime
 
+from database.local_db import load_businesses as load_from_store
+
 def load_businesses():
-    """Load businesses from JSON file"""
-    json_path = Path("datos_definitivos_final.json")
-    if json_path.exists():
-        with open(json_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return []
+    """Load businesses from the JSON file (or the LEADS_DB database)"""
+    return load_from_store(Path("datos_definitivos_final.json"))
 
 def extract_analysis_data(business: dict, index: int) -> dict:
     """Extract all relevant fields for analysis"""
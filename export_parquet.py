@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Export businesses to a columnar Parquet dataset for notebooks and dashboards.
+
+Unlike the CSV exports, nested fields keep their types: reviews are a list
+of structs, popular times a map of day -> hour -> busyness, histograms and
+topic counts are maps, attribute lists are lists of strings.
+
+Output (default: ./parquet):
+    businesses/city=<city>/category=<category>/part-*.parquet
+    analysis.parquet      - the flat table of export_analysis_csv.py
+
+Records are streamed: every FLUSH_ROWS rows the buffered businesses are
+appended as new files to their partitions and the analysis rows as a new
+row group, so memory stays bounded however large the input is.
+
+Usage:
+    python export_parquet.py                              # datos_definitivos_final.json (or LEADS_DB)
+    python export_parquet.py datos_definitivos.json discovered_businesses.jsonl
+    python export_parquet.py leads.json --output parquet_leads
+
+Reading:
+    pd.read_parquet("parquet/analysis.parquet", columns=["name", "overall_quality"])
+    pd.read_parquet("parquet/businesses", filters=[("city", "=", "Asunción")])
+"""
+
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from database.blob_store import resolve_records
+from database.jsonl_store import JsonlLog
+from database.local_db import load_businesses
+from export_analysis_csv import extract_analysis_data
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+DEFAULT_INPUT = Path("datos_definitivos_final.json")
+DEFAULT_OUTPUT = Path("parquet")
+FLUSH_ROWS = 5000                 # Buffered businesses per write
+PARTITION_COLUMNS = ["city", "category"]
+COMPRESSION = "zstd"
+MISSING_PARTITION = "unknown"     # Partition value for records without city/category
+ANALYSIS_INT_COLUMNS = {"price_level"}  # Often empty in the first batch, numeric later
+
+STRING_LIST = pa.list_(pa.string())
+COUNT_MAP = pa.map_(pa.string(), pa.int64())
+
+REVIEW = pa.struct([
+    ("review_id", pa.string()),
+    ("author", pa.string()),
+    ("author_avatar", pa.string()),
+    ("author_profile_url", pa.string()),
+    ("is_local_guide", pa.bool_()),
+    ("author_reviews_count", pa.int64()),
+    ("author_photos_count", pa.int64()),
+    ("rating", pa.float64()),
+    ("date", pa.string()),
+    ("text", pa.string()),
+    ("photos", STRING_LIST),
+])
+
+CUSTOMER_UPDATE = pa.struct([
+    ("text", pa.string()),
+    ("date", pa.string()),
+])
+
+# ScrapedBusiness.to_dict() with real types (plus a few fields of older dumps)
+BUSINESS_SCHEMA = pa.schema([
+    ("google_place_id", pa.string()),
+    ("name", pa.string()),
+    ("city", pa.string()),
+    ("category", pa.string()),
+    ("neighborhood", pa.string()),
+    ("address", pa.string()),
+    ("phone", pa.string()),
+    ("latitude", pa.float64()),
+    ("longitude", pa.float64()),
+    ("plus_code", pa.string()),
+    ("rating", pa.float64()),
+    ("review_count", pa.int64()),
+    ("rating_distribution", COUNT_MAP),
+    ("photo_count", pa.int64()),
+    ("photo_urls", STRING_LIST),
+    ("photo_categories", STRING_LIST),
+    ("has_website", pa.bool_()),
+    ("website_url", pa.string()),
+    ("website_status", pa.string()),
+    ("about_summary", pa.string()),
+    ("price_range", pa.string()),
+    ("price_level", pa.int64()),
+    ("price_per_person", pa.string()),
+    ("price_voters", pa.int64()),
+    ("price_histogram", COUNT_MAP),
+    ("service_options", pa.map_(pa.string(), pa.bool_())),
+    ("accessibility", STRING_LIST),
+    ("offerings", STRING_LIST),
+    ("dining_options", STRING_LIST),
+    ("amenities", STRING_LIST),
+    ("planning", STRING_LIST),
+    ("payments", STRING_LIST),
+    ("parking", STRING_LIST),
+    ("highlights", STRING_LIST),
+    ("opening_hours", pa.map_(pa.string(), pa.string())),
+    ("is_open_now", pa.bool_()),
+    ("open_status_text", pa.string()),
+    ("popular_times", pa.map_(pa.string(), COUNT_MAP)),
+    ("order_link", pa.string()),
+    ("order_provider", pa.string()),
+    ("menu_link", pa.string()),
+    ("reserve_link", pa.string()),
+    ("social_media", pa.map_(pa.string(), pa.string())),
+    ("review_topics", COUNT_MAP),
+    ("reviews", pa.list_(REVIEW)),
+    ("customer_updates", pa.list_(CUSTOMER_UPDATE)),
+    ("partial_sections", STRING_LIST),
+    ("entity_id", pa.string()),
+    ("scraped_at", pa.timestamp("us")),
+])
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONVERSION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _coerce(value, arrow_type: pa.DataType):
+    """
+    Fit a scraped value to its column type. Scraper output is loose (numbers
+    as strings, lists as "; "-joined text, empty strings for missing), so
+    anything that does not fit becomes null instead of failing the export.
+    """
+    if value is None or value == "":
+        return None
+    try:
+        if pa.types.is_string(arrow_type):
+            return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+        if pa.types.is_boolean(arrow_type):
+            return bool(value)
+        if pa.types.is_integer(arrow_type):
+            return int(float(str(value).replace(",", ""))) if not isinstance(value, bool) else int(value)
+        if pa.types.is_floating(arrow_type):
+            return float(value)
+        if pa.types.is_timestamp(arrow_type):
+            return _timestamp(value)
+        if pa.types.is_map(arrow_type):
+            if not isinstance(value, dict):
+                return None
+            pairs = [(str(k), _coerce(v, arrow_type.item_type)) for k, v in value.items()]
+            return [(k, v) for k, v in pairs if v is not None]
+        if pa.types.is_list(arrow_type):
+            if isinstance(value, str):
+                value = [part.strip() for part in value.split(";") if part.strip()]
+            if not isinstance(value, list):
+                return None
+            items = (_coerce(item, arrow_type.value_type) for item in value)
+            return [item for item in items if item is not None]
+        if pa.types.is_struct(arrow_type):
+            if not isinstance(value, dict):
+                return None
+            return {field.name: _coerce(value.get(field.name), field.type) for field in arrow_type}
+    except (TypeError, ValueError):
+        return None
+    return value
+
+
+def _timestamp(value):
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value)).replace(tzinfo=None)
+
+
+def business_row(record: dict) -> dict:
+    """One BUSINESS_SCHEMA row (partition columns never null)"""
+    row = {field.name: _coerce(record.get(field.name), field.type) for field in BUSINESS_SCHEMA}
+    for column in PARTITION_COLUMNS:
+        row[column] = row[column] or MISSING_PARTITION
+    return row
+
+
+def analysis_row(record: dict, index: int) -> dict:
+    """The flat export_analysis_csv.py row, plus the Place ID to join on"""
+    return {**extract_analysis_data(record, index), "google_place_id": record.get("google_place_id")}
+
+
+def analysis_schema(rows: list[dict]) -> pa.Schema:
+    """
+    Column types of the flat analysis table, from the first batch of rows.
+    Flags (has_* / is_* / needs_*) are booleans even where the CSV export
+    carries the last operand of an `and` chain.
+    """
+    fields = []
+    for column in rows[0]:
+        kinds = {type(row.get(column)) for row in rows if row.get(column) not in (None, "")}
+        if column.startswith(("has_", "is_", "needs_")) or kinds == {bool}:
+            arrow_type = pa.bool_()
+        elif kinds == {int} or column in ANALYSIS_INT_COLUMNS:
+            arrow_type = pa.int64()
+        elif kinds and kinds <= {int, float}:
+            arrow_type = pa.float64()
+        else:
+            arrow_type = pa.string()
+        fields.append((column, arrow_type))
+    return pa.schema(fields)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# INPUT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def iter_records(paths: Iterable[Path]) -> Iterator[dict]:
+    """Records from JSON arrays and JSONL logs, one file at a time"""
+    for path in paths:
+        path = Path(path)
+        if path.suffix == ".jsonl":
+            yield from JsonlLog(path).read()
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                yield from resolve_records(json.load(f))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# WRITER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ParquetExporter:
+    """
+    Streaming writer for the partitioned businesses dataset and the flat
+    analysis table. `add()` records as they arrive, `close()` at the end.
+    """
+
+    def __init__(self, output_dir: Path = DEFAULT_OUTPUT, flush_rows: int = FLUSH_ROWS):
+        self.output_dir = Path(output_dir)
+        self.flush_rows = flush_rows
+        self.businesses_dir = self.output_dir / "businesses"
+        self.analysis_file = self.output_dir / "analysis.parquet"
+        self.written = 0
+        self._businesses: list[dict] = []
+        self._analysis: list[dict] = []
+        self._analysis_writer: Optional[pq.ParquetWriter] = None
+        self._analysis_schema: Optional[pa.Schema] = None
+        self._run_id = uuid.uuid4().hex[:8]
+        self._flushes = 0
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        # A re-export replaces the previous dataset instead of adding to it
+        if self.businesses_dir.exists():
+            for old in self.businesses_dir.rglob("*.parquet"):
+                old.unlink()
+
+    def add(self, record: dict) -> None:
+        if not record.get("name"):
+            return
+        self._businesses.append(business_row(record))
+        self._analysis.append(analysis_row(record, self.written))
+        self.written += 1
+        if len(self._businesses) >= self.flush_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._businesses:
+            return
+        table = pa.Table.from_pylist(self._businesses, schema=BUSINESS_SCHEMA)
+        ds.write_dataset(
+            table,
+            self.businesses_dir,
+            format="parquet",
+            partitioning=PARTITION_COLUMNS,
+            partitioning_flavor="hive",
+            basename_template=f"part-{self._run_id}-{self._flushes}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            # Partitions are small; the embedded Arrow schema would dwarf their data
+            file_options=ds.ParquetFileFormat().make_write_options(store_schema=False, compression=COMPRESSION),
+        )
+
+        if self._analysis_writer is None:
+            self._analysis_schema = analysis_schema(self._analysis)
+            self._analysis_writer = pq.ParquetWriter(self.analysis_file, self._analysis_schema, compression=COMPRESSION)
+        analysis = pa.Table.from_pylist(
+            [
+                {field.name: _coerce(row.get(field.name), field.type) for field in self._analysis_schema}
+                for row in self._analysis
+            ],
+            schema=self._analysis_schema,
+        )
+        self._analysis_writer.write_table(analysis)
+
+        self._flushes += 1
+        self._businesses, self._analysis = [], []
+
+    def close(self) -> None:
+        self.flush()
+        if self._analysis_writer is not None:
+            self._analysis_writer.close()
+            self._analysis_writer = None
+
+
+def export(records: Iterable[dict], output_dir: Path = DEFAULT_OUTPUT, flush_rows: int = FLUSH_ROWS) -> int:
+    """Stream `records` into the Parquet dataset; returns how many were written"""
+    exporter = ParquetExporter(output_dir, flush_rows)
+    try:
+        for record in records:
+            exporter.add(record)
+    finally:
+        exporter.close()
+    return exporter.written
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="Export businesses to a partitioned Parquet dataset")
+    parser.add_argument("files", nargs="*", type=Path, help="JSON arrays or JSONL logs (default: LEADS_DB or datos_definitivos_final.json)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--flush-rows", type=int, default=FLUSH_ROWS)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📦 Business Data Export to Parquet")
+    print("=" * 60)
+
+    records = iter_records(args.files) if args.files else load_businesses(DEFAULT_INPUT)
+
+    started = time.perf_counter()
+    written = export(records, args.output, args.flush_rows)
+    elapsed = time.perf_counter() - started
+
+    if not written:
+        print("❌ No businesses found!")
+        return
+
+    size = sum(f.stat().st_size for f in args.output.rglob("*.parquet"))
+    partitions = len({f.parent for f in (args.output / "businesses").rglob("*.parquet")})
+    print(f"\n✅ Exported {written:,} businesses in {elapsed:.1f}s")
+    print(f"   {args.output / 'businesses'}  ({partitions} city/category partitions)")
+    print(f"   {args.output / 'analysis.parquet'}")
+    print(f"   Total size: {size / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
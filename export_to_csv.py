@@ -1,15 +1,14 @@
 #!/usr/bin/env python3
 """Export discovered businesses JSON to CSV format."""
 
-import json
 import csv
 from pathlib import Path
 
+from database.local_db import load_businesses
+
 def main():
-    # Load JSON data
-    json_path = Path("discovered_businesses.json")
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # Load JSON data (or the LEADS_DB database)
+    data = load_businesses(Path("discovered_businesses.json"))
 
     # Get all unique keys from all records
     all_keys = set()
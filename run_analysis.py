@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+╔═══════════════════════════════════════════════════════════════════════════════╗
+║                    📊 LEAD ANALYSIS v1.0                                      ║
+║                                                                               ║
+║  Scores every business of one or more dataset files (or the LEADS_DB store)   ║
+║  with BusinessAnalyzer, in chunks spread over a process pool.                 ║
+║                                                                               ║
+║  • Streams JSON arrays / JSONL / the store - memory stays bounded             ║
+║  • Results are written chunk by chunk: JSONL, Parquet and/or LEADS_DB         ║
+║  • Businesses whose inputs and scoring config did not change are skipped      ║
+║  • Throughput report at the end                                               ║
+╚═══════════════════════════════════════════════════════════════════════════════╝
+
+Usage:
+    python run_analysis.py datos_definitivos.json --jsonl analysis.jsonl
+    python run_analysis.py discovered_businesses.jsonl --parquet analysis.parquet --workers 8
+    LEADS_DB=automation.db python run_analysis.py --status discovered --write-back
+    LEADS_DB=automation.db python run_analysis.py --write-back --all   # Re-score everything
+
+A record that carries a score_breakdown (store records and exports of them)
+is skipped when its input fingerprint and config version still match
+(BusinessAnalyzer.is_current), so after a weight change only the affected
+businesses are re-scored. Outputs contain the re-scored businesses only.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from agents.analysis.scorer import (
+    AnalysisResult,
+    BusinessAnalyzer,
+    BusinessInput,
+    Decision,
+    analysis_row,
+    business_input_from_record,
+)
+from database.blob_store import iter_records
+from database.local_db import configured_database
+from database.place_history import open_history
+
+# Parquet output is optional
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+CHUNK_SIZE = 2000                 # Businesses per worker task (and per output write)
+DEFAULT_WORKERS = os.cpu_count() or 1
+PENDING_PER_WORKER = 2            # Chunks in flight per worker; bounds memory
+
+SCORE_COLUMNS = (
+    "review_score", "rating_score", "photo_score", "category_score",
+    "location_score", "contact_score", "activity_score",
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# INPUT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def iter_store(status: Optional[str]) -> Iterator[dict]:
+    db = configured_database()
+    if db is None:
+        raise SystemExit("❌ No input files and LEADS_DB is not set")
+    try:
+        yield from db.iter_businesses(status=status)
+    finally:
+        db.close()
+
+
+def iter_inputs(
+    records: Iterable[dict],
+    history=None,
+    stats: Optional["AnalysisStats"] = None,
+    force: bool = False,
+) -> Iterator[BusinessInput]:
+    """
+    Scorer inputs; workers only need the scoring fields, never the raw record.
+    Businesses whose stored result is still current are counted in
+    `stats.unchanged` and left out, unless `force`.
+    """
+    analyzer = BusinessAnalyzer()
+    for record in records:
+        business = business_input_from_record(record, history)
+        if not force and analyzer.is_current(business, record.get("score_breakdown")):
+            if stats is not None:
+                stats.unchanged += 1
+            continue
+        business.raw_data = None
+        yield business
+
+
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# WORKER
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_analyzer: Optional[BusinessAnalyzer] = None
+
+
+def score_chunk(businesses: list[BusinessInput]) -> list[AnalysisResult]:
+    """Runs in a pool process (one analyzer per process)"""
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = BusinessAnalyzer()
+    return [_analyzer.analyze(business) for business in businesses]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# OUTPUTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def result_row(business: BusinessInput, result: AnalysisResult) -> dict:
+    row = {"name": business.name, **result.to_dict()}
+    row.update(row.pop("score_breakdown"))
+    row.pop("total")  # Same as total_score
+    return row
+
+
+class JsonlSink:
+    """One result per line, flushed after every chunk"""
+
+    def __init__(self, filepath: Path):
+        self.filepath = Path(filepath)
+        self.file = open(self.filepath, "w", encoding="utf-8")
+
+    def write(self, businesses: list[BusinessInput], results: list[AnalysisResult]) -> None:
+        self.file.writelines(
+            json.dumps(result_row(business, result), ensure_ascii=False) + "\n"
+            for business, result in zip(businesses, results)
+        )
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class ParquetSink:
+    """One row group per chunk"""
+
+    def __init__(self, filepath: Path):
+        if not HAS_PYARROW:
+            raise SystemExit("❌ Parquet output needs pyarrow (pip install pyarrow)")
+        self.schema = pa.schema(
+            [("name", pa.string()), ("business_id", pa.string()), ("total_score", pa.float64())]
+            + [(column, pa.float64()) for column in SCORE_COLUMNS]
+            + [
+                ("profile_summary", pa.string()),
+                ("customer_type", pa.string()),
+                ("website_necessity_score", pa.float64()),
+                ("recommended_structure", pa.string()),
+                ("recommended_pages", pa.list_(pa.string())),
+                ("decision", pa.string()),
+                ("decision_reasons", pa.list_(pa.string())),
+                ("analyzed_at", pa.string()),
+                ("input_fingerprint", pa.string()),
+                ("config_version", pa.string()),
+            ]
+        )
+        self.writer = pq.ParquetWriter(Path(filepath), self.schema, compression="zstd")
+
+    def write(self, businesses: list[BusinessInput], results: list[AnalysisResult]) -> None:
+        rows = [result_row(business, result) for business, result in zip(businesses, results)]
+        self.writer.write_table(pa.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class DatabaseSink:
+    """Scores and statuses back into LEADS_DB, one transaction per chunk"""
+
+    def __init__(self):
+        self.db = configured_database()
+        if self.db is None:
+            raise SystemExit("❌ --write-back needs LEADS_DB")
+        self.updated = 0
+
+    def write(self, businesses: list[BusinessInput], results: list[AnalysisResult]) -> None:
+        self.updated += self.db.update_analyses(analysis_row(result) for result in results)
+
+    def close(self) -> None:
+        self.db.close()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RUN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class AnalysisStats:
+    scored: int = 0
+    unchanged: int = 0
+    chunks: int = 0
+    workers: int = 1
+    decisions: dict = field(default_factory=lambda: {d.value: 0 for d in Decision})
+    write_seconds: float = 0.0
+    total_seconds: float = 0.0
+
+    def format(self) -> str:
+        rate = self.scored / self.total_seconds if self.total_seconds else 0
+        decisions = ", ".join(f"{name} {count:,}" for name, count in self.decisions.items())
+        return (
+            f"{self.scored:,} businesses in {self.chunks} chunks on {self.workers} worker(s) | {decisions}\n"
+            f"   {self.unchanged:,} unchanged since their last analysis (skipped)\n"
+            f"   total {self.total_seconds:.2f}s (writing {self.write_seconds:.2f}s) - {rate:,.0f} businesses/s"
+        )
+
+
+def run(
+    businesses: Iterable[BusinessInput],
+    sinks: list,
+    workers: int = DEFAULT_WORKERS,
+    chunk_size: int = CHUNK_SIZE,
+    stats: Optional[AnalysisStats] = None,
+) -> AnalysisStats:
+    """
+    Score `businesses` chunk by chunk and hand every finished chunk to the
+    sinks in input order. At most workers * PENDING_PER_WORKER chunks are in
+    flight, so memory does not depend on the input size.
+    """
+    stats = stats or AnalysisStats()
+    stats.workers = max(1, workers)
+    started = time.perf_counter()
+
+    def finish(chunk: list[BusinessInput], results: list[AnalysisResult]) -> None:
+        t0 = time.perf_counter()
+        for sink in sinks:
+            sink.write(chunk, results)
+        stats.write_seconds += time.perf_counter() - t0
+        stats.scored += len(results)
+        stats.chunks += 1
+        for result in results:
+            stats.decisions[result.decision.value] += 1
+
+    if workers <= 1:
+        for chunk in chunked(businesses, chunk_size):
+            finish(chunk, score_chunk(chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for chunk in chunked(businesses, chunk_size):
+                pending.append((chunk, pool.submit(score_chunk, chunk)))
+                if len(pending) >= workers * PENDING_PER_WORKER:
+                    chunk, future = pending.popleft()
+                    finish(chunk, future.result())
+            while pending:
+                chunk, future = pending.popleft()
+                finish(chunk, future.result())
+
+    stats.total_seconds = time.perf_counter() - started
+    return stats
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="Score businesses in parallel and stream the results")
+    parser.add_argument("files", nargs="*", type=Path, help="JSON arrays or JSONL logs (default: the LEADS_DB store)")
+    parser.add_argument("--status", help="Store input only: score businesses with this status")
+    parser.add_argument("--jsonl", type=Path, help="Write results as JSON lines")
+    parser.add_argument("--parquet", type=Path, help="Write results as a Parquet file")
+    parser.add_argument("--write-back", action="store_true", help="Store scores and statuses in LEADS_DB")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Processes (1 = no pool)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--all", action="store_true", help="Re-score businesses whose result is still current")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    print("=" * 60)
+    print("📊 Lead Analysis")
+    print("=" * 60)
+
+    sinks = []
+    try:
+        if args.jsonl:
+            sinks.append(JsonlSink(args.jsonl))
+        if args.parquet:
+            sinks.append(ParquetSink(args.parquet))
+        if args.write_back:
+            sinks.append(DatabaseSink())
+        if not sinks:
+            print("⚠️  No output given (--jsonl, --parquet, --write-back); only counting decisions")
+
+        if args.files:
+            records = (record for path in args.files for record in iter_records(path))
+        else:
+            records = iter_store(args.status)
+        stats = AnalysisStats()
+        businesses = iter_inputs(records, open_history(), stats, force=args.all)
+        run(businesses, sinks, args.workers, args.chunk_size, stats)
+    finally:
+        for sink in sinks:
+            sink.close()
+
+    if not stats.scored and not stats.unchanged:
+        print("❌ No businesses found!")
+        return
+
+    print(f"\n✅ {stats.format()}")
+    for sink in sinks:
+        if isinstance(sink, DatabaseSink):
+            print(f"   🗄️  {sink.updated:,} businesses updated in {sink.db.filepath.name}")
+        elif isinstance(sink, JsonlSink):
+            print(f"   📄 {sink.filepath}")
+    if args.parquet:
+        print(f"   📦 {args.parquet}")
+
+
+if __name__ == "__main__":
+    main()
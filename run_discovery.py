@@ -8,9 +8,17 @@
 ║                                                                               ║
 ║  Features:                                                                    ║
 ║  • Smart permutation of all Category × Location combinations                  ║
-║  • Crash recovery via search_history.json                                     ║
+║  • Yield-driven ordering of searches (expected leads per minute)              ║
+║  • Redundant search-term synonyms collapsed by result overlap                 ║
+║  • Crash recovery via the search_history.jsonl event log                      ║
 ║  • Anti-blocking measures with random delays                                  ║
-║  • Cool-down periods on soft-bans                                             ║
+║  • Failure classification, per-class backoff and a circuit breaker          ║
+║  • Retry queue for failed searches (never silently marked as done)            ║
+║  • Browser relaunch after crashes, resuming the interrupted search            ║
+║  • Bandwidth and request accounting per search and per business               ║
+║  • Opt-in memory profiling (MEMORY_PROFILE=1)                                 ║
+║  • Several processes can share discovery.db (DISCOVERY_STORE=sqlite)          ║
+║  • Fuzzy duplicate detection (name variants, phone, distance)                 ║
 ║  • Real-time progress tracking                                                ║
 ╚═══════════════════════════════════════════════════════════════════════════════╝
 """
@@ -21,6 +29,7 @@ import random
 import time
 import itertools
 import os
+import socket
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -30,7 +39,24 @@ from typing import Optional
 PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from agents.analysis.deduplicator import EntityIndex
+from agents.discovery.failures import (
+    BACKOFF_POLICIES,
+    CircuitBreaker,
+    FailureClass,
+    classify_exception,
+)
 from agents.discovery.google_maps import MapsScraper, ScrapedBusiness
+from agents.discovery.memory_profile import MemoryProfiler
+from agents.discovery.network import NetworkReport
+from agents.discovery.scheduler import SearchScheduler
+from agents.discovery.supervisor import BrowserSupervisor
+from agents.discovery.term_overlap import TermOverlapTracker
+from database.background_writer import shared_writer
+from database.jsonl_store import JsonlLeadStore, JsonlLog, record_key
+from database.local_db import configured_database
+from database.place_history import PlaceHistory
+from database.sqlite_store import SqliteLeadStore, SqliteSearchLog, connect as connect_db
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
@@ -39,17 +65,29 @@ from agents.discovery.google_maps import MapsScraper, ScrapedBusiness
 TARGET_LEADS = 1000  # Stop when we reach this many qualified leads
 MIN_DELAY = 5        # Minimum seconds between searches
 MAX_DELAY = 15       # Maximum seconds between searches
-COOLDOWN_TIME = 60   # Seconds to wait on soft-ban detection
-MAX_RETRIES = 3      # Max retries per search before moving on
+COOLDOWN_TIME = 60   # Base circuit-breaker pause when the failure rate spikes
+MAX_RESULTS = 20     # Default results per search (scaled per zone by the scheduler)
 HEADLESS = True      # Run browser headless for production
 
+# Memory profiling (opt-in: MEMORY_PROFILE=1 python run_discovery.py)
+MEMORY_PROFILE = os.environ.get("MEMORY_PROFILE") == "1"
+MEMORY_PROFILE_EVERY = 5   # Searches between memory snapshots
+
+LEADS_EXPORT_EVERY = 50    # New leads between legacy discovered_businesses.json exports
+
+# Storage backend: "jsonl" (one process) or "sqlite" (several processes share discovery.db)
+STORE_BACKEND = os.environ.get("DISCOVERY_STORE", "jsonl")
+
 # File paths
 CONFIG_DIR = PROJECT_ROOT / "config"
 DATA_DIR = PROJECT_ROOT / "data"
 CATEGORIES_FILE = CONFIG_DIR / "categories.json"
 LOCATIONS_FILE = CONFIG_DIR / "locations.json"
 HISTORY_FILE = PROJECT_ROOT / "search_history.json"
+YIELD_FILE = PROJECT_ROOT / "search_yield.json"
+OVERLAP_FILE = PROJECT_ROOT / "term_overlap.json"
 LEADS_FILE = PROJECT_ROOT / "discovered_businesses.json"
+DB_FILE = PROJECT_ROOT / "discovery.db"
 
 # Ensure directories exist
 DATA_DIR.mkdir(exist_ok=True)
@@ -138,87 +176,164 @@ class Console:
 # ═══════════════════════════════════════════════════════════════════════════════
 
 class SearchHistory:
-    """Manages search history for crash recovery."""
+    """
+    Manages search history for crash recovery.
     
-    def __init__(self, filepath: Path):
+    Completions and failures are appended to an event log (search_history.jsonl)
+    instead of rewriting the whole history file after every search. With a
+    SqliteSearchLog the log is shared with other processes, which claim a
+    search before running it.
+    """
+    
+    def __init__(self, filepath: Path, log: Optional[SqliteSearchLog] = None):
         self.filepath = filepath
+        self.log = log if log is not None else JsonlLog(filepath.with_suffix(".jsonl"))
         self.history: set = set()
+        self.retry_queue: dict = {}  # key -> {attempts, failure_class, retry_after, last_error}
         self.load()
     
     def load(self):
-        """Load search history from file."""
-        if self.filepath.exists():
-            try:
+        """Replay the search log (importing the legacy JSON history once)."""
+        self.history = set()
+        self.retry_queue = {}
+        try:
+            events = 0
+            for event in self.log.read():
+                events += 1
+                key = event["key"]
+                if event["event"] == "completed":
+                    self.history.add(key)
+                    self.retry_queue.pop(key, None)
+                elif event["event"] == "failed":
+                    self.retry_queue[key] = event["entry"]
+            
+            if not events and self.filepath.exists():
                 with open(self.filepath, 'r', encoding='utf-8') as f:
                     data = json.load(f)
-                    self.history = set(data.get("completed_searches", []))
+                self.history = set(data.get("completed_searches", []))
+                self.retry_queue = data.get("retry_queue", {})
+                self.save()
+            
+            if self.history:
                 Console.info(f"Loaded {len(self.history)} completed searches from history")
-            except Exception as e:
-                Console.warning(f"Could not load history: {e}")
-                self.history = set()
-        else:
+            if self.retry_queue:
+                Console.info(f"{len(self.retry_queue)} failed searches waiting in the retry queue")
+        except Exception as e:
+            Console.warning(f"Could not load history: {e}")
             self.history = set()
+            self.retry_queue = {}
+    
+    def events(self) -> list:
+        """One event per known search."""
+        return (
+            [{"event": "completed", "key": key} for key in sorted(self.history)]
+            + [{"event": "failed", "key": key, "entry": entry} for key, entry in self.retry_queue.items()]
+        )
     
     def save(self):
-        """Save search history to file."""
+        """Compact the search log to one event per search."""
         try:
-            with open(self.filepath, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "completed_searches": list(self.history),
-                    "last_updated": datetime.now().isoformat(),
-                    "total_searches": len(self.history)
-                }, f, ensure_ascii=False, indent=2)
+            self.log.rewrite(self.events())
         except Exception as e:
             Console.error(f"Could not save history: {e}")
     
+    def _append(self, event: dict):
+        try:
+            self.log.append(event)
+        except Exception as e:
+            Console.error(f"Could not append to history: {e}")
+    
     def is_completed(self, category: str, location: str) -> bool:
         """Check if a search combination has been completed."""
         key = f"{category}|{location}"
         return key in self.history
     
+    def claim(self, category: str, location: str) -> bool:
+        """
+        Reserve a search before running it. Always True for a single-process
+        log; with a shared log it is False when another process completed the
+        search or is running it right now.
+        """
+        if not isinstance(self.log, SqliteSearchLog):
+            return True
+        key = f"{category}|{location}"
+        reason = self.log.claim(key)
+        if reason == "completed":
+            self.history.add(key)
+            self.retry_queue.pop(key, None)
+        return reason is None
+    
     def mark_completed(self, category: str, location: str):
         """Mark a search combination as completed."""
         key = f"{category}|{location}"
         self.history.add(key)
-        self.save()  # Save after each completion for crash recovery
+        self.retry_queue.pop(key, None)
+        self._append({"event": "completed", "key": key})  # Appended right away for crash recovery
+    
+    def mark_failed(self, category: str, location: str, failure_class: FailureClass, error: str) -> float:
+        """
+        Put a failed search in the retry queue with its class-specific backoff.
+        Returns the delay in seconds before it should be retried.
+        """
+        key = f"{category}|{location}"
+        entry = self.retry_queue.get(key, {"attempts": 0})
+        entry["attempts"] += 1
+        delay = BACKOFF_POLICIES[failure_class].delay(entry["attempts"])
+        entry.update({
+            "failure_class": failure_class.value,
+            "retry_after": time.time() + delay,
+            "last_error": error[:200],
+        })
+        self.retry_queue[key] = entry
+        self._append({"event": "failed", "key": key, "entry": entry})
+        return delay
+    
+    def retry_after(self, category: str, location: str) -> float:
+        """Epoch time before which a queued search should not be retried."""
+        entry = self.retry_queue.get(f"{category}|{location}")
+        return entry["retry_after"] if entry else 0.0
 
 
 class LeadsManager:
-    """Manages discovered leads storage."""
+    """
+    Manages discovered leads storage.
     
-    def __init__(self, filepath: Path):
-        self.filepath = filepath
-        self.leads: list = []
-        self.seen_names: set = set()
-        self.load()
+    Leads are appended to discovered_businesses.jsonl; the legacy JSON array
+    is re-exported every LEADS_EXPORT_EVERY new leads and on save(), on the
+    background writer thread so the dump never blocks the event loop.
+    """
     
-    def load(self):
-        """Load existing leads from file."""
-        if self.filepath.exists():
-            try:
-                with open(self.filepath, 'r', encoding='utf-8') as f:
-                    self.leads = json.load(f)
-                    # Build seen names set for deduplication
-                    for lead in self.leads:
-                        name = lead.get("name", "").lower().strip()
-                        if name:
-                            self.seen_names.add(name)
-                Console.info(f"Loaded {len(self.leads)} existing leads")
-            except Exception as e:
-                Console.warning(f"Could not load leads: {e}")
-                self.leads = []
+    def __init__(self, filepath: Path, store: Optional[SqliteLeadStore] = None):
+        self.filepath = filepath
+        self.store = store if store is not None else JsonlLeadStore(filepath.with_suffix(".jsonl"), legacy_json=filepath)
+        self.writer = shared_writer()
+        self._unexported = 0
+        self.entities = EntityIndex()
+        for lead in self.store.values():
+            self.entities.add(lead)
+        if len(self.store):
+            Console.info(f"Loaded {len(self.store)} existing leads")
+    
+    @property
+    def leads(self) -> list:
+        return self.store.values()
     
     def save(self):
-        """Save leads to file."""
+        """Compact the lead log and export the legacy JSON array."""
         try:
-            with open(self.filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.leads, f, ensure_ascii=False, indent=2)
+            self.store.compact()
+            self.store.export_json(self.filepath, writer=self.writer)
+            self._unexported = 0
+            db = configured_database()
+            if db is not None:
+                db.bulk_upsert(self.leads)
+                db.close()
         except Exception as e:
             Console.error(f"Could not save leads: {e}")
     
     def count_qualified(self) -> int:
         """Count leads without websites (qualified leads)."""
-        return sum(1 for lead in self.leads 
+        return sum(1 for lead in self.store.values()
                    if not lead.get("website_url") 
                    and lead.get("website_status") != "active")
     
@@ -227,10 +342,12 @@ class LeadsManager:
         Add a new lead if it's qualified (no website) and not a duplicate.
         Returns True if added, False otherwise.
         """
-        name = business.get("name", "").lower().strip()
+        # Skip duplicates (same Place ID or name)
+        if self.store.find(name=business.get("name"), place_id=business.get("google_place_id")):
+            return False
         
-        # Skip duplicates
-        if name in self.seen_names:
+        # Skip the same business under a spelling variant (phone / distance / similar name)
+        if self.entities.find_match(business):
             return False
         
         # Only add if no active website
@@ -242,13 +359,44 @@ class LeadsManager:
         if has_website:
             return False
         
-        # Add the lead
-        self.leads.append(business)
-        self.seen_names.add(name)
-        self.save()  # Save after each addition for safety
+        # Add the lead - a single appended line, safe across crashes
+        if not self.store.put(business):
+            return False
+        self.entities.add(business)
+        
+        self._unexported += 1
+        if self._unexported >= LEADS_EXPORT_EVERY:
+            try:
+                self.store.export_json(self.filepath, writer=self.writer)
+                self._unexported = 0
+            except Exception as e:
+                Console.error(f"Could not export leads: {e}")
         return True
 
 
+def open_state() -> tuple:
+    """
+    Search history and leads for STORE_BACKEND. The first process to use
+    discovery.db seeds it from the JSONL files.
+    """
+    if STORE_BACKEND != "sqlite":
+        return SearchHistory(HISTORY_FILE), LeadsManager(LEADS_FILE)
+    
+    conn = connect_db(DB_FILE)
+    owner = f"{socket.gethostname()}-{os.getpid()}"
+    search_log = SqliteSearchLog(DB_FILE, owner=owner, conn=conn)
+    store = SqliteLeadStore(DB_FILE, legacy_json=LEADS_FILE, conn=conn)
+    
+    if not len(store):
+        imported = store.put_many(LeadsManager(LEADS_FILE).leads)
+        Console.info(f"Seeded {DB_FILE.name} with {imported} leads")
+    if next(search_log.read(), None) is None:
+        search_log.rewrite(SearchHistory(HISTORY_FILE).events())
+    
+    Console.info(f"Shared store {DB_FILE.name} (worker {owner})")
+    return SearchHistory(HISTORY_FILE, log=search_log), LeadsManager(LEADS_FILE, store=store)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONFIGURATION LOADERS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -319,7 +467,7 @@ def load_locations() -> list[str]:
 def generate_search_combinations(categories: list, locations: list) -> list[tuple]:
     """
     Generate all possible (category, search_term, location) combinations.
-    Shuffled randomly to avoid IP bans from hitting same location repeatedly.
+    Shuffled randomly so the scheduler breaks ties in random order.
     """
     combinations = list(itertools.product(categories, locations))
     
@@ -345,8 +493,13 @@ async def run_endurance_loop():
     Console.banner()
     
     # Initialize managers
-    history = SearchHistory(HISTORY_FILE)
-    leads = LeadsManager(LEADS_FILE)
+    history, leads = open_state()
+    scheduler = SearchScheduler(YIELD_FILE)
+    overlap = TermOverlapTracker(OVERLAP_FILE)
+    place_history = PlaceHistory()
+    scheduler.known_places.update(
+        key for key in (record_key(lead) for lead in leads.leads) if key
+    )
     
     # Check if we've already reached target
     current_leads = leads.count_qualified()
@@ -376,26 +529,73 @@ async def run_endurance_loop():
     if skipped > 0:
         Console.info(f"Skipping {skipped} already-completed searches")
     
-    if not pending:
+    # Failed searches from previous runs wait in the retry queue until their backoff elapses
+    deferred = []  # (retry_at, combo)
+    now = time.time()
+    for combo in list(pending):
+        retry_at = history.retry_after(combo[1], combo[2])
+        if retry_at > now:
+            pending.remove(combo)
+            deferred.append((retry_at, combo))
+    
+    if not pending and not deferred:
         Console.warning("All search combinations have been completed!")
         return
     
     # Statistics
     start_time = time.time()
     searches_completed = 0
-    soft_ban_count = 0
-    
-    # Initialize scraper
+    collapsed_skipped = 0
+    failures_by_class = {}
+    run_attempts = {}  # "term|location" -> failed attempts during this run
+    breaker = CircuitBreaker(cooldown=COOLDOWN_TIME)
+    network_report = NetworkReport()
+    businesses_scraped = 0
+    
+    profiler = MemoryProfiler() if MEMORY_PROFILE else None
+    if profiler:
+        profiler.start()
+    
+    # Initialize scraper (the supervisor relaunches it if Chromium dies)
     scraper = None
+    supervisor = None
     
     try:
         Console.info("Initializing MapsScraper...")
         scraper = MapsScraper(headless=HEADLESS)
-        await scraper.initialize()
+        supervisor = BrowserSupervisor(scraper)
+        await supervisor.start()
         Console.success("Scraper initialized successfully")
+        if profiler:
+            profiler.snapshot("start", 0)
         
-        # Main loop
-        for i, (category_key, search_term, location) in enumerate(pending, 1):
+        # Main loop - the scheduler picks the most promising pending search each time
+        i = 0
+        while pending or deferred:
+            # Move queued retries whose backoff has elapsed back into the pool
+            now = time.time()
+            pending.extend(combo for retry_at, combo in deferred if retry_at <= now)
+            deferred = [(retry_at, combo) for retry_at, combo in deferred if retry_at > now]
+            if not pending:
+                wait = min(retry_at for retry_at, _ in deferred) - now
+                Console.info(f"Waiting {wait:.0f}s for the next queued retry...")
+                await asyncio.sleep(wait)
+                continue
+            
+            # Pause every search while the circuit breaker is open
+            if breaker.is_open:
+                Console.warning(f"Circuit breaker open - pausing all searches for {breaker.remaining():.0f}s...")
+                await breaker.wait_until_closed()
+            
+            category_key, search_term, location = scheduler.next_combo(pending)
+            pending.remove((category_key, search_term, location))
+            i += 1
+            
+            # Skip synonyms that keep returning the same places as other terms
+            if overlap.is_collapsed(category_key, search_term):
+                collapsed_skipped += 1
+                continue
+            
             # Check if target reached
             current_leads = leads.count_qualified()
             if current_leads >= TARGET_LEADS:
@@ -406,66 +606,108 @@ async def run_endurance_loop():
             combo_num = skipped + i
             Console.progress(current_leads, TARGET_LEADS, search_term, location, combo_num, total_combos)
             
-            # Retry logic
-            retry_count = 0
-            success = False
+            # Another process sharing the store may have taken this search
+            if not history.claim(search_term, location):
+                Console.info("Skipping - done or in progress in another process")
+                continue
             
-            while retry_count < MAX_RETRIES and not success:
+            try:
+                # Perform the search
+                search_started = time.time()
+                results = await supervisor.search(
+                    search_term,
+                    location,
+                    max_results=scheduler.suggest_max_results(location, MAX_RESULTS),
+                    known_places=scheduler.known_places,
+                )
+                
+                # Process results
+                new_leads_this_search = 0
+                business_dicts = [
+                    b.to_dict() if isinstance(b, ScrapedBusiness) else b
+                    for b in results
+                ]
+                # Known places were skipped while scrolling - they still count as
+                # duplicates and as part of this term's result set
+                surfaced_keys = scraper.last_scroll_stats.get("surfaced_keys", [])
+                new_places, duplicates = scheduler.split_new_places(business_dicts, surfaced_keys)
+                overlap.record(
+                    category_key, search_term, location,
+                    [record_key(b) for b in business_dicts] + surfaced_keys,
+                )
+                
+                for business_dict in business_dicts:
+                    # Add category info
+                    business_dict["discovered_category"] = category_key
+                    business_dict["discovered_location"] = location
+                    business_dict["discovered_at"] = datetime.now().isoformat()
+                    
+                    # Try to add as lead
+                    if leads.add_lead(business_dict):
+                        new_leads_this_search += 1
+                        Console.found_lead(
+                            business_dict.get("name", "Unknown"),
+                            category_key
+                        )
+                
+                # Rating/review numbers over time (review velocity for the scorer).
+                # Known places were not opened; their result cards still show both.
+                known_observations = [
+                    {**card, "discovered_category": category_key}
+                    for card in scraper.last_scroll_stats.get("known_observations", [])
+                ]
                 try:
-                    # Perform the search
-                    results = await scraper.search_businesses(
-                        query=search_term,
-                        location=location,
-                        max_results=20
+                    place_history.record(business_dicts + known_observations)
+                except OSError as e:
+                    Console.error(f"Could not record place history: {e}")
+                
+                # Mark search as completed and feed its yield back to the scheduler
+                history.mark_completed(search_term, location)
+                scheduler.record(
+                    category_key, search_term, location,
+                    new_places=new_places,
+                    new_leads=new_leads_this_search,
+                    duplicates=duplicates,
+                    seconds=time.time() - search_started,
+                )
+                breaker.record_success()
+                searches_completed += 1
+                businesses_scraped += len(business_dicts)
+                
+                if profiler and searches_completed % MEMORY_PROFILE_EVERY == 0:
+                    profiler.snapshot(f"{search_term} | {location}", businesses_scraped)
+                
+                if new_leads_this_search > 0:
+                    Console.success(f"Found {new_leads_this_search} new qualified leads!")
+                
+            except Exception as e:
+                failure_class = classify_exception(e)
+                breaker.record_failure(failure_class)
+                failures_by_class[failure_class.value] = failures_by_class.get(failure_class.value, 0) + 1
+                
+                key = f"{search_term}|{location}"
+                run_attempts[key] = run_attempts.get(key, 0) + 1
+                policy = BACKOFF_POLICIES[failure_class]
+                
+                if run_attempts[key] < policy.max_attempts:
+                    delay = history.mark_failed(search_term, location, failure_class, str(e))
+                    deferred.append((time.time() + delay, (category_key, search_term, location)))
+                    Console.warning(
+                        f"{failure_class.value}: '{search_term}' in '{location}' "
+                        f"queued for retry in {delay:.0f}s ({e})"
                     )
-                    
-                    # Process results
-                    new_leads_this_search = 0
-                    for business in results:
-                        # Convert to dict if it's a ScrapedBusiness object
-                        if isinstance(business, ScrapedBusiness):
-                            business_dict = business.to_dict()
-                        else:
-                            business_dict = business
-                        
-                        # Add category info
-                        business_dict["discovered_category"] = category_key
-                        business_dict["discovered_location"] = location
-                        business_dict["discovered_at"] = datetime.now().isoformat()
-                        
-                        # Try to add as lead
-                        if leads.add_lead(business_dict):
-                            new_leads_this_search += 1
-                            Console.found_lead(
-                                business_dict.get("name", "Unknown"),
-                                category_key
-                            )
-                    
-                    # Mark search as completed
+                elif failure_class == FailureClass.EMPTY_RESULTS:
+                    # Repeatedly empty is a real answer: there is nothing to find here
                     history.mark_completed(search_term, location)
-                    searches_completed += 1
-                    success = True
-                    
-                    if new_leads_this_search > 0:
-                        Console.success(f"Found {new_leads_this_search} new qualified leads!")
-                    
-                except Exception as e:
-                    retry_count += 1
-                    error_msg = str(e).lower()
-                    
-                    # Detect potential soft-ban
-                    if "timeout" in error_msg or "not found" in error_msg or "visible" in error_msg:
-                        soft_ban_count += 1
-                        Console.warning(f"Potential soft-ban detected. Cooling down for {COOLDOWN_TIME}s...")
-                        await asyncio.sleep(COOLDOWN_TIME)
-                    else:
-                        Console.error(f"Search error (attempt {retry_count}/{MAX_RETRIES}): {e}")
-                        await asyncio.sleep(10)  # Brief pause before retry
+                    Console.info(f"No results for '{search_term}' in '{location}' after {run_attempts[key]} attempts")
+                else:
+                    history.mark_failed(search_term, location, failure_class, str(e))
+                    Console.warning(
+                        f"Giving up on '{search_term}' in '{location}' for this run "
+                        f"({failure_class.value}); it stays in the retry queue"
+                    )
             
-            if not success:
-                Console.warning(f"Skipping '{search_term}' in '{location}' after {MAX_RETRIES} failed attempts")
-                # Still mark as completed to avoid infinite retries
-                history.mark_completed(search_term, location)
+            network_report.add(scraper.take_network_stats())
             
             # Anti-blocking delay between searches
             delay = random.uniform(MIN_DELAY, MAX_DELAY)
@@ -480,10 +722,14 @@ async def run_endurance_loop():
         traceback.print_exc()
     
     finally:
+        # Last memory snapshot while the browser is still up
+        if profiler:
+            profiler.snapshot("final", businesses_scraped)
+        
         # Cleanup
-        if scraper:
+        if supervisor:
             try:
-                await scraper.close()
+                await supervisor.close()
             except:
                 pass
         
@@ -494,13 +740,42 @@ async def run_endurance_loop():
         Console.stats(
             leads=final_leads,
             searches=searches_completed,
-            skipped=skipped,
+            skipped=skipped + collapsed_skipped,
             duration=duration
         )
         
+        if collapsed_skipped:
+            Console.info(f"Skipped {collapsed_skipped} searches for redundant term synonyms")
+        if network_report.searches:
+            Console.info(f"Network: {network_report.format()}")
+        if profiler:
+            Console.info(f"Memory profile ({profiler.filepath.name}):\n{profiler.diff_report()}")
+            if profiler.warnings:
+                Console.warning(f"Memory growth exceeded the per-business threshold {profiler.warnings} times")
+            profiler.stop()
+        if supervisor and supervisor.restarts:
+            Console.info(f"Browser relaunched {supervisor.restarts} times after crashes")
+        if failures_by_class:
+            breakdown = ", ".join(f"{name}={count}" for name, count in sorted(failures_by_class.items()))
+            Console.info(
+                f"Search failures: {breakdown} | circuit breaker trips: {breaker.trips} | "
+                f"retry queue: {len(history.retry_queue)}"
+            )
+        overlap_report = overlap.format_report()
+        if overlap_report:
+            Console.info(f"Search-term overlap (mean Jaccard per location):\n{overlap_report}")
+        
         # Save final state
         history.save()
         leads.save()
+        shared_writer().flush()  # Pending JSON exports (also runs at exit)
+        
+        saturated_categories, saturated_locations = scheduler.saturated_groups()
+        if saturated_categories or saturated_locations:
+            Console.info(
+                f"Saturated (demoted) categories: {', '.join(saturated_categories) or '-'} | "
+                f"locations: {', '.join(saturated_locations) or '-'}"
+            )
         
         Console.info(f"Progress saved. Run again to continue from where you left off.")
         
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+╔═══════════════════════════════════════════════════════════════════════════════╗
+║                    🌐 DISTRIBUTED DISCOVERY v1.0                              ║
+║                                                                               ║
+║  Spreads lead discovery over any number of scraper nodes through a Redis      ║
+║  work queue (search combos and place-detail tasks with leases).               ║
+║                                                                               ║
+║  Commands:                                                                    ║
+║  • enqueue  - queue every pending Category × Location search                  ║
+║  • worker   - run a scraper node until the queue is drained                   ║
+║  • collect  - merge scraped places into discovered_businesses.json            ║
+║  • status   - show queue and result counts                                    ║
+║  • local    - all of the above in one process against in-memory Redis         ║
+╚═══════════════════════════════════════════════════════════════════════════════╝
+
+Usage:
+    python run_distributed.py enqueue --redis-url redis://localhost:6379/0
+    python run_distributed.py worker                      # On every node
+    python run_distributed.py collect
+    python run_distributed.py local --workers 2           # Local test run
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from agents.discovery.node import DiscoveryNode, search_task_id
+from agents.discovery.work_queue import (
+    TASK_SEARCH,
+    ResultStore,
+    WorkQueue,
+    connect,
+)
+from database.jsonl_store import record_key
+from run_discovery import (
+    LEADS_FILE,
+    MAX_RESULTS,
+    Console,
+    LeadsManager,
+    generate_search_combinations,
+    load_categories,
+    load_locations,
+)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONFIGURATION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+DEFAULT_REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COMMANDS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def enqueue_searches(queue: WorkQueue, store: ResultStore, leads: LeadsManager) -> int:
+    """Queue every search combo (idempotent) and share the places we already have."""
+    store.add_known(record_key(lead) for lead in leads.leads)
+
+    combinations = generate_search_combinations(load_categories(), load_locations())
+    queued = 0
+    for category_key, search_term, location in combinations:
+        queued += queue.enqueue(
+            TASK_SEARCH,
+            {
+                "category_key": category_key,
+                "search_term": search_term,
+                "location": location,
+                "max_results": MAX_RESULTS,
+            },
+            task_id=search_task_id(search_term, location),
+        )
+    Console.success(f"Queued {queued} new searches ({len(combinations) - queued} already queued or done)")
+    return queued
+
+
+def collect_results(store: ResultStore, leads: LeadsManager) -> int:
+    """Move scraped places from the shared store into the local leads file."""
+    added = 0
+    for business in store.pop_all():
+        if leads.add_lead(business):
+            added += 1
+            Console.found_lead(business.get("name", "Unknown"), business.get("discovered_category", ""))
+    Console.success(f"Collected {added} new qualified leads ({leads.count_qualified()} total)")
+    return added
+
+
+def show_status(queue: WorkQueue, store: ResultStore) -> None:
+    stats = queue.stats()
+    Console.info(
+        f"Queue: {stats['pending']} pending, {stats['leased']} leased, "
+        f"{stats['done']} done, {stats['dead']} dead | "
+        f"results waiting: {store.count()}"
+    )
+
+
+async def run_local(queue: WorkQueue, store: ResultStore, leads: LeadsManager, workers: int) -> None:
+    """Enqueue, run N nodes concurrently in this process, then collect."""
+    enqueue_searches(queue, store, leads)
+    nodes = [DiscoveryNode(queue, store, node_id=f"local-{i + 1}") for i in range(workers)]
+    await asyncio.gather(*(node.run() for node in nodes))
+    collect_results(store, leads)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ENTRY POINT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed lead discovery over a Redis work queue")
+    parser.add_argument("command", choices=["enqueue", "worker", "collect", "status", "local"])
+    parser.add_argument("--redis-url", default=DEFAULT_REDIS_URL, help="Redis URL (memory:// for in-process)")
+    parser.add_argument("--node-id", help="Name of this worker node")
+    parser.add_argument("--forever", action="store_true", help="Worker keeps polling after the queue drains")
+    parser.add_argument("--workers", type=int, default=2, help="Nodes to run in 'local' mode")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    redis_url = "memory://" if args.command == "local" else args.redis_url
+    client = connect(redis_url)
+    queue = WorkQueue(client)
+    store = ResultStore(client)
+
+    try:
+        if args.command == "enqueue":
+            enqueue_searches(queue, store, LeadsManager(LEADS_FILE))
+        elif args.command == "worker":
+            node = DiscoveryNode(queue, store, node_id=args.node_id)
+            asyncio.run(node.run(stop_when_drained=not args.forever))
+        elif args.command == "collect":
+            collect_results(store, LeadsManager(LEADS_FILE))
+        elif args.command == "local":
+            asyncio.run(run_local(queue, store, LeadsManager(LEADS_FILE), args.workers))
+        show_status(queue, store)
+    except KeyboardInterrupt:
+        print("\n\nExiting... (leased tasks return to the queue when their lease expires)")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,18 +11,31 @@ Output: datos_definitivos.json
 """
 import asyncio
 import json
+import os
+import socket
 import sys
 from datetime import datetime
 from pathlib import Path
 
 sys.path.insert(0, '/Users/nicolasvargas/Desktop/Code/webpageAutomatization')
 
+from agents.analysis.deduplicator import deduplicate
 from agents.discovery.google_maps import MapsScraper
+from database.background_writer import shared_writer
+from database.blob_store import pack_records, resolve_records
+from database.local_db import configured_database
+from database.place_history import record_observations
+from database.snapshots import take_snapshot
+from database.sqlite_store import SqliteLeadStore, SqliteSearchLog, connect
 
 OUTPUT_FILE = 'datos_definitivos.json'
 PROGRESS_FILE = 'scrape_progress.json'
+DB_FILE = 'datos_definitivos.db'
 TARGET_BUSINESSES = 2100
 
+# DISCOVERY_STORE=sqlite lets several scraper processes share DB_FILE
+SHARED_STORE = os.environ.get("DISCOVERY_STORE") == "sqlite"
+
 # Search queries and locations to cover Paraguay
 SEARCHES = [
     # Restaurants
@@ -163,33 +176,67 @@ def load_progress():
     """Load progress from previous run if exists"""
     if Path(PROGRESS_FILE).exists():
         with open(PROGRESS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+            progress = json.load(f)
+        progress["all_businesses"] = resolve_records(progress.get("all_businesses", []))
+        return progress
     return {"completed_searches": [], "all_businesses": []}
 
 
 def save_progress(progress):
-    """Save progress to resume later if needed"""
-    with open(PROGRESS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(progress, f, ensure_ascii=False, indent=2)
+    """
+    Save progress to resume later if needed (written in the background, bursts coalesced).
+    Reviews, photos etc. go to the blob store, so the file only carries references.
+    The file holds this process' view only; with SHARED_STORE the database is
+    the shared record and the file just seeds it on first use.
+    """
+    progress = {**progress, "all_businesses": pack_records(progress["all_businesses"])}
+    shared_writer().submit(PROGRESS_FILE, progress, indent=2)
 
 
 def save_final_data(businesses):
-    """Save the final dataset"""
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(businesses, f, ensure_ascii=False, indent=2)
+    """
+    Save the final dataset (large payloads as blob references, shared with the
+    progress file) and snapshot it: what changed since the last run goes to
+    datos_definitivos.delta.json for scoring and site generation.
+    """
+    packed = pack_records(businesses)
+    shared_writer().submit(OUTPUT_FILE, packed, indent=2)
+    shared_writer().flush()
+    db = configured_database()
+    if db is not None:
+        db.bulk_upsert(businesses)
+        db.close()
     print(f"\n💾 Saved {len(businesses)} businesses to {OUTPUT_FILE}")
+    record_observations(businesses)
+    
+    snapshot, changes = take_snapshot(packed, Path(OUTPUT_FILE))
+    print(f"📸 Snapshot {snapshot.name}: {changes.format()}")
+
+
+def open_shared_store(progress):
+    """Open DB_FILE, seeding it from the progress file on first use"""
+    conn = connect(Path(DB_FILE))
+    store = SqliteLeadStore(Path(DB_FILE), conn=conn)
+    search_log = SqliteSearchLog(Path(DB_FILE), owner=f"{socket.gethostname()}-{os.getpid()}", conn=conn)
+    if not len(store):
+        store.put_many(progress.get("all_businesses", []))
+        search_log.rewrite([
+            {"event": "completed", "key": key} for key in progress.get("completed_searches", [])
+        ])
+    return store, search_log
+
+
+def collected(store, all_businesses):
+    """Businesses collected so far (by every process when the store is shared)"""
+    return len(store) if store is not None else len(all_businesses)
 
 
 def deduplicate_businesses(businesses):
-    """Remove duplicate businesses based on name + address"""
-    seen = set()
-    unique = []
-    for b in businesses:
-        key = (b.get('name', '').lower().strip(), b.get('address', '').lower().strip())
-        if key not in seen:
-            seen.add(key)
-            unique.append(b)
-    return unique
+    """
+    Merge records of the same business (Place ID, phone, or a similar name
+    nearby) - keeps the most complete record, tagged with its entity_id
+    """
+    return deduplicate(businesses)
 
 
 async def scrape_full_dataset():
@@ -198,6 +245,11 @@ async def scrape_full_dataset():
     all_businesses = progress.get("all_businesses", [])
     completed_searches = set(progress.get("completed_searches", []))
     
+    store = search_log = None
+    if SHARED_STORE:
+        store, search_log = open_shared_store(progress)
+        print(f"🗄️  Sharing {DB_FILE} with other scraper processes ({len(store)} businesses so far)")
+    
     print("\n" + "="*70)
     print("🚀 FULL DATASET SCRAPER - Collecting ~2100 businesses")
     print("="*70)
@@ -225,8 +277,15 @@ async def scrape_full_dataset():
                     print(f"⏭️  [{search_count}/{total_searches}] Skipping (already done): {query} in {location}")
                     continue
                 
+                # Another process may have completed or claimed this search
+                if search_log is not None:
+                    reason = search_log.claim(search_key)
+                    if reason:
+                        print(f"⏭️  [{search_count}/{total_searches}] Skipping ({reason} by another process): {query} in {location}")
+                        continue
+                
                 # Check if we've reached target
-                if len(all_businesses) >= TARGET_BUSINESSES:
+                if collected(store, all_businesses) >= TARGET_BUSINESSES:
                     print(f"\n🎯 Reached target of {TARGET_BUSINESSES} businesses!")
                     break
                 
@@ -252,6 +311,9 @@ async def scrape_full_dataset():
                     
                     # Mark as completed
                     completed_searches.add(search_key)
+                    if store is not None:
+                        store.put_many(new_businesses)
+                        search_log.append({"event": "completed", "key": search_key})
                     
                     # Save progress
                     progress = {
@@ -268,12 +330,18 @@ async def scrape_full_dataset():
                     
                 except Exception as e:
                     print(f"   ❌ Error: {e}")
+                    if search_log is not None:
+                        search_log.release(search_key)
                     continue
             
             # Check target after each query category
-            if len(all_businesses) >= TARGET_BUSINESSES:
+            if collected(store, all_businesses) >= TARGET_BUSINESSES:
                 break
         
+        # Every process's businesses, not just ours
+        if store is not None:
+            all_businesses = store.values()
+        
         # Final deduplication
         print("\n🔄 Running final deduplication...")
         all_businesses = deduplicate_businesses(all_businesses)
@@ -313,6 +381,7 @@ async def scrape_full_dataset():
     
     finally:
         await scraper.close()
+        shared_writer().flush()
         print("\n🏁 Scraping complete!")
 
 
@@ -0,0 +1,93 @@
+"""
+analyze_database() re-scores only businesses whose inputs or config changed.
+"""
+
+import pytest
+
+from agents.analysis import scorer
+from agents.analysis.scorer import analyze_database
+from database import place_history
+from database.local_db import LocalDatabase
+
+CATEGORIES = ("salon", "restaurant", "dental")
+
+
+def make_records(per_category: int = 4) -> list[dict]:
+    return [
+        {
+            "google_place_id": f"place-{category}-{i}",
+            "name": f"{category.title()} {i}",
+            "category": category,
+            "neighborhood": "villa_morra" if i % 2 else "centro",
+            "phone": "0981 123456" if i % 3 else None,
+            "rating": 3.5 + i * 0.3,
+            "review_count": 5 + i * 15,
+            "photo_count": i * 4,
+        }
+        for category in CATEGORIES
+        for i in range(per_category)
+    ]
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(place_history, "open_history", lambda *args, **kwargs: None)
+    database = LocalDatabase(tmp_path / "leads.db")
+    database.bulk_upsert(make_records())
+    yield database
+    database.close()
+
+
+def scored(counts: dict) -> int:
+    return sum(count for name, count in counts.items() if name != "unchanged")
+
+
+def test_second_run_is_unchanged(db):
+    first = analyze_database(db)
+    assert scored(first) == len(db) and first["unchanged"] == 0
+    assert not db.query_businesses(status="discovered")
+
+    second = analyze_database(db)
+    assert scored(second) == 0
+    assert second["unchanged"] == len(db)
+
+
+def test_weight_change_rescores_only_that_category(db, monkeypatch):
+    analyze_database(db)
+    before = {r["google_place_id"]: r["score_breakdown"] for r in db.query_businesses()}
+
+    monkeypatch.setitem(scorer.CATEGORY_WEIGHTS, "salon", 0.5)
+    counts = analyze_database(db)
+    assert scored(counts) == len(db) // len(CATEGORIES)
+    assert counts["unchanged"] == len(db) - scored(counts)
+
+    for record in db.query_businesses():
+        changed = record["score_breakdown"] != before[record["google_place_id"]]
+        assert changed == (record["category"] == "salon")
+
+
+def test_force_rescores_everything(db):
+    analyze_database(db)
+    counts = analyze_database(db, force=True)
+    assert scored(counts) == len(db) and counts["unchanged"] == 0
+
+
+def test_later_pipeline_statuses_are_left_alone(db):
+    analyze_database(db)
+    db.conn.execute("UPDATE businesses SET status = 'generated' WHERE primary_category = 'dental'")
+    counts = analyze_database(db, force=True)
+    assert scored(counts) == len(db) - len(db.query_businesses(status="generated"))
+
+
+def test_necessity_list_change_rescores_only_that_category(db, monkeypatch):
+    analyze_database(db)
+    monkeypatch.setattr(scorer, "HIGH_NECESSITY_CATEGORIES", [*scorer.HIGH_NECESSITY_CATEGORIES, "restaurant"])
+    counts = analyze_database(db)
+    assert scored(counts) == len(db) // len(CATEGORIES)
+
+
+def test_premium_neighborhood_change_rescores_its_businesses(db, monkeypatch):
+    analyze_database(db)
+    monkeypatch.setattr(scorer, "PREMIUM_NEIGHBORHOODS", [*scorer.PREMIUM_NEIGHBORHOODS, "centro"])
+    counts = analyze_database(db)
+    assert scored(counts) == len(db.query_businesses(neighborhood="centro"))
@@ -0,0 +1,100 @@
+"""
+analyze_batch() must score, rate and decide exactly like analyze().
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from agents.analysis import scorer
+from agents.analysis.batch_scorer import DECISIONS, columns_from_inputs
+from agents.analysis.scorer import (
+    CATEGORY_WEIGHTS,
+    LOCATION_TIERS,
+    BusinessAnalyzer,
+    BusinessInput,
+)
+
+# Values on and around every bucket boundary, plus casing/None variants
+CATEGORIES = list(CATEGORY_WEIGHTS) + ["Real Estate", "Dental", "hotel", "Peluquería", "SALON"]
+NEIGHBORHOODS = list(LOCATION_TIERS) + [None, "Villa Morra", "centro_historico", "villa morra"]
+RATINGS = [0, 0.0, 2.9, 3.0, 3.49, 3.5, 4.0, 4.4999, 4.5, 5.0]
+REVIEW_COUNTS = [0, 1, 4, 5, 9, 10, 19, 20, 49, 50, 999]
+PHOTO_COUNTS = [0, 1, 4, 5, 9, 10, 30]
+VELOCITIES = [None, -1.0, 0.0, 0.5, 2.999, 3.0, 8.9, 9.0, 40.0]
+
+
+def random_inputs(count: int, seed: int = 1) -> list[BusinessInput]:
+    rnd = random.Random(seed)
+    return [
+        BusinessInput(
+            id=str(i),
+            name=f"Business {i}",
+            category=rnd.choice(CATEGORIES),
+            address="",
+            neighborhood=rnd.choice(NEIGHBORHOODS),
+            phone=rnd.choice([None, "", "0981 123456"]),
+            email=rnd.choice([None, "info@example.com"]),
+            rating=rnd.choice(RATINGS + [round(rnd.uniform(0, 5), 1)]),
+            review_count=rnd.choice(REVIEW_COUNTS + [rnd.randint(0, 999)]),
+            photo_count=rnd.choice(PHOTO_COUNTS),
+            has_website=rnd.random() < 0.2,
+            existing_website=rnd.choice([None, "", "https://example.com"]),
+            hours=rnd.choice([None, {}, {"lunes": "8:00-18:00"}]),
+            review_velocity=rnd.choice(VELOCITIES),
+        )
+        for i in range(count)
+    ]
+
+
+def assert_parity(analyzer: BusinessAnalyzer, inputs: list[BusinessInput], batch) -> None:
+    scores = analyzer.analyze_batch(batch)
+    for i, business in enumerate(inputs):
+        expected = analyzer.analyze(business)
+        assert scores.breakdown(i).to_dict() == expected.score_breakdown.to_dict(), business
+        assert scores.total[i] == expected.total_score, business
+        assert scores.necessity[i] == expected.website_necessity_score, business
+        assert DECISIONS[scores.decision[i]] == expected.decision, business
+
+
+@pytest.fixture(scope="module")
+def inputs() -> list[BusinessInput]:
+    return random_inputs(5000)
+
+
+def test_batch_matches_analyze(inputs):
+    analyzer = BusinessAnalyzer()
+    assert_parity(analyzer, inputs, columns_from_inputs(inputs))
+
+
+def test_raw_columns_match_analyze(inputs):
+    """Contact/hours objects and None velocities instead of precomputed flags"""
+    batch = {
+        name: [getattr(b, name) for b in inputs]
+        for name in (
+            "id", "category", "neighborhood", "rating", "review_count", "photo_count",
+            "phone", "email", "hours", "has_website", "existing_website", "review_velocity",
+        )
+    }
+    assert_parity(BusinessAnalyzer(), inputs, batch)
+
+
+def test_batch_follows_velocity_points(inputs, monkeypatch):
+    monkeypatch.setitem(scorer.VELOCITY_BAND_POINTS, 3, 2)
+    monkeypatch.setitem(scorer.VELOCITY_BAND_POINTS, 1, 0)
+    analyzer = BusinessAnalyzer()
+    assert_parity(analyzer, inputs[:500], inputs[:500])
+
+
+def test_sweep_matches_decide(inputs):
+    scores = BusinessAnalyzer().analyze_batch(inputs)
+    for row in scores.sweep([40, 55], [25, 40]):
+        counts = scores.counts(scores.decide(row["min_score_go"], row["min_score_review"]))
+        assert counts == {name: row[name] for name in counts}
+
+
+def test_empty_batch():
+    scores = BusinessAnalyzer().analyze_batch([])
+    assert len(scores) == 0
+    assert np.array_equal(scores.components["activity_score"], np.zeros(0))
@@ -0,0 +1,127 @@
+"""
+pg_ingest against a stub asyncpg connection: COPY rows, merge SQL, batching.
+"""
+
+import asyncio
+import json
+import re
+from contextlib import asynccontextmanager
+
+import pytest
+
+pytest.importorskip("asyncpg")
+
+from database import pg_ingest  # noqa: E402
+from database.pg_ingest import COLUMN_NAMES, STAGING_TABLE, ingest, iter_records  # noqa: E402
+
+
+class StubConnection:
+    """Records what ingest() sends; every merged row reports as inserted unless seen before"""
+
+    def __init__(self):
+        self.executed: list[str] = []
+        self.copies: list[dict] = []
+        self.merges: list[str] = []
+        self.transactions = 0
+        self.stored: set = set()
+        self._staged: list[tuple] = []
+
+    async def execute(self, sql: str, *args) -> str:
+        self.executed.append(sql)
+        return "CREATE TABLE"
+
+    async def copy_records_to_table(self, table: str, records, columns) -> None:
+        records = list(records)
+        self.copies.append({"table": table, "records": records, "columns": list(columns)})
+        self._staged.extend(records)
+
+    async def fetch(self, sql: str, *args) -> list[dict]:
+        self.merges.append(sql)
+        place_index = COLUMN_NAMES.index("google_place_id")
+        rows = []
+        for place_id in dict.fromkeys(row[place_index] for row in self._staged):
+            rows.append({"inserted": place_id not in self.stored})
+            self.stored.add(place_id)
+        self._staged = []
+        return rows
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.transactions += 1
+        yield
+
+
+def column(row: tuple, name: str):
+    return row[COLUMN_NAMES.index(name)]
+
+
+RECORDS = [
+    {"google_place_id": "ChIJ1", "name": "  Peluquería ELEGANCE ", "phone": "0981 123 456", "category": "salon"},
+    {"google_place_id": "ChIJ2", "name": "Café Bohemia", "phone": "(021) 987-654", "opening_hours": {"lunes": "8-18"}},
+    {"name": "", "phone": "0981 000000"},  # Skipped: no name
+    {"name": "Sin Place ID", "phone": "123"},
+    {"google_place_id": "ChIJ1", "name": "Peluquería Elegance", "phone": "+595 981 123456"},
+]
+
+
+def run_ingest(records, batch_size=2):
+    conn = StubConnection()
+    stats = asyncio.run(ingest(conn, records, batch_size=batch_size))
+    return conn, stats
+
+
+def test_copy_uses_staging_columns():
+    conn, stats = run_ingest(RECORDS)
+    assert conn.executed == [pg_ingest._CREATE_STAGING]
+    assert all(copy["table"] == STAGING_TABLE for copy in conn.copies)
+    assert all(copy["columns"] == COLUMN_NAMES for copy in conn.copies)
+    assert all(len(row) == len(COLUMN_NAMES) for copy in conn.copies for row in copy["records"])
+    assert [len(copy["records"]) for copy in conn.copies] == [2, 2]
+    assert conn.transactions == stats.batches == 2
+
+
+def test_normalized_values():
+    conn, _ = run_ingest(RECORDS)
+    rows = [row for copy in conn.copies for row in copy["records"]]
+    assert [column(row, "normalized_name") for row in rows] == [
+        "peluquería elegance", "café bohemia", "sin place id", "peluquería elegance",
+    ]
+    assert [column(row, "phone_normalized") for row in rows] == ["981123456", "021987654", None, "981123456"]
+    assert column(rows[2], "google_place_id") == "name:sin place id"
+    assert json.loads(column(rows[1], "hours")) == {"lunes": "8-18"}
+    assert json.loads(column(rows[0], "raw_data"))["category"] == "salon"
+    assert [column(row, "seq") for row in rows] == [1, 2, 4, 5]
+
+
+def test_merge_sql_upserts_from_staging():
+    conn, _ = run_ingest(RECORDS)
+    merge = " ".join(conn.merges[0].split())
+    assert f"FROM {STAGING_TABLE}" in merge
+    assert "SELECT DISTINCT ON (google_place_id)" in merge
+    assert "ORDER BY google_place_id, seq DESC" in merge
+    assert "ON CONFLICT (google_place_id) DO UPDATE SET" in merge
+    assert "normalized_name = EXCLUDED.normalized_name" in merge
+    assert "phone_normalized = EXCLUDED.phone_normalized" in merge
+    # Scoring columns belong to the analysis agent
+    assert "score" not in merge
+    assert not re.search(r"(?<!website_)status =", merge)
+
+
+def test_stats_count_inserts_updates_and_skips():
+    _, stats = run_ingest(RECORDS)
+    assert (stats.read, stats.skipped, stats.copied) == (5, 1, 4)
+    assert (stats.inserted, stats.updated) == (3, 1)
+
+
+def test_iter_records_streams_arrays(tmp_path):
+    path = tmp_path / "dataset.json"
+    path.write_text('[{"name": "A"}, {"name": "B"}, {"name": ', encoding="utf-8")
+    records = iter_records([path])
+    assert next(records) == {"name": "A"}
+    assert next(records) == {"name": "B"}
+
+
+def test_iter_records_reads_jsonl(tmp_path):
+    path = tmp_path / "leads.jsonl"
+    path.write_text('{"name": "A"}\n\n{"name": "B"}\n', encoding="utf-8")
+    assert [r["name"] for r in iter_records([path])] == ["A", "B"]
@@ -0,0 +1,33 @@
+"""
+SqliteSearchLog: search history shared between processes.
+"""
+
+from database.sqlite_store import SqliteSearchLog, connect
+
+RETRY_ENTRY = {"attempts": 2, "failure_class": "captcha", "retry_after": 1234.0, "last_error": "sorry page"}
+
+
+def test_expired_retry_claim_reads_as_failed(tmp_path):
+    db = tmp_path / "discovery.db"
+    first = SqliteSearchLog(db, owner="first", conn=connect(db))
+    first.append({"event": "failed", "key": "salon|Villa Morra", "entry": RETRY_ENTRY})
+    first.append({"event": "completed", "key": "spa|Sajonia"})
+
+    # A process claims the retry and dies before recording the outcome
+    crashed = SqliteSearchLog(db, owner="crashed", lease=-1, conn=connect(db))
+    assert crashed.claim("salon|Villa Morra") is None
+
+    events = {event["key"]: event for event in SqliteSearchLog(db, owner="restarted", conn=connect(db)).read()}
+    assert events["salon|Villa Morra"] == {"event": "failed", "key": "salon|Villa Morra", "entry": RETRY_ENTRY}
+    assert events["spa|Sajonia"] == {"event": "completed", "key": "spa|Sajonia"}
+
+
+def test_live_claims_stay_hidden(tmp_path):
+    db = tmp_path / "discovery.db"
+    log = SqliteSearchLog(db, owner="first", conn=connect(db))
+    log.append({"event": "failed", "key": "salon|Villa Morra", "entry": RETRY_ENTRY})
+    assert log.claim("salon|Villa Morra") is None
+    assert log.claim("gym|Centro") is None
+
+    assert list(SqliteSearchLog(db, owner="other", conn=connect(db)).read()) == []
+    assert SqliteSearchLog(db, owner="other", conn=connect(db)).claim("salon|Villa Morra") == "claimed"
@@ -0,0 +1,181 @@
+"""
+WorkQueue and ResultStore against an in-process fakeredis server.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from agents.discovery import work_queue  # noqa: E402
+from agents.discovery.work_queue import (  # noqa: E402
+    TASK_PLACE,
+    TASK_SEARCH,
+    ResultStore,
+    WorkQueue,
+    connect,
+)
+
+
+class Clock:
+    """Stands in for time.time() so lease expiry needs no sleeping"""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(work_queue, "time", SimpleNamespace(time=clock.time))
+    return clock
+
+
+@pytest.fixture
+def client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def queue(client, clock) -> WorkQueue:
+    return WorkQueue(client, prefix="test", visibility_timeout=60, max_attempts=3)
+
+
+def search_payload(term: str = "salon", location: str = "Villa Morra") -> dict:
+    return {"search_term": term, "location": location, "category_key": "salon"}
+
+
+# -------------------------------------------
+# Producing
+# -------------------------------------------
+
+def test_enqueue_is_idempotent_per_task_id(queue):
+    assert queue.enqueue(TASK_SEARCH, search_payload(), task_id="search:1")
+    assert not queue.enqueue(TASK_SEARCH, search_payload(), task_id="search:1")
+    assert queue.stats()["pending"] == 1
+
+
+def test_done_tasks_are_not_enqueued_again(queue):
+    queue.enqueue(TASK_SEARCH, search_payload(), task_id="search:1")
+    task = queue.lease("node-a")
+    assert queue.ack(task, "node-a")
+    assert not queue.enqueue(TASK_SEARCH, search_payload(), task_id="search:1")
+    assert queue.stats() == {"pending": 0, "leased": 0, "done": 1, "dead": 0}
+    assert queue.is_drained()
+
+
+def test_delayed_task_is_not_due_yet(queue, clock):
+    queue.enqueue(TASK_PLACE, {"url": "u"}, task_id="place:1", delay=30)
+    assert queue.lease("node-a") is None
+    assert queue.next_due_in() == pytest.approx(30)
+    clock.advance(30)
+    assert queue.lease("node-a").id == "place:1"
+
+
+# -------------------------------------------
+# Leasing
+# -------------------------------------------
+
+def test_lease_hands_a_task_to_one_worker(queue):
+    queue.enqueue(TASK_SEARCH, search_payload(), task_id="search:1")
+    task = queue.lease("node-a")
+    assert task.id == "search:1"
+    assert task.kind == TASK_SEARCH
+    assert task.payload == search_payload()
+    assert task.attempts == 1
+    assert queue.lease("node-b") is None
+    assert queue.stats()["leased"] == 1
+
+
+def test_only_the_lease_owner_can_ack(queue):
+    queue.enqueue(TASK_SEARCH, search_payload(), task_id="search:1")
+    task = queue.lease("node-a")
+    assert not queue.ack(task, "node-b")
+    assert not queue.heartbeat(task, "node-b")
+    assert queue.ack(task, "node-a")
+    assert not queue.ack(task, "node-a")
+
+
+def test_nack_makes_the_task_available_after_the_delay(queue, clock):
+    queue.enqueue(TASK_SEARCH, search_payload(), task_id="search:1")
+    task = queue.lease("node-a")
+    assert queue.nack(task, "node-a", "captcha", delay=120)
+    assert queue.lease("node-b") is None
+
+    clock.advance(120)
+    retry = queue.lease("node-b")
+    assert retry.id == "search:1"
+    assert retry.attempts == 2
+    assert retry.last_error == "captcha"
+
+
+def test_nack_dead_letters_after_max_attempts(queue, client):
+    queue.enqueue(TASK_SEARCH, search_payload(), task_id="search:1")
+    for attempt in range(queue.max_attempts):
+        task = queue.lease("node-a")
+        assert task.attempts == attempt + 1
+        queue.nack(task, "node-a", f"failure {attempt}")
+
+    assert queue.lease("node-a") is None
+    assert queue.stats() == {"pending": 0, "leased": 0, "done": 0, "dead": 1}
+    dead = work_queue.Task.from_json(client.hget("test:dead", "search:1"))
+    assert dead.last_error == f"failure {queue.max_attempts - 1}"
+
+
+# -------------------------------------------
+# Expired leases
+# -------------------------------------------
+
+def test_expired_lease_is_reclaimed(queue, clock):
+    queue.enqueue(TASK_SEARCH, search_payload(), task_id="search:1")
+    task = queue.lease("node-a")
+    clock.advance(59)
+    assert queue.reclaim_expired() == 0
+    assert queue.heartbeat(task, "node-a")
+
+    clock.advance(61)
+    assert queue.reclaim_expired() == 1
+    assert not queue.ack(task, "node-a")  # Lease lost - its work may be redone
+    assert queue.lease("node-b").attempts == 2
+
+
+def test_task_whose_lease_keeps_expiring_is_dead_lettered(queue, clock):
+    queue.enqueue(TASK_SEARCH, search_payload(), task_id="search:1")
+    for _ in range(queue.max_attempts):
+        assert queue.lease("node-a") is not None
+        clock.advance(61)
+
+    assert queue.lease("node-a") is None
+    assert queue.stats()["dead"] == 1
+    assert queue.is_drained()
+
+
+# -------------------------------------------
+# Result store
+# -------------------------------------------
+
+def test_result_store_put_and_pop(client):
+    store = ResultStore(client, prefix="test")
+    store.add_known(["ChIJknown", None, ""])
+    store.put("ChIJnew", {"name": "Peluquería Elegance", "google_place_id": "ChIJnew"})
+    store.put("ChIJnew", {"name": "Peluquería Elegance 2", "google_place_id": "ChIJnew"})
+
+    assert store.known_places() == {"ChIJknown", "ChIJnew"}
+    assert store.is_known("ChIJnew")
+    assert store.count() == 1
+    assert store.pop_all() == [{"name": "Peluquería Elegance 2", "google_place_id": "ChIJnew"}]
+    assert store.count() == 0
+    assert store.is_known("ChIJnew")  # Known places outlive the results
+
+
+def test_memory_url_shares_one_server():
+    first, second = connect("memory://"), connect("memory://")
+    ResultStore(first, prefix="memory-test").put("ChIJshared", {"name": "Shared"})
+    assert ResultStore(second, prefix="memory-test").is_known("ChIJshared")